@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+from app.core.auth import callback_dependency
+from app.models import DeployMLWorkbench
+from app.schemas.callbacks import PipelineCallbackResponse
+from app.schemas.common import ErrorResponse
+from app.services.callback_service import CallbackService
+
+router = APIRouter()
+
+
+@router.post(
+    "/deploy-ml-workbench",
+    response_model=PipelineCallbackResponse,
+    dependencies=[Depends(callback_dependency)],
+    responses={
+        200: {"model": PipelineCallbackResponse, "description": "Result recorded, next stage started if it succeeded"},
+        401: {"model": ErrorResponse, "description": "Missing or invalid callback token or signature"},
+        404: {"model": ErrorResponse, "description": "Zone partner not found"},
+    }
+)
+async def deploy_ml_workbench_callback(payload: DeployMLWorkbench) -> PipelineCallbackResponse:
+    """
+    Receive the completion of a zone partner creation pipeline
+
+    Records the pipeline result and Terraform outputs in the partner's status in
+    one update and, when the pipeline succeeded, starts the ML Workbench deployment.
+
+    Returns:
+        PipelineCallbackResponse: The recorded result and the deployment job, if one was started
+    """
+    return await CallbackService.pipeline_completed(payload)
@@ -0,0 +1,81 @@
+from fastapi import APIRouter
+from app.core.executors import run_blocking
+from app.schemas.common import ErrorResponse
+from app.schemas.fleet import FleetOperationRequest, FleetOperationResponse
+from app.services.fleet_service import FleetService
+
+router = APIRouter()
+
+FLEET_OPERATION_RESPONSES = {
+    200: {"model": FleetOperationResponse, "description": "Fleet operation and per-wave progress"},
+    404: {"model": ErrorResponse, "description": "Fleet operation not found"}
+}
+
+
+@router.post(
+    "/",
+    response_model=FleetOperationResponse,
+    responses={
+        200: {"model": FleetOperationResponse, "description": "Fleet operation started"},
+        400: {"model": ErrorResponse, "description": "Fleet-wide delete without a filter"}
+    }
+)
+async def start_fleet_operation(request: FleetOperationRequest) -> FleetOperationResponse:
+    """
+    Redeploy or delete every partner matching the filters, in waves
+
+    Returns:
+        FleetOperationResponse: The new operation and its waves
+    """
+    return FleetService.start_operation(request)
+
+
+@router.get("/{operation_id}", response_model=FleetOperationResponse, responses=FLEET_OPERATION_RESPONSES)
+async def get_fleet_operation(operation_id: str) -> FleetOperationResponse:
+    """
+    Get the state of a fleet operation and the progress of each wave
+
+    Returns:
+        FleetOperationResponse: Operation state and per-wave progress
+    """
+    return await run_blocking("io", FleetService.get_operation, operation_id)
+
+
+@router.post("/{operation_id}/pause", response_model=FleetOperationResponse, responses=FLEET_OPERATION_RESPONSES)
+async def pause_fleet_operation(operation_id: str) -> FleetOperationResponse:
+    """
+    Stop starting new partners; jobs already started run to completion
+
+    Returns:
+        FleetOperationResponse: The paused operation
+    """
+    return await FleetService.pause_operation(operation_id)
+
+
+@router.post(
+    "/{operation_id}/resume",
+    response_model=FleetOperationResponse,
+    responses={
+        **FLEET_OPERATION_RESPONSES,
+        409: {"model": ErrorResponse, "description": "Fleet operation is not paused"}
+    }
+)
+async def resume_fleet_operation(operation_id: str) -> FleetOperationResponse:
+    """
+    Resume a paused fleet operation from the wave it stopped in
+
+    Returns:
+        FleetOperationResponse: The resumed operation
+    """
+    return await FleetService.resume_operation(operation_id)
+
+
+@router.post("/{operation_id}/abort", response_model=FleetOperationResponse, responses=FLEET_OPERATION_RESPONSES)
+async def abort_fleet_operation(operation_id: str) -> FleetOperationResponse:
+    """
+    Abort a fleet operation; jobs already started run to completion
+
+    Returns:
+        FleetOperationResponse: The aborted operation
+    """
+    return await FleetService.abort_operation(operation_id)
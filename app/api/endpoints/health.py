@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from app.core.config import config, log_level
 from app.core.logging import setup_logger
+from app.core.metrics import metrics
 from app.schemas.health import HealthResponse, ReadinessResponse
 from app.schemas.common import ErrorResponse
 
@@ -64,4 +65,17 @@ async def readiness_check():
         }
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
-        raise HTTPException(status_code=503, detail=f"Service Unavailable: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=503, detail=f"Service Unavailable: {str(e)}")
+
+
+@router.get("/metrics",
+            summary="Service Metrics",
+            description="In-process counters, gauges and cache statistics")
+async def get_metrics():
+    """
+    Return a snapshot of the in-process metrics registry.
+
+    Returns:
+        dict: Counters, gauges and collector statistics such as status cache hits and misses.
+    """
+    return metrics.snapshot()
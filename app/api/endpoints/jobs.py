@@ -0,0 +1,45 @@
+from fastapi import APIRouter
+from app.core.executors import run_blocking
+from app.schemas.common import ErrorResponse
+from app.schemas.jobs import JobQueueStatsResponse, JobResponse
+from app.services.job_service import JobService
+
+router = APIRouter()
+
+
+@router.get(
+    "/stats",
+    response_model=JobQueueStatsResponse,
+    responses={
+        200: {"model": JobQueueStatsResponse, "description": "Successfully retrieved queue statistics"}
+    }
+)
+async def get_job_queue_stats() -> JobQueueStatsResponse:
+    """
+    Get the job queue depth, running jobs and wait times per account and region
+
+    Returns:
+        JobQueueStatsResponse: Job queue statistics
+    """
+    return JobService.get_stats()
+
+
+@router.get(
+    "/{job_id}",
+    response_model=JobResponse,
+    responses={
+        200: {"model": JobResponse, "description": "Successfully retrieved job"},
+        404: {"model": ErrorResponse, "description": "Job not found"}
+    }
+)
+async def get_job(job_id: str) -> JobResponse:
+    """
+    Get the state of a queued, running or finished job
+
+    Parameters:
+        job_id (str): The ID returned by the endpoint that queued the job
+
+    Returns:
+        JobResponse: The job's state, timestamps, result or error
+    """
+    return await run_blocking("io", JobService.get_job, job_id)
@@ -1,11 +1,21 @@
-from fastapi import APIRouter, BackgroundTasks
+from typing import Optional
+from fastapi import APIRouter
 from app.models import DeployMLWorkbench
-from app.svc import deploy_ml_workbench_service
+from app.schemas.jobs import IDEMPOTENCY_KEY_HEADER, JOB_SUBMITTED_RESPONSES, JobSubmittedResponse
+from app.services.job_service import JobService
 
 router = APIRouter()
 
 
-@router.post("/deploy")
-async def deploy_ml_workbench(deploy_payload: DeployMLWorkbench, background_tasks: BackgroundTasks):
-    background_tasks.add_task(deploy_ml_workbench_service, deploy_payload)
-    return {"message": f"ML Workbench deployment started successfully for partner_id: {deploy_payload.partner_id}"}
+@router.post("/deploy", response_model=JobSubmittedResponse, responses=JOB_SUBMITTED_RESPONSES)
+async def deploy_ml_workbench(
+    deploy_payload: DeployMLWorkbench, idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+) -> JobSubmittedResponse:
+    job, created = await JobService.submit_job(
+        "deploy_ml_workbench", deploy_payload.model_dump(mode="json"), deploy_payload.partner_id, idempotency_key
+    )
+    return JobSubmittedResponse(
+        message=f"ML Workbench deployment started successfully for partner_id: {deploy_payload.partner_id}",
+        job_id=job["id"],
+        duplicate=not created,
+    )
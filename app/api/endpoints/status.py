@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from app.core.logging import setup_logger
 from app.core.config import log_level
-from app.schemas.status import StatusResponse
+from app.core.constants import STATUS_LONG_POLL_MAX_TIMEOUT
+from app.core.executors import run_blocking
+from app.schemas.status import BulkStatusRequest, BulkStatusResponse, StatusResponse, StatusSummaryResponse
 from app.schemas.common import ErrorResponse
 from app.services.status_service import StatusService
 
@@ -9,22 +14,194 @@ router = APIRouter()
 logger = setup_logger(__name__, log_level)
 
 
+@router.get(
+    "/summary",
+    response_model=StatusSummaryResponse,
+    responses={
+        200: {"model": StatusSummaryResponse, "description": "Successfully retrieved fleet summary"}
+    }
+)
+async def get_status_summary() -> StatusSummaryResponse:
+    """
+    Get the number of partner zones per Terraform state, MLWorkbench state and region
+
+    Returns:
+        StatusSummaryResponse: Fleet-wide status counters
+    """
+    return await run_blocking("io", StatusService.get_summary)
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkStatusResponse,
+    responses={
+        200: {"model": BulkStatusResponse, "description": "Successfully retrieved statuses"},
+        400: {"model": ErrorResponse, "description": "Unknown field requested"}
+    }
+)
+async def get_bulk_status(request: BulkStatusRequest) -> BulkStatusResponse:
+    """
+    Get the status of many partner zones in a single request
+
+    Parameters:
+        request (BulkStatusRequest): Partner IDs or filters, field projection and pagination
+
+    Returns:
+        BulkStatusResponse: Status per partner ID and the cursor of the next page
+    """
+    return await run_blocking("io", StatusService.get_bulk_status, request)
+
+
 @router.get(
     "/{partner_id}",
     response_model=StatusResponse,
     responses={
         200: {"model": StatusResponse, "description": "Successfully retrieved status"},
+        304: {"description": "Status unchanged since the version in If-None-Match"},
         404: {"model": ErrorResponse, "description": "Status file not found"}
     }
 )
-async def get_status(partner_id: str) -> StatusResponse:
+async def get_status(
+    partner_id: str,
+    response: Response,
+    wait: Optional[int] = Query(
+        None, description="Long-poll: hold the request until the status version differs from this one"
+    ),
+    timeout: float = Query(
+        30, gt=0, le=STATUS_LONG_POLL_MAX_TIMEOUT, description="Maximum seconds to hold a long-poll request"
+    ),
+    if_none_match: Optional[str] = Header(None, description="ETag of the status the client already has"),
+) -> StatusResponse:
     """
     Get the current status of a partner zone deployment
 
     Parameters:
         partner_id (str): The unique identifier of the partner zone
+        wait (int): Optional status version the client already has; enables long-polling
+        timeout (float): Maximum seconds to wait in long-poll mode
+        if_none_match (str): ETag from a previous response; answered with 304 if still current
 
     Returns:
         StatusResponse: The current status of the partner zone deployment
     """
-    return StatusService.get_status(partner_id)
\ No newline at end of file
+    if wait is not None:
+        status = await StatusService.wait_for_status(partner_id, wait, timeout)
+    else:
+        if if_none_match:
+            # Answered from memory when possible; only a miss asks the store for its version token.
+            version = StatusService.known_version(partner_id)
+            if version is None:
+                version = await run_blocking("io", StatusService.current_version, partner_id)
+            etag = StatusService.etag(version)
+            if StatusService.etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        status = await run_blocking("io", StatusService.get_status, partner_id)
+
+    etag = StatusService.etag(status.Version)
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return status
+
+
+@router.get(
+    "/{partner_id}/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-Sent Events, one 'status' event per status change"
+        }
+    }
+)
+async def stream_status(
+    partner_id: str,
+    request: Request,
+    last_event_id: Optional[int] = Header(None, description="Version of the last status event received"),
+) -> StreamingResponse:
+    """
+    Stream status changes of a partner zone deployment as Server-Sent Events
+
+    Parameters:
+        partner_id (str): The unique identifier of the partner zone
+        last_event_id (int): Version of the last event received when reconnecting
+
+    Returns:
+        StreamingResponse: Event stream whose event IDs are status versions
+    """
+    return StreamingResponse(
+        StatusService.stream_status(partner_id, request, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get(
+    "/{partner_id}/history",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Status change events as newline-delimited JSON, oldest first"
+        }
+    }
+)
+async def get_status_history(
+    partner_id: str,
+    since: Optional[datetime] = Query(None, description="Only return events at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only return events at or before this time"),
+) -> StreamingResponse:
+    """
+    Stream the status change history of a partner zone deployment
+
+    Parameters:
+        partner_id (str): The unique identifier of the partner zone
+        since (datetime): Optional lower bound of the time range
+        until (datetime): Optional upper bound of the time range
+
+    Returns:
+        StreamingResponse: Journal events with timestamp, status key and value
+    """
+    return StreamingResponse(
+        StatusService.iter_status_history(partner_id, since, until),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get(
+    "/{partner_id}/pipeline-log",
+    response_class=Response,
+    responses={
+        200: {
+            "content": {"text/plain": {}},
+            "description": "Pipeline console output; X-Log-Next-Offset is the offset to pass next time"
+        },
+        400: {"model": ErrorResponse, "description": "Both offset and tail given"},
+        404: {"model": ErrorResponse, "description": "No pipeline log for this partner"}
+    }
+)
+async def get_pipeline_log(
+    partner_id: str,
+    offset: Optional[int] = Query(None, ge=0, description="Return the log from this byte offset on"),
+    tail: Optional[int] = Query(None, ge=1, description="Return the last this many bytes of the log"),
+) -> Response:
+    """
+    Get the console output of the pipelines run for a partner zone
+
+    Parameters:
+        partner_id (str): The unique identifier of the partner zone
+        offset (int): Byte offset to read from; pass the previous X-Log-Next-Offset to fetch only new output
+        tail (int): Number of bytes to read from the end of the log instead
+
+    Returns:
+        Response: Plain text log bytes with X-Log-Offset, X-Log-Next-Offset and X-Log-Size headers
+    """
+    data, start, size = await run_blocking("io", StatusService.get_pipeline_log, partner_id, offset, tail)
+    return Response(
+        content=data,
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "X-Log-Offset": str(start),
+            "X-Log-Next-Offset": str(start + len(data)),
+            "X-Log-Size": str(size),
+        },
+    )
@@ -1,17 +1,131 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Query
+from app.core.executors import run_blocking
 from app.models import ZonePartner
-from app.svc import create_zone_partner_service, delete_zone_partner_service, redeploy_zone_partner_service
+from app.schemas.common import ErrorResponse
+from app.schemas.jobs import IDEMPOTENCY_KEY_HEADER, JOB_SUBMITTED_RESPONSES, JobSubmittedResponse
+from app.schemas.zone_partner import (
+    BatchCreateRequest,
+    BatchCreateResponse,
+    BatchStatusResponse,
+    PlanResponse,
+    ZonePartnerListResponse,
+)
+from app.services.job_service import JobService
+from app.services.zone_partner_service import ZonePartnerService
 
 router = APIRouter()
 
 
-@router.post("/")
-async def create_zone_partner(zone_partner: ZonePartner, background_tasks: BackgroundTasks):
-    try:
-        background_tasks.add_task(create_zone_partner_service, zone_partner)
-        return {"message": f"Zone partner creation started for partner_id: {zone_partner.partner_id}"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get(
+    "/",
+    response_model=ZonePartnerListResponse,
+    responses={
+        200: {"model": ZonePartnerListResponse, "description": "One page of zone partners"},
+        400: {"model": ErrorResponse, "description": "Unknown field requested"}
+    }
+)
+async def list_zone_partners(
+    user_id: Optional[str] = Query(None, description="Only partners owned by this user"),
+    account_id: Optional[str] = Query(None, description="Only partners in this cloud account"),
+    region: Optional[str] = Query(None, description="Only partners in this region"),
+    deployment_name: Optional[str] = Query(None, description="Only partners with this deployment name"),
+    terraform_state: Optional[str] = Query(None, description="Only partners in this Terraform state"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned by the previous page"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of partners per page"),
+) -> ZonePartnerListResponse:
+    """
+    List zone partners, filtered and paginated through the state store indexes
+
+    Returns:
+        ZonePartnerListResponse: One page of zone partners and the cursor of the next page
+    """
+    filters = {
+        "user_id": user_id,
+        "account_id": account_id,
+        "region": region,
+        "deployment_name": deployment_name,
+        "terraform_state": terraform_state,
+    }
+    return await run_blocking(
+        "io",
+        ZonePartnerService.list_zone_partners,
+        {key: value for key, value in filters.items() if value is not None},
+        fields=[field.strip() for field in fields.split(",") if field.strip()] if fields else None,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+@router.post("/", response_model=JobSubmittedResponse, responses=JOB_SUBMITTED_RESPONSES)
+async def create_zone_partner(
+    zone_partner: ZonePartner, idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+) -> JobSubmittedResponse:
+    job, created = await JobService.submit_job(
+        "create_zone_partner", zone_partner.model_dump(mode="json"), zone_partner.partner_id, idempotency_key
+    )
+    return JobSubmittedResponse(
+        message=f"Zone partner creation started for partner_id: {zone_partner.partner_id}",
+        job_id=job["id"],
+        duplicate=not created,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=BatchCreateResponse,
+    responses={
+        200: {"model": BatchCreateResponse, "description": "Batch validated, accepted items queued"}
+    }
+)
+async def create_zone_partner_batch(request: BatchCreateRequest) -> BatchCreateResponse:
+    """
+    Create many zone partners in one request
+
+    Every payload is validated on its own; valid ones are queued for creation
+    with bounded fan-out and invalid ones are reported with their errors.
+
+    Returns:
+        BatchCreateResponse: Batch ID and per-item validation results
+    """
+    return ZonePartnerService.create_batch(request)
+
+
+@router.get(
+    "/batch/{batch_id}",
+    response_model=BatchStatusResponse,
+    responses={
+        200: {"model": BatchStatusResponse, "description": "Successfully retrieved batch progress"},
+        404: {"model": ErrorResponse, "description": "Batch not found"}
+    }
+)
+async def get_zone_partner_batch(batch_id: str) -> BatchStatusResponse:
+    """
+    Get the aggregate progress of a batch creation
+
+    Returns:
+        BatchStatusResponse: Item counts per job state and the state of every item
+    """
+    return await run_blocking("io", ZonePartnerService.get_batch, batch_id)
+
+
+@router.get(
+    "/plans/{plan_id}",
+    response_model=PlanResponse,
+    responses={
+        200: {"model": PlanResponse, "description": "Successfully retrieved the plan"},
+        404: {"model": ErrorResponse, "description": "Plan not found"}
+    }
+)
+async def get_zone_partner_plan(plan_id: str) -> PlanResponse:
+    """
+    Get the plan computed for a zone partner creation
+
+    Returns:
+        PlanResponse: Pipeline requests and validation findings of the plan
+    """
+    return await run_blocking("io", ZonePartnerService.get_plan, plan_id)
 
 
 @router.put("/{partner_id}")
@@ -19,19 +133,29 @@ async def update_zone_partner(partner_id: str, zone_partner: ZonePartner):
     return {"message": "Not implemented. Zone partner updated successfully"}
 
 
-@router.delete("/{partner_id}")
-async def delete_zone_partner(partner_id: str, background_tasks: BackgroundTasks):
-    try:
-        background_tasks.add_task(delete_zone_partner_service, partner_id)
-        return {"message": f"Zone partner deletion started for partner_id: {partner_id}"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.delete("/{partner_id}", response_model=JobSubmittedResponse, responses=JOB_SUBMITTED_RESPONSES)
+async def delete_zone_partner(
+    partner_id: str, idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+) -> JobSubmittedResponse:
+    job, created = await JobService.submit_job(
+        "delete_zone_partner", {"partner_id": partner_id}, partner_id, idempotency_key
+    )
+    return JobSubmittedResponse(
+        message=f"Zone partner deletion started for partner_id: {partner_id}",
+        job_id=job["id"],
+        duplicate=not created,
+    )
 
 
-@router.post("/re-deploy/{partner_id}")
-async def redeploy_pz(partner_id: str, background_tasks: BackgroundTasks):
-    try:
-        background_tasks.add_task(redeploy_zone_partner_service, partner_id)
-        return {"message": f"Redeployment of Zone partner started for partner_id: {partner_id}"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@router.post("/re-deploy/{partner_id}", response_model=JobSubmittedResponse, responses=JOB_SUBMITTED_RESPONSES)
+async def redeploy_pz(
+    partner_id: str, idempotency_key: Optional[str] = IDEMPOTENCY_KEY_HEADER
+) -> JobSubmittedResponse:
+    job, created = await JobService.submit_job(
+        "redeploy_zone_partner", {"partner_id": partner_id}, partner_id, idempotency_key
+    )
+    return JobSubmittedResponse(
+        message=f"Redeployment of Zone partner started for partner_id: {partner_id}",
+        job_id=job["id"],
+        duplicate=not created,
+    )
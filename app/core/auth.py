@@ -1,7 +1,9 @@
-from fastapi import HTTPException, Security
+import hashlib
+import hmac
+from fastapi import HTTPException, Request, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.core.logging import setup_logger
-from app.core.config import log_level
+from app.core.config import config, log_level
 from app.utils.okta_utils import validate_okta_token
 
 logger = setup_logger(__name__, log_level)
@@ -13,4 +15,31 @@ def token_dependency(auth: HTTPAuthorizationCredentials = Security(security)) ->
     if not validate_okta_token(token):
         logger.warning(f"Invalid token attempt: {token[:10]}...")
         raise HTTPException(status_code=401, detail="Invalid token")
-    return True
\ No newline at end of file
+    return True
+
+CALLBACK_SIGNATURE_HEADER = "X-Signature-256"
+
+
+async def callback_dependency(request: Request) -> bool:
+    """
+    Authenticate a pipeline callback with the shared callback token from the Jenkins config
+
+    The pipeline either sends the token as a bearer token, or signs the request
+    body with it and sends ``sha256=<hex HMAC>`` in the X-Signature-256 header.
+    """
+    secret = config.get_jenkins_config().get("call_back_token")
+    if not secret:
+        logger.error("Pipeline callback rejected: no callback token is configured")
+        raise HTTPException(status_code=401, detail="Callbacks are not configured")
+
+    signature = request.headers.get(CALLBACK_SIGNATURE_HEADER)
+    if signature is not None:
+        expected = "sha256=" + hmac.new(secret.encode(), await request.body(), hashlib.sha256).hexdigest()
+        if hmac.compare_digest(signature, expected):
+            return True
+    else:
+        scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(token.encode(), secret.encode()):
+            return True
+    logger.warning(f"Invalid pipeline callback from {request.client.host if request.client else 'unknown'}")
+    raise HTTPException(status_code=401, detail="Invalid callback credentials")
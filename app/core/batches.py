@@ -0,0 +1,181 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import BATCH_FANOUT
+from app.core.executors import run_blocking
+from app.core.jobs import JobConflict, job_queue
+from app.core.state_store import get_state_store
+from app.core.workers import RecordSuperseded, worker_registry
+from app.models import ZonePartner
+
+logger = setup_logger(__name__, log_level)
+
+BATCH_KIND = "batch"
+BATCH_RUNNING = "running"
+BATCH_COMPLETED = "completed"
+
+ITEM_ACCEPTED = "accepted"
+ITEM_INVALID = "invalid"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in detail['loc']) or 'payload'}: {detail['msg']}"
+        for detail in error.errors()
+    ]
+
+
+class BatchManager:
+    """
+    Runs batch zone partner creations.
+
+    A batch is a "batch" record holding every item and its validation result.
+    Accepted items are offered to the job queue at most ``fanout`` at a time,
+    each under the idempotency key ``batch:<batch_id>:<index>``, so a batch that
+    was interrupted by a restart resumes without creating duplicate jobs. A
+    batch is driven by the worker that owns it; batches of a dead worker are
+    adopted by another one.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running = False
+
+    def create(self, payloads: List[dict], fanout: int = BATCH_FANOUT) -> dict:
+        """
+        Validate every payload and start creating the accepted partners
+
+        Args:
+            payloads: Raw ZonePartner payloads
+            fanout: Maximum number of this batch's creations queued or running at once
+
+        Returns:
+            dict: The batch record
+        """
+        items = []
+        seen = set()
+        for index, payload in enumerate(payloads):
+            partner_id = payload.get("partner_id") if isinstance(payload, dict) else None
+            item = {
+                "index": index,
+                # Only a string is kept: a malformed partner_id is reported as a validation error instead.
+                "partner_id": partner_id if isinstance(partner_id, str) else None,
+                "status": ITEM_ACCEPTED,
+                "errors": [],
+                "params": None,
+                "job_id": None,
+                "error": None,
+            }
+            try:
+                zone_partner = ZonePartner.model_validate(payload)
+                if zone_partner.partner_id in seen:
+                    raise ValueError(f"Duplicate partner_id in batch: {zone_partner.partner_id}")
+                seen.add(zone_partner.partner_id)
+                item["params"] = zone_partner.model_dump(mode="json")
+            except ValidationError as e:
+                item.update(status=ITEM_INVALID, errors=_validation_errors(e))
+            except ValueError as e:
+                item.update(status=ITEM_INVALID, errors=[str(e)])
+            items.append(item)
+
+        batch = {
+            "id": str(uuid.uuid4()),
+            "state": BATCH_RUNNING,
+            "fanout": fanout,
+            "created_at": _now(),
+            "finished_at": None,
+            "items": items,
+            "owner": worker_registry.worker_id,
+        }
+        get_state_store().put_record(BATCH_KIND, batch["id"], batch)
+        accepted = sum(item["status"] == ITEM_ACCEPTED for item in items)
+        logger.info(f"Batch {batch['id']} accepted {accepted} of {len(items)} zone partners")
+        self._spawn(batch)
+        return batch
+
+    def get(self, batch_id: str) -> Optional[dict]:
+        return get_state_store().get_record(BATCH_KIND, batch_id)
+
+    def _spawn(self, batch: dict) -> None:
+        self._tasks[batch["id"]] = asyncio.create_task(self._drive(batch), name=f"batch-{batch['id']}")
+
+    async def _drive(self, batch: dict) -> None:
+        slots = asyncio.Semaphore(batch["fanout"])
+        # Items finish concurrently; serialize the writes so one does not fail the
+        # revision check of another still in flight.
+        save_lock = asyncio.Lock()
+
+        async def save() -> None:
+            async with save_lock:
+                await run_blocking("io", worker_registry.save, BATCH_KIND, batch)
+
+        async def run_item(item: dict) -> None:
+            async with slots:
+                try:
+                    job = await job_queue.submit_when_possible(
+                        "create_zone_partner",
+                        item["params"],
+                        item["partner_id"],
+                        idempotency_key=f"batch:{batch['id']}:{item['index']}",
+                    )
+                except JobConflict as e:
+                    item["error"] = str(e)
+                    await save()
+                    return
+                if item["job_id"] != job["id"]:
+                    item["job_id"] = job["id"]
+                    await save()
+                await job_queue.wait(job["id"])
+
+        try:
+            await asyncio.gather(*(
+                run_item(item) for item in batch["items"]
+                if item["status"] == ITEM_ACCEPTED and item["error"] is None
+            ))
+            batch.update(state=BATCH_COMPLETED, finished_at=_now())
+            await save()
+            logger.info(f"Batch {batch['id']} completed")
+        except RecordSuperseded:
+            logger.warning(f"Batch {batch['id']} was adopted by another worker")
+        except Exception as e:
+            logger.error(f"Error running batch {batch['id']}: {str(e)}")
+        finally:
+            self._tasks.pop(batch["id"], None)
+
+    async def adopt(self) -> None:
+        """Resume running batches whose owner is gone: an earlier run of this service, or a dead worker."""
+        if not self._running:
+            return
+        for batch in await run_blocking("io", worker_registry.orphaned, BATCH_KIND, [BATCH_RUNNING]):
+            if batch["id"] in self._tasks:
+                continue
+            batch = await run_blocking("io", worker_registry.claim, BATCH_KIND, batch)
+            if batch is not None:
+                logger.warning(f"Resuming batch {batch['id']}")
+                self._spawn(batch)
+
+    async def start(self) -> None:
+        self._running = True
+        await self.adopt()
+        worker_registry.register_sweep("batches", self.adopt)
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+
+batch_manager = BatchManager()
@@ -31,17 +31,6 @@ class Boto3STSService:
             logger.error(f"Error assuming role: {e}")
             raise
 
-    def set_aws_credentials(self):
-        try:
-            credentials = self.get_assumed_role_credentials()
-            os.environ["AWS_ACCESS_KEY_ID"] = credentials['AccessKeyId']
-            os.environ["AWS_SECRET_ACCESS_KEY"] = credentials['SecretAccessKey']
-            os.environ["AWS_SESSION_TOKEN"] = credentials['SessionToken']
-            logger.info(f"AWS credentials set successfully for partner_id: {self.partner_id}")
-        except ClientError as e:
-            logger.error(f"Error setting environment variables: {e}")
-            raise
-
 
 def read_aws_appconfig():
     session = boto3.session.Session()
@@ -0,0 +1,135 @@
+import os
+import threading
+from typing import List, Optional, Tuple
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import PIPELINE_LOG_CHUNK_SIZE, PIPELINE_LOG_MAX_READ, PIPELINE_LOG_PATH
+
+logger = setup_logger(__name__, log_level)
+
+PIPELINE_LOG_CHUNK_SUFFIX = ".log"
+
+
+class PipelineLogs:
+    """
+    Console output of a partner's pipelines, kept as chunk files on local disk.
+
+    ``follow`` asks Jenkins' progressive console API for the bytes of a build
+    past the offset already copied, and streams them in pieces of
+    ``chunk_size`` to a new chunk file named after that offset, so memory use
+    does not grow with the size of the output and nothing is ever appended to.
+    The offset is kept in the build record; if the record write is lost, the
+    next call fetches from the same offset and replaces the same chunk rather
+    than copying the bytes twice. A partner's log is its builds' chunks in
+    order: builds by creation time, chunks by offset.
+    """
+
+    def __init__(self, log_path: str = PIPELINE_LOG_PATH, chunk_size: int = PIPELINE_LOG_CHUNK_SIZE):
+        self.log_path = log_path
+        self.chunk_size = chunk_size
+        # The tracker thread and callbacks may both drain a build's output.
+        self._lock = threading.Lock()
+
+    def path(self, partner_id: str) -> str:
+        return os.path.join(self.log_path, str(partner_id))
+
+    def _build_path(self, build: dict) -> str:
+        # Creation time first, so a partner's builds list in the order they ran.
+        return os.path.join(self.path(build["partner_id"]), f"{build.get('created_at') or ''}_{build['id']}")
+
+    def follow(self, client, build: dict) -> bool:
+        """
+        Copy the console output a build produced since the last call
+
+        Args:
+            client: Jenkins client
+            build: Build record with ``build_number``; its ``log_offset`` is advanced
+
+        Returns:
+            bool: Whether Jenkins reports that more output may follow
+        """
+        with self._lock:
+            offset = build.get("log_offset") or 0
+            response = client.open_progressive_text(build["pipeline"], build["build_number"], offset)
+            try:
+                directory = self._build_path(build)
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, f"{offset:016d}{PIPELINE_LOG_CHUNK_SUFFIX}")
+                written = 0
+                with open(path + ".tmp", "wb") as f:
+                    if offset == 0:
+                        written += f.write(
+                            f"===== {build['pipeline']} #{build['build_number']} ({build['operation']}) =====\n".encode()
+                        )
+                    for chunk in response.iter_content(self.chunk_size):
+                        written += f.write(chunk)
+                if written:
+                    os.replace(path + ".tmp", path)
+                else:
+                    os.remove(path + ".tmp")
+                build["log_offset"] = int(response.headers.get("X-Text-Size", offset))
+                return response.headers.get("X-More-Data", "").lower() == "true"
+            finally:
+                response.close()
+
+    def _chunks(self, partner_id: str) -> List[Tuple[str, int]]:
+        """The chunk files of a partner's log in order, with their sizes."""
+        chunks = []
+        partner_dir = self.path(partner_id)
+        for build_dir in sorted(os.listdir(partner_dir)):
+            directory = os.path.join(partner_dir, build_dir)
+            try:
+                names = sorted(os.listdir(directory))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for name in names:
+                if not name.endswith(PIPELINE_LOG_CHUNK_SUFFIX):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    chunks.append((path, os.stat(path).st_size))
+                except FileNotFoundError:
+                    continue
+        return chunks
+
+    def read(
+        self, partner_id: str, offset: Optional[int] = None, tail: Optional[int] = None,
+        limit: int = PIPELINE_LOG_MAX_READ,
+    ) -> Optional[Tuple[bytes, int, int]]:
+        """
+        Read part of a partner's pipeline log
+
+        Args:
+            partner_id: The ID of the partner zone
+            offset: First byte to return; clients pass the size returned by their previous read
+            tail: Return the last ``tail`` bytes instead
+            limit: Maximum number of bytes to return
+
+        Returns:
+            Optional[Tuple[bytes, int, int]]: The bytes, the offset they start at and the
+            current size of the log, or None if the partner has no log
+        """
+        try:
+            chunks = self._chunks(partner_id)
+        except FileNotFoundError:
+            return None
+        size = sum(chunk_size for _, chunk_size in chunks)
+        if tail is not None:
+            start = max(size - min(tail, limit), 0)
+        else:
+            start = min(offset or 0, size)
+        end = min(start + limit, size)
+
+        data = bytearray()
+        position = 0
+        for path, chunk_size in chunks:
+            if position + chunk_size > start and position < end:
+                with open(path, "rb") as f:
+                    f.seek(max(start - position, 0))
+                    data += f.read(min(end, position + chunk_size) - max(start, position))
+            position += chunk_size
+        return bytes(data), start, size
+
+
+pipeline_logs = PipelineLogs()
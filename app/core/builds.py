@@ -0,0 +1,369 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import jenkins
+
+from app.core.build_logs import pipeline_logs
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import (
+    BUILD_POLL_BACKOFF, BUILD_POLL_MAX_INTERVAL, BUILD_POLL_MIN_INTERVAL, JENKINS_TIMEOUT, PIPELINE_LOG_INTERVAL
+)
+from app.core.executors import run_blocking
+from app.core.fs_utils import update_status, update_status_fields
+from app.core.jenkins_utils import jenkins_clients
+from app.core.leases import lease_manager
+from app.core.metrics import metrics
+from app.core.state_store import get_state_store
+from app.core.status_broker import status_broker
+from app.core.workers import RecordSuperseded, worker_registry
+
+logger = setup_logger(__name__, log_level)
+
+BUILD_KIND = "build"
+
+BUILD_QUEUED = "queued"
+BUILD_RUNNING = "running"
+BUILD_FINISHED = "finished"
+
+BUILD_SUCCESS = "SUCCESS"
+# Result of a build whose queue item was cancelled, or expired before it was seen to start.
+BUILD_CANCELLED = "CANCELLED"
+BUILD_LOST = "LOST"
+
+# Terraform status written when an operation's pipeline succeeds, and when it does not.
+BUILD_OUTCOMES = {
+    "create": ("Complete", "Error"),
+    "delete": ("Deleted", "Delete Error"),
+    "redeploy": ("Redeployed", "Redeploy Error"),
+}
+
+
+def build_outcome(operation: str, result: str) -> dict:
+    """Status fields recording the result of an operation's pipeline."""
+    succeeded, failed = BUILD_OUTCOMES[operation]
+    return {"Terraform": succeeded if result == BUILD_SUCCESS else failed, "Pipeline_Result": result}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class JenkinsBuildTracker:
+    """
+    Follows triggered pipelines from queue item to build number to result.
+
+    Every triggered pipeline is a "build" record. One background thread polls
+    all builds in flight: queued items one by one until Jenkins assigns a
+    build number, then the recent builds of each pipeline in a single request
+    per pipeline, however many of its builds are running. The poll interval
+    grows by ``backoff`` while nothing changes, up to ``max_interval``, and
+    drops back to ``min_interval`` on any change or new build. Console output
+    of running builds is copied to the partner's pipeline log on its own
+    cadence, every ``log_interval``, and once more when a build finishes; it
+    has no effect on the poll interval. Outcomes are written to the partner's
+    status. Builds are owned by the worker that tracks them and adopted like
+    jobs when that worker dies. The job that triggered a build keeps the
+    partner's lease until the build finishes.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = BUILD_POLL_MIN_INTERVAL,
+        max_interval: float = BUILD_POLL_MAX_INTERVAL,
+        backoff: float = BUILD_POLL_BACKOFF,
+        log_interval: float = PIPELINE_LOG_INTERVAL,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.log_interval = log_interval
+        self.interval = min_interval
+        # Monotonic deadlines of the next status poll and the next copy of console output.
+        self._next_poll = 0.0
+        self._next_log_copy = 0.0
+        self._builds: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"polls": 0, "requests": 0, "log_copies": 0, "log_requests": 0, "finished": 0}
+        metrics.register_collector("builds", self.stats)
+
+    def track(
+        self, partner_id: str, operation: str, pipeline: str, queue_item: int, job_id: Optional[str] = None
+    ) -> dict:
+        """
+        Start following a triggered pipeline
+
+        Args:
+            partner_id: The partner the pipeline acts on
+            operation: Key of ``BUILD_OUTCOMES``
+            pipeline: Pipeline name
+            queue_item: Queue item number returned by the trigger
+            job_id: The job that triggered the pipeline. The build record takes its ID, and the job's
+                lease on the partner is released when the build finishes
+
+        Returns:
+            dict: The build record
+        """
+        build = {
+            # A job triggers at most one pipeline, so its build is found by the job's ID.
+            "id": job_id or str(uuid.uuid4()),
+            "state": BUILD_QUEUED,
+            "partner_id": partner_id,
+            "operation": operation,
+            "pipeline": pipeline,
+            "queue_item": queue_item,
+            "job_id": job_id,
+            "build_number": None,
+            "build_url": None,
+            "result": None,
+            "log_offset": 0,
+            "created_at": _now(),
+            "finished_at": None,
+            "owner": worker_registry.worker_id,
+        }
+        get_state_store().put_record(BUILD_KIND, build["id"], build)
+        self._follow(build)
+        logger.info(f"Tracking {pipeline} queue item {queue_item} for partner_id {partner_id}")
+        return build
+
+    def _follow(self, build: dict) -> None:
+        with self._lock:
+            self._builds[build["id"]] = build
+        self.interval = self.min_interval
+        self._next_poll = 0.0
+        self._wake.set()
+
+    def _save(self, build: dict) -> bool:
+        try:
+            worker_registry.save(BUILD_KIND, build)
+            return True
+        except RecordSuperseded:
+            logger.info(f"Build {build['id']} was taken over by another worker; no longer tracking it")
+            with self._lock:
+                self._builds.pop(build["id"], None)
+            return False
+
+    def _finish(self, build: dict, result: str, write_status: bool = True) -> None:
+        if write_status and result != BUILD_LOST:
+            # Status first: if the record write is lost, the next poll writes the same status again.
+            update_status_fields(build["partner_id"], build_outcome(build["operation"], result))
+        build.update(state=BUILD_FINISHED, result=result, finished_at=_now())
+        if self._save(build):
+            with self._lock:
+                self._builds.pop(build["id"], None)
+            if build.get("job_id"):
+                lease_manager.release(build["partner_id"], build["job_id"])
+        self._stats["finished"] += 1
+        logger.info(
+            f"{build['pipeline']} build {build['build_number']} for partner_id {build['partner_id']} "
+            f"finished: {result}"
+        )
+
+    def _poll_queued(self, client, build: dict) -> bool:
+        try:
+            item = client.get_queue_item(build["queue_item"])
+        except jenkins.NotFoundException:
+            logger.warning(
+                f"Queue item {build['queue_item']} of {build['pipeline']} expired before its build was seen"
+            )
+            self._finish(build, BUILD_LOST)
+            return True
+        if item.get("cancelled"):
+            self._finish(build, BUILD_CANCELLED)
+            return True
+        executable = item.get("executable")
+        if not executable:
+            return False
+        build.update(state=BUILD_RUNNING, build_number=executable["number"], build_url=executable.get("url"))
+        update_status(build["partner_id"], "Pipeline_Build", executable["number"])
+        self._save(build)
+        return True
+
+    @staticmethod
+    def _copy_log(client, build: dict) -> bool:
+        """Append the build's new console output to the partner's pipeline log; returns whether it grew."""
+        offset = build.get("log_offset") or 0
+        try:
+            pipeline_logs.follow(client, build)
+        except Exception as e:
+            logger.error(f"Error copying console output of {build['pipeline']} build {build['build_number']}: {str(e)}")
+        return (build.get("log_offset") or 0) != offset
+
+    def _poll_running(self, client, pipeline: str, builds: List[dict]) -> bool:
+        changed = False
+        recent = client.get_recent_builds(pipeline)
+        for build in builds:
+            info = recent.get(build["build_number"])
+            if info is None:
+                # Older than the builds the job lists; ask for this one directly.
+                info = client.get_build_info(pipeline, build["build_number"])
+            if not info.get("building") and info.get("result"):
+                # Copied before finishing, so a finished build's output is complete.
+                self._copy_log(client, build)
+                self._finish(build, info["result"])
+                changed = True
+        return changed
+
+    @staticmethod
+    def in_flight(job_id: str) -> Optional[dict]:
+        """The unfinished build triggered by a job, tracked by any process, or None."""
+        build = get_state_store().get_record(BUILD_KIND, job_id)
+        return build if build is not None and build["state"] != BUILD_FINISHED else None
+
+    async def wait_for_job(self, job_id: str) -> Optional[dict]:
+        """
+        Wait until the pipeline a job triggered has finished
+
+        Woken by the partner's status changes, which include the outcome, and
+        re-reads the record every ``min_interval`` seconds in case the build is
+        finished without one (lost builds) or by another process.
+
+        Returns:
+            Optional[dict]: The finished build record, or None if the job triggered no pipeline
+        """
+        while True:
+            build = await run_blocking("io", get_state_store().get_record, BUILD_KIND, job_id)
+            if build is None or build["state"] == BUILD_FINISHED:
+                return build
+            await status_broker.wait(build["partner_id"], self.min_interval)
+
+    def resolve(self, partner_id: str, operation: str, build_number: Optional[int], result: str) -> None:
+        """
+        Finish a partner's tracked build whose result arrived by callback, without polling for it
+
+        The caller has already written the outcome to the partner's status.
+        Only builds tracked by this process are finished here; a build tracked
+        by another service process is finished by that process's next poll,
+        which writes the same outcome.
+        """
+        with self._lock:
+            builds = [
+                build for build in self._builds.values()
+                if build["partner_id"] == partner_id and build["operation"] == operation
+                and (build_number is None or build["build_number"] in (None, build_number))
+            ]
+        for build in builds:
+            if build_number is not None:
+                build["build_number"] = build_number
+                self._copy_log(jenkins_clients.client(), build)
+            self._finish(build, result, write_status=False)
+
+    def poll(self) -> bool:
+        """Poll every build in flight once; returns whether any of them changed."""
+        with self._lock:
+            builds = list(self._builds.values())
+        client = jenkins_clients.client()
+        client.reset_calls()
+        changed = False
+        for build in builds:
+            if build["state"] != BUILD_QUEUED:
+                continue
+            try:
+                changed = self._poll_queued(client, build) or changed
+            except Exception as e:
+                logger.error(f"Error polling queue item {build['queue_item']} of {build['pipeline']}: {str(e)}")
+        running: Dict[str, List[dict]] = {}
+        for build in builds:
+            if build["state"] == BUILD_RUNNING:
+                running.setdefault(build["pipeline"], []).append(build)
+        for pipeline, pipeline_builds in running.items():
+            try:
+                changed = self._poll_running(client, pipeline, pipeline_builds) or changed
+            except Exception as e:
+                logger.error(f"Error polling builds of {pipeline}: {str(e)}")
+        self._stats["polls"] += 1
+        self._stats["requests"] += client.calls
+        return changed
+
+    def copy_logs(self) -> None:
+        """Copy the new console output of every running build to its partner's pipeline log."""
+        with self._lock:
+            builds = [build for build in self._builds.values() if build["state"] == BUILD_RUNNING]
+        client = jenkins_clients.client()
+        client.reset_calls()
+        for build in builds:
+            if self._copy_log(client, build):
+                self._save(build)
+        self._stats["log_copies"] += 1
+        self._stats["log_requests"] += client.calls
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self._builds
+            # With nothing in flight, sleep until a build is tracked.
+            timeout = None if idle else max(min(self._next_poll, self._next_log_copy) - time.monotonic(), 0)
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stopping:
+                return
+            with self._lock:
+                if not self._builds:
+                    continue
+            if time.monotonic() >= self._next_poll:
+                try:
+                    changed = self.poll()
+                except Exception as e:
+                    logger.error(f"Error polling Jenkins builds: {str(e)}")
+                    changed = False
+                self.interval = self.min_interval if changed else min(self.interval * self.backoff, self.max_interval)
+                self._next_poll = time.monotonic() + self.interval
+            if time.monotonic() >= self._next_log_copy:
+                try:
+                    self.copy_logs()
+                except Exception as e:
+                    logger.error(f"Error copying Jenkins console output: {str(e)}")
+                self._next_log_copy = time.monotonic() + self.log_interval
+
+    async def adopt(self) -> None:
+        """Follow builds still in flight whose owner is gone: an earlier run of this service, or a dead worker."""
+        if self._thread is None:
+            return
+        for build in await run_blocking("io", self._claim_orphans):
+            self._follow(build)
+
+    @staticmethod
+    def _claim_orphans() -> List[dict]:
+        claimed = []
+        for build in worker_registry.orphaned(BUILD_KIND, [BUILD_QUEUED, BUILD_RUNNING]):
+            build = worker_registry.claim(BUILD_KIND, build)
+            if build is not None:
+                claimed.append(build)
+        return claimed
+
+    async def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="jenkins-build-tracker", daemon=True)
+        self._thread.start()
+        await self.adopt()
+        worker_registry.register_sweep("builds", self.adopt)
+
+    async def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        # The thread stops after its current Jenkins request, which may take up to the request timeout.
+        await asyncio.to_thread(self._thread.join, JENKINS_TIMEOUT)
+        if self._thread.is_alive():
+            logger.warning("Jenkins build tracker did not stop in time; leaving its last poll behind")
+        self._thread = None
+        with self._lock:
+            self._builds = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = len(self._builds)
+        return {**self._stats, "in_flight": in_flight, "interval": self.interval}
+
+
+build_tracker = JenkinsBuildTracker()
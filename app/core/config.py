@@ -31,6 +31,8 @@ class Config:
                 "username": secrets["jenkins"]["username"],
                 "api_token": secrets["jenkins"]["token"],
                 "call_back_url": f"{app_config['partner_creation_api_url']}/deploy-ml-workbench",
+                # Shared secret the pipeline authenticates its callback with, as a bearer token or HMAC key.
+                "call_back_token": secrets["jenkins"].get("call_back_token"),
                 "portal_env": app_config["portal_env"],
             }
 
@@ -1,6 +1,57 @@
 import os
 
 STATE_PATH = os.getenv("STATE_PATH", "/usr/src/app/s3")
+STATE_BACKEND = os.getenv("STATE_BACKEND", "json")
+# Must be on local disk: SQLite's WAL locking and shared memory do not work on the S3 mount at STATE_PATH.
+STATE_DB_PATH = os.getenv("STATE_DB_PATH", "/var/lib/pz-state/state.db")
+STATE_S3_BUCKET = os.getenv("STATE_S3_BUCKET", "")
+STATE_S3_PREFIX = os.getenv("STATE_S3_PREFIX", "pz-state")
+STATE_S3_ENDPOINT_URL = os.getenv("STATE_S3_ENDPOINT_URL") or None
+STATE_S3_CACHE_PATH = os.getenv("STATE_S3_CACHE_PATH", "/tmp/pz-state-cache")
+STATE_S3_CACHE_TTL = float(os.getenv("STATE_S3_CACHE_TTL", "5"))
+STATE_GC_INTERVAL = float(os.getenv("STATE_GC_INTERVAL", "3600"))
+STATE_GC_RETENTION_HOURS = float(os.getenv("STATE_GC_RETENTION_HOURS", "168"))
+STATE_DISK_QUOTA_BYTES = int(os.getenv("STATE_DISK_QUOTA_BYTES", "0"))
+STATUS_CACHE_SIZE = int(os.getenv("STATUS_CACHE_SIZE", "1024"))
+STATUS_FLUSH_INTERVAL = float(os.getenv("STATUS_FLUSH_INTERVAL", "0.5"))
+STATUS_JOURNAL_RETENTION_DAYS = float(os.getenv("STATUS_JOURNAL_RETENTION_DAYS", "30"))
+STATUS_JOURNAL_COMPACT_INTERVAL = float(os.getenv("STATUS_JOURNAL_COMPACT_INTERVAL", "3600"))
+STATUS_STREAM_HEARTBEAT = float(os.getenv("STATUS_STREAM_HEARTBEAT", "15"))
+STATUS_LONG_POLL_MAX_TIMEOUT = float(os.getenv("STATUS_LONG_POLL_MAX_TIMEOUT", "60"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_MAX = int(os.getenv("JOB_QUEUE_MAX", "100"))
+JOB_DRAIN_TIMEOUT = float(os.getenv("JOB_DRAIN_TIMEOUT", "25"))
+JOB_ACCOUNT_CONCURRENCY = int(os.getenv("JOB_ACCOUNT_CONCURRENCY", "3"))
+JOB_REGION_CONCURRENCY = int(os.getenv("JOB_REGION_CONCURRENCY", "6"))
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_FANOUT = int(os.getenv("BATCH_FANOUT", "10"))
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "720"))
+IDEMPOTENCY_KEY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+EXECUTOR_PROVIDER_WORKERS = int(os.getenv("EXECUTOR_PROVIDER_WORKERS", "8"))
+EXECUTOR_AWS_WORKERS = int(os.getenv("EXECUTOR_AWS_WORKERS", "4"))
+EXECUTOR_IO_WORKERS = int(os.getenv("EXECUTOR_IO_WORKERS", "8"))
+# More than one needs STATE_BACKEND=sqlite (see state_store.check_web_workers). Still per
+# process with several: job scheduler caps, the status cache and unflushed status writes
+# (merged key by key when flushed), and the status summary between worker sweeps.
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+UVICORN_RELOAD = os.getenv("UVICORN_RELOAD", "True").lower() == "true"
+WORKER_HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "10"))
+WORKER_TTL = float(os.getenv("WORKER_TTL", "60"))
+AWS_CREDENTIALS_TTL = float(os.getenv("AWS_CREDENTIALS_TTL", "7200"))
+AWS_CREDENTIALS_REFRESH_MARGIN = float(os.getenv("AWS_CREDENTIALS_REFRESH_MARGIN", "300"))
+AWS_CREDENTIALS_SHARE_PATH = os.getenv("AWS_CREDENTIALS_SHARE_PATH", "/dev/shm/pz-aws-credentials.json")
+JENKINS_POOL_SIZE = int(os.getenv("JENKINS_POOL_SIZE", "10"))
+JENKINS_TIMEOUT = float(os.getenv("JENKINS_TIMEOUT", "30"))
+BUILD_POLL_MIN_INTERVAL = float(os.getenv("BUILD_POLL_MIN_INTERVAL", "5"))
+BUILD_POLL_MAX_INTERVAL = float(os.getenv("BUILD_POLL_MAX_INTERVAL", "60"))
+BUILD_POLL_BACKOFF = float(os.getenv("BUILD_POLL_BACKOFF", "1.5"))
+KUBE_CLIENT_POOL_SIZE = int(os.getenv("KUBE_CLIENT_POOL_SIZE", "32"))
+KUBE_CLIENT_TTL = float(os.getenv("KUBE_CLIENT_TTL", "600"))
+# Local disk, like STATE_DB_PATH: the S3 mount at STATE_PATH re-uploads a whole file on every append.
+PIPELINE_LOG_PATH = os.getenv("PIPELINE_LOG_PATH", "/var/lib/pz-state/pipeline-logs")
+PIPELINE_LOG_INTERVAL = float(os.getenv("PIPELINE_LOG_INTERVAL", "30"))
+PIPELINE_LOG_CHUNK_SIZE = int(os.getenv("PIPELINE_LOG_CHUNK_SIZE", "65536"))
+PIPELINE_LOG_MAX_READ = int(os.getenv("PIPELINE_LOG_MAX_READ", "1048576"))
 USE_ASSUMED_ROLES = os.getenv("USE_ASSUMED_ROLES", "True").lower() == "true"
 DEBUG = os.getenv("DEBUG", "True").lower() == "true"
 
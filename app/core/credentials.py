@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.boto3_utils import Boto3STSService
+from app.core.constants import AWS_CREDENTIALS_REFRESH_MARGIN, AWS_CREDENTIALS_SHARE_PATH
+from app.core.state_store import atomic_write_json
+from app.models import ZonePartner
+
+logger = setup_logger(__name__, log_level)
+
+AWS_CREDENTIAL_VARIABLES = ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN")
+
+# Credentials of the partner the current job acts on. Set per job instead of in
+# os.environ, so concurrent jobs for different accounts never see each other's
+# credentials; executors copy it into their worker threads.
+aws_environment: ContextVar[Dict[str, str]] = ContextVar("aws_environment", default={})
+
+
+def _environment(access_key_id: str, secret_access_key: str, session_token: str) -> Dict[str, str]:
+    return dict(zip(AWS_CREDENTIAL_VARIABLES, (access_key_id, secret_access_key, session_token)))
+
+
+class AssumedRoleCredentials:
+    """
+    Per-partner cache of assumed-role credentials.
+
+    The role is assumed once per partner and reused until the credentials are
+    within ``refresh_margin`` seconds of expiring. Callers for the same partner
+    wait on that partner's lock rather than assuming the role again.
+    """
+
+    def __init__(self, refresh_margin: float = AWS_CREDENTIALS_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._cache: Dict[str, Tuple[Dict[str, str], float]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get(self, zone_partner: ZonePartner) -> Dict[str, str]:
+        partner_id = zone_partner.partner_id
+        with self._lock:
+            partner_lock = self._locks.setdefault(partner_id, threading.Lock())
+        with partner_lock:
+            cached = self._cache.get(partner_id)
+            if cached is not None and cached[1] - time.time() > self.refresh_margin:
+                return cached[0]
+            credentials = Boto3STSService(zone_partner).get_assumed_role_credentials()
+            environment = _environment(
+                credentials["AccessKeyId"], credentials["SecretAccessKey"], credentials["SessionToken"]
+            )
+            self._cache[partner_id] = (environment, credentials["Expiration"].timestamp())
+            logger.info(f"Assumed role credentials refreshed for partner_id: {partner_id}")
+            return environment
+
+    def forget(self, partner_id: str) -> None:
+        with self._lock:
+            self._cache.pop(partner_id, None)
+
+
+class SharedCredentials:
+    """
+    Credentials set through the auth endpoint, shared by every worker process on the host.
+
+    They are kept in a 0600 file (on the memory-backed /dev/shm by default)
+    instead of the environment of whichever process received the request, and
+    carry their own expiry time.
+    """
+
+    def __init__(self, path: str = AWS_CREDENTIALS_SHARE_PATH):
+        self.path = path
+
+    def set(self, access_key_id: str, secret_access_key: str, session_token: str, ttl: float) -> None:
+        # atomic_write_json creates its temporary file with mode 0600.
+        atomic_write_json(self.path, {
+            "environment": _environment(access_key_id, secret_access_key, session_token),
+            "expires_at": time.time() + ttl,
+        })
+
+    def get(self) -> Dict[str, str]:
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("expires_at", 0) <= time.time():
+            self.clear()
+            logger.info("AWS credentials expired")
+            return {}
+        return data["environment"]
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+assumed_role_credentials = AssumedRoleCredentials()
+shared_credentials = SharedCredentials()
+
+
+def credential_environment() -> Dict[str, str]:
+    """AWS credential variables in effect for the current job: the partner's, else the shared ones."""
+    return {**shared_credentials.get(), **aws_environment.get()}
+
+
+def subprocess_environment(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment for a child process: the service's own, with the current credentials layered on top."""
+    return {**os.environ, **credential_environment(), **(extra or {})}
+
+
+@contextmanager
+def partner_credentials(environment: Dict[str, str]) -> Iterator[None]:
+    """Use ``environment`` as the AWS credentials of everything run inside the block."""
+    token = aws_environment.set(environment)
+    try:
+        yield
+    finally:
+        aws_environment.reset(token)
@@ -0,0 +1,81 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from app.core.constants import EXECUTOR_PROVIDER_WORKERS, EXECUTOR_AWS_WORKERS, EXECUTOR_IO_WORKERS
+from app.core.metrics import metrics
+
+# Pool sizes per kind of blocking work:
+#   provider - Jenkins triggers and Kubernetes patching (may sleep in retry loops)
+#   aws      - boto3 STS calls
+#   io       - state store and file reads/writes
+EXECUTOR_POOLS = {
+    "provider": EXECUTOR_PROVIDER_WORKERS,
+    "aws": EXECUTOR_AWS_WORKERS,
+    "io": EXECUTOR_IO_WORKERS,
+}
+
+
+class BlockingExecutors:
+    """
+    Bounded thread pools for blocking calls made from async code.
+
+    Each kind of work gets its own pool, so slow provider calls cannot starve
+    quick state store reads, and none of them run on the event loop.
+    """
+
+    def __init__(self, pools: Dict[str, int] = EXECUTOR_POOLS):
+        self.pools = pools
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._in_flight: Dict[str, int] = {kind: 0 for kind in pools}
+        self._lock = threading.Lock()
+        metrics.register_collector("executors", self.stats)
+
+    def get(self, kind: str) -> ThreadPoolExecutor:
+        with self._lock:
+            executor = self._executors.get(kind)
+            if executor is None:
+                if kind not in self.pools:
+                    raise ValueError(f"Unknown executor kind: {kind}")
+                executor = ThreadPoolExecutor(max_workers=self.pools[kind], thread_name_prefix=f"{kind}-executor")
+                self._executors[kind] = executor
+            return executor
+
+    async def run(self, kind: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in the executor for ``kind`` and await its result
+
+        Context variables are copied into the worker thread, as ``asyncio.to_thread`` does.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        with self._lock:
+            self._in_flight[kind] = self._in_flight.get(kind, 0) + 1
+        try:
+            return await loop.run_in_executor(self.get(kind), call)
+        finally:
+            with self._lock:
+                self._in_flight[kind] -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                kind: {"max_workers": size, "in_flight": self._in_flight.get(kind, 0)}
+                for kind, size in self.pools.items()
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+executors = BlockingExecutors()
+
+
+async def run_blocking(kind: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    return await executors.run(kind, func, *args, **kwargs)
@@ -0,0 +1,314 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import log_level
+from app.core.executors import run_blocking
+from app.core.logging import setup_logger
+from app.core.builds import BUILD_SUCCESS, build_tracker
+from app.core.jobs import JOB_FAILED, JOB_SUCCEEDED, JobConflict, job_queue
+from app.core.state_store import get_state_store, record_revision
+from app.core.workers import RecordSuperseded, worker_registry
+
+logger = setup_logger(__name__, log_level)
+
+FLEET_KIND = "fleet_operation"
+
+FLEET_RUNNING = "running"
+FLEET_PAUSED = "paused"
+FLEET_ABORTED = "aborted"
+FLEET_COMPLETED = "completed"
+
+WAVE_PENDING = "pending"
+WAVE_RUNNING = "running"
+WAVE_HALTED = "halted"
+WAVE_COMPLETED = "completed"
+
+ITEM_SKIPPED = "skipped"
+FINAL_ITEM_STATES = ("succeeded", JOB_FAILED, ITEM_SKIPPED)
+
+# Fleet operations and the job kind each one runs per partner.
+FLEET_OPERATIONS = {
+    "redeploy": "redeploy_zone_partner",
+    "delete": "delete_zone_partner",
+}
+
+# Partners already in these Terraform states are left out of a fleet operation.
+EXCLUDED_STATES = ("Deleted",)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FleetOperationManager:
+    """
+    Runs an operation over every partner matching a filter, in waves.
+
+    Waves run one after another, with at most ``concurrency`` jobs of the current
+    wave in flight. A partner's item is final once its job and the pipeline
+    the job triggered have both finished; a failed pipeline fails the item.
+    When more than ``error_threshold`` of a wave's partners have failed, no further partners are started and the operation is paused (to be
+    resumed by an operator) or aborted. The operation is a "fleet_operation"
+    record updated as every job finishes, and resumes after a restart.
+
+    The operation is driven by the worker that owns it. Pause, resume and abort
+    may be handled by any worker: they change the record with a
+    compare-and-swap, and the owner stops driving once its next write or
+    submission finds the record changed.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # The items of a wave finish concurrently; an operation's writes are serialized
+        # so one does not fail the revision check of another still in flight.
+        self._save_locks: Dict[str, asyncio.Lock] = {}
+        self._running = False
+
+    @staticmethod
+    def select_partners(filters: Dict[str, str], page_size: int = 500) -> List[str]:
+        partner_ids = []
+        cursor = None
+        while True:
+            rows = get_state_store().query_zone_partners(filters, cursor, page_size)
+            partner_ids.extend(row["partner_id"] for row in rows if row["terraform_state"] not in EXCLUDED_STATES)
+            if len(rows) < page_size:
+                return partner_ids
+            cursor = rows[-1]["partner_id"]
+
+    def create(
+        self,
+        operation: str,
+        filters: Dict[str, str],
+        wave_size: int,
+        concurrency: int,
+        error_threshold: float,
+        on_threshold: str,
+    ) -> dict:
+        """
+        Select the partners and start the first wave
+
+        Args:
+            operation: Key of ``FLEET_OPERATIONS``
+            filters: Partner index filters selecting the targets
+            wave_size: Number of partners per wave
+            concurrency: Maximum number of jobs in flight within a wave
+            error_threshold: Fraction of a wave that may fail before the operation halts
+            on_threshold: "pause" or "abort"
+
+        Returns:
+            dict: The fleet operation record
+        """
+        partner_ids = self.select_partners(filters)
+        waves = [
+            {
+                "index": index,
+                "state": WAVE_PENDING,
+                "acknowledged_failures": 0,
+                "items": [
+                    {"partner_id": partner_id, "job_id": None, "state": None, "error": None}
+                    for partner_id in partner_ids[start:start + wave_size]
+                ],
+            }
+            for index, start in enumerate(range(0, len(partner_ids), wave_size))
+        ]
+        fleet_op = {
+            "id": str(uuid.uuid4()),
+            "operation": operation,
+            "filters": filters,
+            "wave_size": wave_size,
+            "concurrency": concurrency,
+            "error_threshold": error_threshold,
+            "on_threshold": on_threshold,
+            "state": FLEET_RUNNING,
+            "current_wave": 0,
+            "created_at": _now(),
+            "finished_at": None,
+            "waves": waves,
+            "owner": worker_registry.worker_id,
+        }
+        get_state_store().put_record(FLEET_KIND, fleet_op["id"], fleet_op)
+        logger.info(
+            f"Fleet {operation} {fleet_op['id']} selected {len(partner_ids)} partners in {len(waves)} waves"
+        )
+        self._spawn(fleet_op)
+        return fleet_op
+
+    def get(self, operation_id: str) -> Optional[dict]:
+        return get_state_store().get_record(FLEET_KIND, operation_id)
+
+    async def _save(self, fleet_op: dict) -> None:
+        async with self._save_locks.setdefault(fleet_op["id"], asyncio.Lock()):
+            await run_blocking("io", worker_registry.save, FLEET_KIND, fleet_op)
+
+    async def _check_current(self, fleet_op: dict) -> None:
+        """Raise RecordSuperseded if the operation was paused, resumed or aborted by another worker."""
+        if record_revision(await run_blocking("io", self.get, fleet_op["id"])) != record_revision(fleet_op):
+            raise RecordSuperseded(f"{FLEET_KIND} {fleet_op['id']} was changed by another worker")
+
+    def _spawn(self, fleet_op: dict) -> None:
+        self._tasks[fleet_op["id"]] = asyncio.create_task(self._drive(fleet_op), name=f"fleet-{fleet_op['id']}")
+
+    @staticmethod
+    def _tripped(fleet_op: dict, wave: dict) -> bool:
+        failed = sum(item["state"] == JOB_FAILED for item in wave["items"]) - wave["acknowledged_failures"]
+        return failed > fleet_op["error_threshold"] * len(wave["items"])
+
+    async def _run_wave(self, fleet_op: dict, wave: dict) -> bool:
+        kind = FLEET_OPERATIONS[fleet_op["operation"]]
+        slots = asyncio.Semaphore(fleet_op["concurrency"])
+
+        async def run_item(item: dict) -> None:
+            async with slots:
+                if item["state"] in FINAL_ITEM_STATES:
+                    return
+                if item["job_id"] is None:
+                    if self._tripped(fleet_op, wave):
+                        return
+                    await self._check_current(fleet_op)
+                    try:
+                        job = await job_queue.submit_when_possible(
+                            kind,
+                            {"partner_id": item["partner_id"]},
+                            item["partner_id"],
+                            idempotency_key=f"fleet:{fleet_op['id']}:{item['partner_id']}",
+                        )
+                    except JobConflict as e:
+                        item.update(state=ITEM_SKIPPED, error=str(e))
+                        await self._save(fleet_op)
+                        return
+                    item["job_id"] = job["id"]
+                    await self._save(fleet_op)
+                job = await job_queue.wait(item["job_id"])
+                if job is None:
+                    item.update(state=JOB_FAILED, error="Job record no longer exists")
+                elif job["state"] != JOB_SUCCEEDED:
+                    item.update(state=job["state"], error=job["error"])
+                else:
+                    # The job only triggers the pipeline; the operation's outcome is the build's.
+                    build = await build_tracker.wait_for_job(job["id"])
+                    if build is not None and build["result"] != BUILD_SUCCESS:
+                        item.update(state=JOB_FAILED, error=f"Pipeline finished with result {build['result']}")
+                    else:
+                        item.update(state=job["state"], error=job["error"])
+                await self._save(fleet_op)
+
+        tasks = [asyncio.ensure_future(run_item(item)) for item in wave["items"]]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        return self._tripped(fleet_op, wave)
+
+    async def _drive(self, fleet_op: dict) -> None:
+        try:
+            while fleet_op["current_wave"] < len(fleet_op["waves"]):
+                wave = fleet_op["waves"][fleet_op["current_wave"]]
+                wave["state"] = WAVE_RUNNING
+                await self._save(fleet_op)
+                if await self._run_wave(fleet_op, wave):
+                    wave["state"] = WAVE_HALTED
+                    if fleet_op["on_threshold"] == "abort":
+                        fleet_op.update(state=FLEET_ABORTED, finished_at=_now())
+                    else:
+                        fleet_op["state"] = FLEET_PAUSED
+                    await self._save(fleet_op)
+                    logger.warning(
+                        f"Fleet operation {fleet_op['id']} {fleet_op['state']}: "
+                        f"wave {wave['index']} crossed the error threshold"
+                    )
+                    return
+                wave["state"] = WAVE_COMPLETED
+                fleet_op["current_wave"] += 1
+                await self._save(fleet_op)
+            fleet_op.update(state=FLEET_COMPLETED, finished_at=_now())
+            await self._save(fleet_op)
+            logger.info(f"Fleet operation {fleet_op['id']} completed")
+        except RecordSuperseded:
+            logger.info(f"Fleet operation {fleet_op['id']} was changed by another worker; no longer driving it")
+        except Exception as e:
+            logger.error(f"Error running fleet operation {fleet_op['id']}: {str(e)}")
+        finally:
+            self._tasks.pop(fleet_op["id"], None)
+            self._save_locks.pop(fleet_op["id"], None)
+
+    async def _halt(self, operation_id: str, state: str) -> Optional[dict]:
+        task = self._tasks.pop(operation_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        while True:
+            fleet_op = await run_blocking("io", self.get, operation_id)
+            if fleet_op is None or fleet_op["state"] not in (FLEET_RUNNING, FLEET_PAUSED):
+                return fleet_op
+            fleet_op["state"] = state
+            if state == FLEET_ABORTED:
+                fleet_op["finished_at"] = _now()
+            try:
+                await self._save(fleet_op)
+                return fleet_op
+            except RecordSuperseded:
+                # The owner wrote progress in between; apply the change to the newer record.
+                continue
+
+    async def pause(self, operation_id: str) -> Optional[dict]:
+        """Stop starting new partners; jobs already started run to completion."""
+        return await self._halt(operation_id, FLEET_PAUSED)
+
+    async def abort(self, operation_id: str) -> Optional[dict]:
+        """Stop the operation for good; jobs already started run to completion."""
+        return await self._halt(operation_id, FLEET_ABORTED)
+
+    async def resume(self, operation_id: str) -> Optional[dict]:
+        """
+        Continue a paused operation with the wave it stopped in
+
+        Failures seen so far in that wave are acknowledged, so the error
+        threshold applies afresh to the partners that remain.
+        """
+        while True:
+            fleet_op = await run_blocking("io", self.get, operation_id)
+            if fleet_op is None or fleet_op["state"] != FLEET_PAUSED:
+                return fleet_op
+            if fleet_op["current_wave"] < len(fleet_op["waves"]):
+                wave = fleet_op["waves"][fleet_op["current_wave"]]
+                wave["acknowledged_failures"] = sum(item["state"] == JOB_FAILED for item in wave["items"])
+            # Whichever worker resumes the operation drives it from now on.
+            fleet_op.update(state=FLEET_RUNNING, owner=worker_registry.worker_id)
+            try:
+                await self._save(fleet_op)
+            except RecordSuperseded:
+                continue
+            self._spawn(fleet_op)
+            return fleet_op
+
+    async def adopt(self) -> None:
+        """Resume running operations whose owner is gone: an earlier run of this service, or a dead worker."""
+        if not self._running:
+            return
+        for fleet_op in await run_blocking("io", worker_registry.orphaned, FLEET_KIND, [FLEET_RUNNING]):
+            if fleet_op["id"] in self._tasks:
+                continue
+            fleet_op = await run_blocking("io", worker_registry.claim, FLEET_KIND, fleet_op)
+            if fleet_op is not None:
+                logger.warning(f"Resuming fleet operation {fleet_op['id']}")
+                self._spawn(fleet_op)
+
+    async def start(self) -> None:
+        self._running = True
+        await self.adopt()
+        worker_registry.register_sweep("fleet_operations", self.adopt)
+
+    async def stop(self) -> None:
+        self._running = False
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+
+fleet_manager = FleetOperationManager()
@@ -1,67 +1,73 @@
-import json
-import os
 from datetime import datetime
+from typing import Any, Dict
 
 from app.core.config import log_level
 from app.core.logging import setup_logger
-from app.core.constants import STATE_PATH
+from app.core.state_store import get_state_store
+from app.core.status_broker import status_broker
+from app.core.status_cache import status_cache
+from app.core.status_journal import record_status_events
+from app.core.status_summary import status_summary
+from app.core.status_writer import status_writer
 from app.models import ZonePartner
 
 logger = setup_logger(__name__, log_level)
 
 
 def save_zone_partner_payload(zone_partner):
-    directory = os.path.join(STATE_PATH, str(zone_partner.partner_id))
-    os.makedirs(directory, exist_ok=True)
-    filename = os.path.join(directory, f"zone_partner_{zone_partner.partner_id}.json")
-    with open(filename, 'w') as f:
-        json.dump(zone_partner.dict(), f)
-    logger.info(f"Zone partner saved to file: {filename}")
+    get_state_store().save_zone_partner(str(zone_partner.partner_id), zone_partner.dict())
+    status_summary.record_payload(str(zone_partner.partner_id), zone_partner.variables.get("region"))
+    logger.info(f"Zone partner saved for partner_id: {zone_partner.partner_id}")
 
 
 def update_status(partner_id, key, value):
-    directory = os.path.join(STATE_PATH, str(partner_id), "status")
-    os.makedirs(directory, exist_ok=True)
-    filename = os.path.join(directory, f"status_{partner_id}.json")
+    update_status_fields(partner_id, {key: value})
 
-    try:
-        if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                data = json.load(f)
-        else:
-            data = {}
-
-        data["Last Updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        data[key] = value
 
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+def update_status_fields(partner_id, fields: Dict[str, Any], journal: bool = True):
+    """
+    Set several status keys at once: one journal append, one version bump, and one
+    snapshot update, which the status writer coalesces with others before writing.
 
-        logger.info(f"Status updated for partner_id {partner_id}: {key} = {value}")
+    ``journal`` False applies keys already in the journal, when compaction recovers them.
+    """
+    try:
+        # The partner lock spans the append and the snapshot update, so journal order
+        # matches snapshot order and replaying the journal never resurrects an older value.
+        with status_writer.locked(str(partner_id)):
+            # Journal first so the change is durable even before the writer flushes the snapshot.
+            if journal:
+                record_status_events(str(partner_id), fields)
+            data = status_writer.update(str(partner_id), {
+                "Last Updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                **fields,
+            })
+        status_cache.invalidate(str(partner_id))
+        status_cache.set_version(str(partner_id), data["Version"])
+        for key, value in fields.items():
+            status_summary.record_status(str(partner_id), key, value)
+        status_broker.publish(str(partner_id), data["Version"])
+        changes = ", ".join(f"{key} = {value}" for key, value in fields.items())
+        logger.info(f"Status updated for partner_id {partner_id}: {changes}")
     except Exception as e:
         logger.error(f"Error updating status for partner_id {partner_id}: {str(e)}")
 
 
 def load_zone_partner_json(partner_id: str) -> ZonePartner:
-    filename = os.path.join(STATE_PATH, str(partner_id), f"zone_partner_{partner_id}.json")
-    if not os.path.exists(filename):
+    zone_partner_dict = get_state_store().load_zone_partner(str(partner_id))
+    if zone_partner_dict is None:
         logger.error(f"No saved zone partner found with id: {partner_id}")
         return None
-    with open(filename, 'r') as f:
-        zone_partner_dict = json.load(f)
     return ZonePartner(**zone_partner_dict)
 
 def load_status_json(partner_id: str):
-    filename = os.path.join(
-        STATE_PATH, f"{partner_id}", f"status", f"status_{partner_id}.json"
-    )
-    if not os.path.exists(filename):
-        logger.error(f"No status file found with id: {partner_id}")
-        return None
     try:
-        with open(filename, "r") as f:
-            data = json.load(f)
-        return data
+        data = status_writer.get_pending(str(partner_id))
+        if data is None:
+            data = get_state_store().load_status(str(partner_id))
     except Exception as e:
         logger.error(f"Error loading status JSON: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+    if data is None:
+        logger.error(f"No status file found with id: {partner_id}")
+    return data
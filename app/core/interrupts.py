@@ -0,0 +1,19 @@
+import threading
+
+# Set when a drain runs out of time, to stop blocking steps at their next wait.
+interrupted = threading.Event()
+
+
+class JobInterrupted(BaseException):
+    """
+    Raised inside a blocking step once a shutdown drain has run out of time.
+
+    Like asyncio.CancelledError it derives from BaseException, so the broad
+    ``except Exception`` retry loops in the steps do not swallow it.
+    """
+
+
+def interruptible_sleep(seconds: float) -> None:
+    """time.sleep for retry loops in job steps, cut short by a shutdown that ran out of time."""
+    if interrupted.wait(seconds):
+        raise JobInterrupted()
@@ -1,27 +1,204 @@
+import hashlib
+import json
 import jenkins
 import logging
+import threading
+import time
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from app.core.config import config
+from app.core.constants import JENKINS_POOL_SIZE, JENKINS_TIMEOUT
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+PROGRESSIVE_TEXT = '%(folder_url)sjob/%(short_name)s/%(number)s/logText/progressiveText?start=%(start)s'
+RECENT_BUILDS = '%(folder_url)sjob/%(short_name)s/api/json?tree=builds[number,building,result,url]{0,%(count)s}'
+
+
+class PooledJenkins(jenkins.Jenkins):
+    """
+    jenkins.Jenkins sharing one pooled keep-alive session between threads.
+
+    The CSRF crumb is fetched once and reused; a request rejected with 403
+    fetches a fresh crumb and is sent once more, since crumbs stop being valid
+    when Jenkins restarts or the session they were issued for expires.
+    """
+
+    def __init__(self, url, username=None, password=None, pool_size: int = JENKINS_POOL_SIZE,
+                 timeout: float = JENKINS_TIMEOUT):
+        super().__init__(url, username=username, password=password, timeout=timeout)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=jenkins.DEFAULT_RETRIES, backoff_factor=0.1),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Reentrant: fetching the crumb may resolve authentication first.
+        self._crumb_lock = threading.RLock()
+        self._local = threading.local()
+        self.crumb_refreshes = 0
+
+    @property
+    def calls(self) -> int:
+        """HTTP requests sent by the current thread since ``reset_calls``."""
+        return getattr(self._local, "calls", 0)
+
+    def reset_calls(self) -> None:
+        self._local.calls = 0
+
+    def _maybe_add_auth(self):
+        if self._auth_resolved:
+            return
+        with self._crumb_lock:
+            super()._maybe_add_auth()
+
+    def maybe_add_crumb(self, req):
+        if self.crumb is None:
+            with self._crumb_lock:
+                # Only the first thread in fetches the crumb; the others find it set.
+                if self.crumb is None:
+                    super().maybe_add_crumb(req)
+                    return
+        super().maybe_add_crumb(req)
+
+    def _request(self, req, stream=None):
+        self._local.calls = self.calls + 1
+        response = super()._request(req, stream)
+        crumb = self.crumb
+        if response.status_code != 403 or not crumb or crumb["crumbRequestField"] not in req.headers:
+            return response
+        logger.info("Jenkins rejected the cached crumb; retrying with a fresh one")
+        with self._crumb_lock:
+            if self.crumb is crumb:
+                self.crumb = None
+                self.crumb_refreshes += 1
+        del req.headers[crumb["crumbRequestField"]]
+        self.maybe_add_crumb(req)
+        self._local.calls = self.calls + 1
+        return super()._request(req, stream)
+
+    def get_recent_builds(self, name: str, count: int = 100) -> Dict[int, dict]:
+        """Number, building flag and result of a job's latest ``count`` builds, in one request, by build number."""
+        folder_url, short_name = self._get_job_folder(name)
+        response = self.jenkins_open(requests.Request(
+            'GET', self._build_url(RECENT_BUILDS, {'folder_url': folder_url, 'short_name': short_name, 'count': count})
+        ))
+        return {build['number']: build for build in json.loads(response).get('builds', [])}
+
+    def open_progressive_text(self, name: str, number: int, start: int) -> requests.Response:
+        """
+        Streamed console output of a build from byte ``start`` on
+
+        The response's X-Text-Size header is the offset to continue from, and
+        X-More-Data is "true" while the build may still write more. The caller
+        must close the response.
+        """
+        folder_url, short_name = self._get_job_folder(name)
+        return self.jenkins_request(requests.Request('GET', self._build_url(PROGRESSIVE_TEXT, {
+            'folder_url': folder_url, 'short_name': short_name, 'number': number, 'start': start,
+        })), stream=True)
+
+
+class JenkinsClientManager:
+    """
+    Long-lived Jenkins client, shared by every thread of the process.
+
+    The client is built from ``config.get_jenkins_config()`` on first use and
+    rebuilt only when that configuration changes, so triggers reuse its
+    connections, authentication and crumb. Trigger latency and the number of
+    HTTP calls each trigger took are reported through the metrics registry.
+    """
+
+    def __init__(self, pool_size: int = JENKINS_POOL_SIZE, timeout: float = JENKINS_TIMEOUT):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._client: Optional[PooledJenkins] = None
+        self._fingerprint: Optional[str] = None
+        self._stats = {"clients_built": 0, "triggers": 0, "trigger_seconds": 0.0, "trigger_calls": 0}
+        metrics.register_collector("jenkins", self.stats)
+
+    @staticmethod
+    def _config_fingerprint(jenkins_config: dict) -> str:
+        return hashlib.sha256(json.dumps(jenkins_config, sort_keys=True, default=str).encode()).hexdigest()
+
+    def client(self) -> PooledJenkins:
+        jenkins_config = config.get_jenkins_config()
+        fingerprint = self._config_fingerprint(jenkins_config)
+        with self._lock:
+            if self._client is None or fingerprint != self._fingerprint:
+                if self._client is not None:
+                    logger.info("Jenkins configuration changed; rebuilding the Jenkins client")
+                # Requests still in flight on the old client finish on its session.
+                self._client = PooledJenkins(
+                    jenkins_config['url'],
+                    username=jenkins_config['username'],
+                    password=jenkins_config['api_token'],
+                    pool_size=self.pool_size,
+                    timeout=self.timeout,
+                )
+                self._fingerprint = fingerprint
+                self._stats["clients_built"] += 1
+            return self._client
+
+    def build_job(self, name: str, parameters: dict) -> int:
+        """
+        Trigger a pipeline
+
+        Args:
+            name: Pipeline name
+            parameters: Build parameters
+
+        Returns:
+            int: Number of the queue item Jenkins created for the build
+        """
+        client = self.client()
+        client.reset_calls()
+        started = time.monotonic()
+        try:
+            return client.build_job(name, parameters=parameters)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._stats["triggers"] += 1
+                self._stats["trigger_seconds"] += elapsed
+                self._stats["trigger_calls"] += client.calls
+            metrics.set_gauge("jenkins_trigger_seconds", elapsed)
+            metrics.set_gauge("jenkins_trigger_calls", client.calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            client = self._client
+        triggers = stats["triggers"] or 1
+        return {
+            "clients_built": stats["clients_built"],
+            "triggers": stats["triggers"],
+            "avg_trigger_seconds": stats["trigger_seconds"] / triggers,
+            "avg_calls_per_trigger": stats["trigger_calls"] / triggers,
+            "crumb_refreshes": client.crumb_refreshes if client is not None else 0,
+        }
+
+
+jenkins_clients = JenkinsClientManager()
+
 
 def get_jenkins_server():
-    jenkins_config = config.get_jenkins_config()
-    return jenkins.Jenkins(
-        jenkins_config['url'],
-        username=jenkins_config['username'],
-        password=jenkins_config['api_token']
-    )
+    return jenkins_clients.client()
 
 
 def trigger_pipeline(params):
     jenkins_config = config.get_jenkins_config()
-    server = get_jenkins_server()
 
     logger.info(f"Triggering pipeline '{jenkins_config['pipeline_name']}' with parameters {params}")
     try:
-        server.build_job(jenkins_config['pipeline_name'], parameters=params)
+        queue_item = jenkins_clients.build_job(jenkins_config['pipeline_name'], params)
         logger.info(f"Pipeline '{jenkins_config['pipeline_name']}' triggered successfully")
+        return queue_item
     except Exception as e:
         logger.error(f"Error triggering pipeline: {str(e)}")
         raise
@@ -56,6 +233,17 @@ def add_destroy_env(parameters):
     return trimmed_parameters
 
 
+def pipeline_requests(zone_partner, variables) -> dict:
+    """The pipeline and parameters each operation on a partner triggers, keyed by operation."""
+    pipeline_name = config.get_jenkins_config().get('pipeline_name')
+    parameters = convert_zone_partner_to_params(zone_partner, variables)
+    return {
+        'create': {'pipeline': pipeline_name, 'parameters': parameters},
+        'redeploy': {'pipeline': pipeline_name, 'parameters': trim_parameters(parameters)},
+        'delete': {'pipeline': pipeline_name, 'parameters': add_destroy_env(parameters)},
+    }
+
+
 def trigger_pipeline_create_aws(zone_partner, parameters: dict):
     params = convert_zone_partner_to_params(zone_partner, parameters)
     trigger_pipeline(params)
@@ -0,0 +1,548 @@
+import asyncio
+import hashlib
+import json
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import JOB_WORKERS, JOB_QUEUE_MAX, JOB_DRAIN_TIMEOUT
+from app.core.builds import build_tracker
+from app.core.executors import run_blocking
+from app.core.interrupts import JobInterrupted, interrupted
+from app.core.leases import lease_manager
+from app.core.metrics import metrics
+from app.core.scheduler import FairScheduler, ScheduledJob
+from app.core.state_store import get_state_store, record_revision
+from app.core.workers import RecordSuperseded, worker_registry
+
+logger = setup_logger(__name__, log_level)
+
+JOB_KIND = "job"
+IDEMPOTENCY_KIND = "idempotency"
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATES = (JOB_QUEUED, JOB_RUNNING)
+
+JobHandler = Callable[[dict], Awaitable[Any]]
+
+# The job whose handler is running; executors copy it into their worker threads.
+current_job: ContextVar[Optional[dict]] = ContextVar("current_job", default=None)
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue already holds JOB_QUEUE_MAX jobs."""
+
+
+class JobConflict(Exception):
+    """Raised when a partner is leased to an active job of a different kind."""
+
+    def __init__(self, message: str, job: dict):
+        super().__init__(message)
+        self.job = job
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when an Idempotency-Key is presented again with a different request."""
+
+
+class JobQueueDraining(JobQueueFull):
+    """Raised when a job is submitted while the service is shutting down."""
+
+
+def _checkpoints() -> Tuple[Optional[dict], dict]:
+    job = current_job.get()
+    return job, (job.setdefault("checkpoints", {}) if job is not None else {})
+
+
+def _record_step(job: Optional[dict], name: str, result: Any) -> None:
+    if job is None:
+        return
+    job["checkpoints"][name] = {"completed_at": _now(), "result": result}
+    worker_registry.save(JOB_KIND, job)
+
+
+def run_step(name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run one resumable step of the current job
+
+    The step's completion and JSON result are checkpointed on the job record.
+    When an interrupted job runs again, steps an earlier attempt completed are
+    skipped and their recorded result is returned. Outside a job the step
+    simply runs.
+
+    Args:
+        name: Step name, unique within the job kind
+        func: Blocking callable performing the step
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Any: The step's result
+    """
+    job, checkpoints = _checkpoints()
+    if name in checkpoints:
+        logger.info(f"Job {job['id']} already completed step {name}; skipping it")
+        return checkpoints[name]["result"]
+    if interrupted.is_set():
+        raise JobInterrupted()
+    result = func(*args, **kwargs)
+    _record_step(job, name, result)
+    return result
+
+
+async def run_step_async(name: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """``run_step`` for a coroutine function."""
+    job, checkpoints = _checkpoints()
+    if name in checkpoints:
+        logger.info(f"Job {job['id']} already completed step {name}; skipping it")
+        return checkpoints[name]["result"]
+    result = await func(*args, **kwargs)
+    _record_step(job, name, result)
+    return result
+
+
+def _fingerprint(kind: str, params: dict, partner_id: Optional[str]) -> str:
+    body = json.dumps({"kind": kind, "params": params, "partner_id": partner_id}, sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _idempotency_record_id(key: str) -> str:
+    # Keys are client supplied; hash them so they are safe as file and object names.
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _scheduling_keys(params: dict, partner_id: Optional[str]) -> dict:
+    """user_id, account_id and region of a job, from its parameters or else the partner's saved payload."""
+    source = params
+    if partner_id and not params.get("account_id"):
+        source = get_state_store().load_zone_partner(partner_id) or {}
+    variables = source.get("variables") or {}
+    return {
+        "user_id": source.get("user_id"),
+        "account_id": source.get("account_id"),
+        "region": variables.get("region") or source.get("region"),
+    }
+
+
+def _scheduled(job: dict) -> ScheduledJob:
+    return ScheduledJob(
+        job_id=job["id"],
+        user_id=job.get("user_id"),
+        account_id=job.get("account_id"),
+        region=job.get("region"),
+    )
+
+
+class JobQueue:
+    """
+    Persistent job queue drained by a fixed pool of asyncio workers.
+
+    Every job is a "job" record in the state store, so its state survives the
+    process. Jobs still queued or running when the process stopped are picked up
+    again by ``start``. Handlers are registered per job kind and receive the
+    job's JSON parameters. The order in which workers pick up jobs, and how many
+    run at once per account and region, is left to a ``FairScheduler``.
+
+    Several service processes may share the store. A job is run by the worker
+    that owns it (see ``WorkerRegistry``), and jobs of a worker that stopped
+    heartbeating are adopted by the others. Each process has its own scheduler,
+    so the account and region caps apply per process: with WEB_WORKERS
+    processes an account may run up to WEB_WORKERS times its cap.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, max_queued: int = JOB_QUEUE_MAX):
+        self.workers = workers
+        self.max_queued = max_queued
+        self._handlers: Dict[str, JobHandler] = {}
+        self._scheduler: Optional[FairScheduler] = None
+        self._tasks: List[asyncio.Task] = []
+        self._busy: Dict[asyncio.Task, str] = {}
+        self._draining = False
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        metrics.register_collector("jobs", self.stats)
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        self._handlers[kind] = handler
+
+    async def submit(
+        self, kind: str, params: dict, partner_id: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Tuple[dict, bool]:
+        """
+        Persist a new job and queue it for the worker pool
+
+        A job for a partner takes that partner's lease until it finishes, or
+        until the pipeline it triggered finishes. A request for the same
+        operation while the lease is held coalesces onto the holding job; a
+        different operation is rejected. Repeating an
+        Idempotency-Key returns the job created by its first use. The state
+        store round trips run in the io executor; only queueing the job runs on
+        the event loop.
+
+        Args:
+            kind: Registered job kind, e.g. "create_zone_partner"
+            params: JSON-serialisable parameters passed to the handler
+            partner_id: The ID of the partner zone the job acts on, if any
+            idempotency_key: Client-supplied key identifying a logical request
+
+        Returns:
+            Tuple[dict, bool]: The job record, and whether it was created by this call
+
+        Raises:
+            ValueError: If no handler is registered for the kind
+            IdempotencyKeyReused: If the key was first used for a different request
+            JobConflict: If the partner is leased to an active job of another kind
+            JobQueueFull: If the queue is at capacity
+            JobQueueDraining: If the service is shutting down
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unsupported job kind: {kind}")
+        if self._draining:
+            metrics.incr("jobs_rejected")
+            raise JobQueueDraining("Service is shutting down; not accepting new jobs")
+        if self._scheduler is None:
+            raise RuntimeError("Job queue is not running")
+
+        job, created = await run_blocking("io", self._persist, kind, params, partner_id, idempotency_key)
+        if created:
+            # The scheduler lives on the event loop; a queue stopped meanwhile leaves the job for adoption.
+            if self._scheduler is not None:
+                self._scheduler.put(_scheduled(job))
+            metrics.incr("jobs_submitted")
+            logger.info(f"Queued {kind} job {job['id']} for partner_id {partner_id}")
+        return job, created
+
+    def _persist(
+        self, kind: str, params: dict, partner_id: Optional[str], idempotency_key: Optional[str]
+    ) -> Tuple[dict, bool]:
+        """The blocking part of ``submit``: idempotency, lease and job records."""
+        store = get_state_store()
+        fingerprint = _fingerprint(kind, params, partner_id)
+        if idempotency_key:
+            seen = store.get_record(IDEMPOTENCY_KIND, _idempotency_record_id(idempotency_key))
+            if seen is not None:
+                if seen["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyReused("Idempotency-Key was already used for a different request")
+                job = self.get(seen["job_id"])
+                if job is not None:
+                    metrics.incr("jobs_coalesced")
+                    return job, False
+
+        scheduling_keys = _scheduling_keys(params, partner_id)
+        while True:
+            if partner_id:
+                holder = self._lease_holder(partner_id)
+                if holder is not None:
+                    if holder["kind"] != kind:
+                        metrics.incr("jobs_conflicted")
+                        raise JobConflict(
+                            f"partner_id {partner_id} is busy with {holder['kind']} job {holder['id']}", holder
+                        )
+                    self._remember_idempotency_key(idempotency_key, fingerprint, holder)
+                    metrics.incr("jobs_coalesced")
+                    return holder, False
+
+            if self._scheduler is not None and self._scheduler.qsize() >= self.max_queued:
+                metrics.incr("jobs_rejected")
+                raise JobQueueFull(f"Job queue is full ({self.max_queued} jobs waiting)")
+
+            job_id = str(uuid.uuid4())
+            job = {
+                "id": job_id,
+                "kind": kind,
+                "partner_id": partner_id,
+                **scheduling_keys,
+                "params": params,
+                "state": JOB_QUEUED,
+                "attempts": 0,
+                "created_at": _now(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+                "owner": worker_registry.worker_id,
+            }
+            # The job is written before its lease is taken, so a lease never names a job that does not exist.
+            store.put_record(JOB_KIND, job_id, job)
+            if partner_id and lease_manager.acquire(partner_id, job_id, kind) is not None:
+                # Another worker leased the partner since the check above: drop this job and decide again.
+                store.delete_record(JOB_KIND, job_id)
+                continue
+            self._remember_idempotency_key(idempotency_key, fingerprint, job)
+            return job, True
+
+    async def submit_when_possible(
+        self, kind: str, params: dict, partner_id: Optional[str], idempotency_key: str, backoff: float = 5
+    ) -> dict:
+        """
+        Submit a job on behalf of a background driver, waiting while the queue is full
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serialisable parameters passed to the handler
+            partner_id: The ID of the partner zone the job acts on
+            idempotency_key: Key that makes resubmission after a restart return the same job
+            backoff: Seconds to wait before retrying while the queue is full
+
+        Returns:
+            dict: The job record
+
+        Raises:
+            JobConflict: If the partner is leased to an active job of another kind
+        """
+        while True:
+            try:
+                job, _ = await self.submit(kind, params, partner_id, idempotency_key)
+                return job
+            except JobQueueFull:
+                await asyncio.sleep(backoff)
+
+    def _lease_holder(self, partner_id: str) -> Optional[dict]:
+        """
+        Job holding the partner's lease: an active job, or a finished one whose pipeline is still running.
+        Stale leases of finished jobs are dropped.
+        """
+        lease = lease_manager.holder(partner_id)
+        if lease is None:
+            return None
+        job = self.get(lease["job_id"])
+        if job is not None and (job["state"] in ACTIVE_JOB_STATES or build_tracker.in_flight(job["id"])):
+            return job
+        lease_manager.release(partner_id, lease["job_id"])
+        return None
+
+    @staticmethod
+    def _remember_idempotency_key(key: Optional[str], fingerprint: str, job: dict) -> None:
+        if not key:
+            return
+        store = get_state_store()
+        record_id = _idempotency_record_id(key)
+        # Conditional on the record as read, so two workers racing on a key do not overwrite each other.
+        store.swap_record(IDEMPOTENCY_KIND, record_id, {
+            "id": record_id,
+            "fingerprint": fingerprint,
+            "job_id": job["id"],
+            "state": None,
+            "created_at": _now(),
+        }, record_revision(store.get_record(IDEMPOTENCY_KIND, record_id)))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return get_state_store().get_record(JOB_KIND, job_id)
+
+    async def wait(self, job_id: str, recheck_interval: float = 30) -> Optional[dict]:
+        """
+        Wait until a job has finished
+
+        Jobs run by this process resolve the wait as soon as they finish; the
+        record is also re-read every ``recheck_interval`` seconds in case the
+        job is finished elsewhere.
+
+        Args:
+            job_id: The ID of the job
+            recheck_interval: Seconds between re-reads of the job record
+
+        Returns:
+            Optional[dict]: The finished job record, or None if the job does not exist
+        """
+        while True:
+            job = await run_blocking("io", self.get, job_id)
+            if job is None or job["state"] not in ACTIVE_JOB_STATES:
+                return job
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(job_id, []).append(future)
+            try:
+                return await asyncio.wait_for(future, recheck_interval)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                waiters = self._waiters.get(job_id)
+                if waiters is not None:
+                    if future in waiters:
+                        waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[job_id]
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._draining = False
+        interrupted.clear()
+        self._scheduler = FairScheduler()
+        await self.adopt()
+        worker_registry.register_sweep("jobs", self.adopt)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{index}") for index in range(self.workers)
+        ]
+
+    async def adopt(self) -> None:
+        """Queue unfinished jobs whose owner is gone: an earlier run of this service, or a dead worker."""
+        if self._scheduler is None:
+            return
+        adopted = await run_blocking("io", self._claim_orphans)
+        # Adopted jobs bypass the queue bound: they were already accepted by their first owner.
+        for job in adopted:
+            if self._scheduler is not None:
+                self._scheduler.put(_scheduled(job))
+        await run_blocking("io", self._drop_stale_leases)
+        if adopted:
+            logger.warning(f"Resuming {len(adopted)} unfinished jobs")
+
+    @staticmethod
+    def _claim_orphans() -> List[dict]:
+        """Claim the unfinished jobs of dead owners, oldest first, and retake their leases."""
+        claimed = []
+        for job in sorted(worker_registry.orphaned(JOB_KIND, ACTIVE_JOB_STATES), key=lambda job: job["created_at"]):
+            job = worker_registry.claim(JOB_KIND, job)
+            if job is None:
+                continue
+            if job.get("partner_id"):
+                lease_manager.acquire(job["partner_id"], job["id"], job["kind"])
+            claimed.append(job)
+        return claimed
+
+    def _drop_stale_leases(self) -> None:
+        # Leases whose job finished but was not released (e.g. a crash in between) are dropped.
+        for lease in lease_manager.held():
+            self._lease_holder(lease["id"])
+
+    async def _worker(self) -> None:
+        task = asyncio.current_task()
+        while not self._draining:
+            scheduled = await self._scheduler.get()
+            self._busy[task] = scheduled.job_id
+            try:
+                await self._run(scheduled.job_id)
+            except Exception as e:
+                logger.error(f"Error running job {scheduled.job_id}: {str(e)}")
+            finally:
+                self._busy.pop(task, None)
+                self._scheduler.done(scheduled)
+
+    async def _run(self, job_id: str) -> None:
+        job = await run_blocking("io", self.get, job_id)
+        if job is None or job["state"] not in ACTIVE_JOB_STATES:
+            return
+
+        # Claiming marks the job running only if no other live worker owns it.
+        job = await run_blocking(
+            "io", worker_registry.claim,
+            JOB_KIND, job, state=JOB_RUNNING, started_at=_now(), attempts=job["attempts"] + 1,
+        )
+        if job is None:
+            logger.info(f"Job {job_id} is owned by another worker")
+            return
+
+        handler = self._handlers.get(job["kind"])
+        if handler is None:
+            job.update(state=JOB_FAILED, error=f"Unsupported job kind: {job['kind']}", finished_at=_now())
+            await self._finish(job)
+            return
+
+        token = current_job.set(job)
+        try:
+            job["result"] = await handler(job["params"])
+            job["state"] = JOB_SUCCEEDED
+            metrics.incr("jobs_succeeded")
+        except (asyncio.CancelledError, JobInterrupted):
+            self._interrupt(job)
+            raise
+        except Exception as e:
+            job.update(state=JOB_FAILED, error=str(e))
+            metrics.incr("jobs_failed")
+            logger.error(f"{job['kind']} job {job_id} failed: {str(e)}")
+        finally:
+            current_job.reset(token)
+        job["finished_at"] = _now()
+        await self._finish(job)
+
+    async def _finish(self, job: dict) -> None:
+        if not await run_blocking("io", self._settle, job):
+            return
+        for future in self._waiters.pop(job["id"], ()):
+            if not future.done():
+                future.set_result(job)
+
+    def _settle(self, job: dict) -> bool:
+        """Save a finished job and release its lease; returns False if another worker adopted it."""
+        try:
+            worker_registry.save(JOB_KIND, job)
+        except RecordSuperseded:
+            # Another worker adopted the job while it ran here; its run settles the outcome.
+            logger.warning(f"Job {job['id']} was adopted by another worker; dropping this run's result")
+            return False
+        self._release(job)
+        return True
+
+    @staticmethod
+    def _interrupt(job: dict) -> None:
+        """Put an interrupted job back in the queue; whoever adopts it resumes after its last checkpoint."""
+        steps = list(job.get("checkpoints") or {})
+        job.update(state=JOB_QUEUED, interrupted_at=_now())
+        try:
+            worker_registry.save(JOB_KIND, job)
+        except RecordSuperseded:
+            return
+        metrics.incr("jobs_interrupted")
+        logger.warning(
+            f"{job['kind']} job {job['id']} interrupted after step {steps[-1] if steps else 'none'}; "
+            f"it will resume from there"
+        )
+
+    @staticmethod
+    def _release(job: dict) -> None:
+        # A job that triggered a pipeline leaves its lease to the build tracker, which releases it with the build.
+        if job.get("partner_id") and build_tracker.in_flight(job["id"]) is None:
+            lease_manager.release(job["partner_id"], job["id"])
+
+    async def drain(self, timeout: float = JOB_DRAIN_TIMEOUT) -> None:
+        """
+        Stop taking jobs and give the running ones up to ``timeout`` seconds to finish
+
+        Submissions are rejected from here on. Queued jobs stay queued for the
+        next owner. Jobs still running at the deadline are interrupted: blocking
+        steps stop at their next ``interruptible_sleep``, the job is put back in
+        the queue, and it resumes after its last checkpoint.
+        """
+        self._draining = True
+        busy = [task for task in self._tasks if task in self._busy]
+        for task in self._tasks:
+            if task not in self._busy:
+                task.cancel()
+        if not busy:
+            return
+        logger.warning(f"Draining {len(busy)} running jobs for up to {timeout:g}s")
+        _, pending = await asyncio.wait(busy, timeout=timeout)
+        if pending:
+            logger.warning(f"Interrupting {len(pending)} jobs still running after the drain timeout")
+            interrupted.set()
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def stop(self) -> None:
+        # Jobs interrupted here go back to the queue and resume from their checkpoints.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._busy = {}
+        self._scheduler = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._tasks),
+            "draining": self._draining,
+            "max_queued": self.max_queued,
+            **(self._scheduler.stats() if self._scheduler is not None else {"queued": 0}),
+        }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.state_store import get_state_store, record_revision
+
+logger = setup_logger(__name__, log_level)
+
+LEASE_KIND = "lease"
+LEASE_HELD = "held"
+
+
+class LeaseManager:
+    """
+    Per-partner operation leases, persisted as "lease" records in the state store.
+
+    A lease names the job that currently owns a partner. It survives restarts
+    together with the job, so a resumed job still excludes conflicting work.
+    Leases are taken and released with ``swap_record``, so they exclude jobs
+    submitted by every worker process sharing the store, not just this one.
+    """
+
+    def holder(self, partner_id: str) -> Optional[dict]:
+        return get_state_store().get_record(LEASE_KIND, partner_id)
+
+    def acquire(self, partner_id: str, job_id: str, kind: str) -> Optional[dict]:
+        """
+        Take the lease on a partner for a job
+
+        Args:
+            partner_id: The ID of the partner zone
+            job_id: The job that will own the partner
+            kind: The job's operation kind
+
+        Returns:
+            Optional[dict]: None if the lease was taken, otherwise the current holder's lease
+        """
+        store = get_state_store()
+        lease = {
+            "id": partner_id,
+            "job_id": job_id,
+            "kind": kind,
+            "state": LEASE_HELD,
+            "acquired_at": datetime.now(timezone.utc).isoformat(),
+        }
+        while True:
+            current = store.get_record(LEASE_KIND, partner_id)
+            if current is not None:
+                return None if current["job_id"] == job_id else current
+            if store.swap_record(LEASE_KIND, partner_id, lease, None):
+                return None
+
+    def release(self, partner_id: str, job_id: str) -> bool:
+        """Release a partner's lease if ``job_id`` still owns it."""
+        store = get_state_store()
+        current = store.get_record(LEASE_KIND, partner_id)
+        if current is None or current["job_id"] != job_id:
+            return False
+        return store.swap_record(LEASE_KIND, partner_id, None, record_revision(current))
+
+    def held(self) -> List[dict]:
+        return get_state_store().list_records(LEASE_KIND, LEASE_HELD)
+
+
+lease_manager = LeaseManager()
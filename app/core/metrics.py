@@ -0,0 +1,43 @@
+import threading
+from typing import Callable, Dict
+
+
+class Metrics:
+    """
+    Minimal in-process metrics registry.
+
+    Counters and gauges are updated directly; components that already keep
+    their own statistics can register a collector that is evaluated on snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._collectors: Dict[str, Callable[[], dict]] = {}
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_collector(self, name: str, collector: Callable[[], dict]) -> None:
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+            collectors = dict(self._collectors)
+        for name, collector in collectors.items():
+            result[name] = collector()
+        return result
+
+
+metrics = Metrics()
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.metrics import metrics
+from app.core.state_store import get_state_store
+from app.models import ZonePartner
+from app.providers.base import FINDING_ERROR
+
+logger = setup_logger(__name__, log_level)
+
+PLAN_KIND = "plan"
+PLAN_READY = "ready"
+
+# Part of every plan key; bump it when what a plan contains changes, so plans
+# cached by an older release are computed afresh instead of being applied.
+PLAN_FORMAT = 1
+
+
+def plan_key(zone_partner: ZonePartner) -> str:
+    """sha256 of everything a plan is computed from: the partner's cloud, account, ID and variables."""
+    inputs = {
+        "format": PLAN_FORMAT,
+        "cloud": zone_partner.cloud,
+        "account_id": zone_partner.account_id,
+        "partner_id": zone_partner.partner_id,
+        "variables": zone_partner.variables,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def plan_errors(plan: dict) -> list:
+    return [finding for finding in plan["findings"] if finding["severity"] == FINDING_ERROR]
+
+
+class PlanCache:
+    """
+    Plans of zone partner creations, persisted as "plan" records keyed by ``plan_key``.
+
+    A plan holds the pipeline requests and validation findings computed from a
+    partner's inputs. Planning the same inputs again returns the stored plan
+    without recomputing it, and applying them triggers the stored pipeline
+    parameters. Plans are pruned with finished jobs; a pruned plan is simply
+    computed again.
+    """
+
+    @staticmethod
+    def get(plan_id: str) -> Optional[dict]:
+        return get_state_store().get_record(PLAN_KIND, plan_id)
+
+    def plan(self, zone_partner: ZonePartner, provider) -> Tuple[dict, bool]:
+        """
+        Return the plan for a partner's inputs, computing and storing it on a cache miss
+
+        Args:
+            zone_partner: The partner to plan
+            provider: The partner's cloud provider
+
+        Returns:
+            Tuple[dict, bool]: The plan record, and whether it came from the cache
+        """
+        key = plan_key(zone_partner)
+        cached = self.get(key)
+        if cached is not None:
+            metrics.incr("plan_cache_hits")
+            return cached, True
+        metrics.incr("plan_cache_misses")
+        record = {
+            "id": key,
+            "state": PLAN_READY,
+            "partner_id": zone_partner.partner_id,
+            "cloud": zone_partner.cloud,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **provider.plan(),
+        }
+        # Identical inputs give identical plans, so concurrent planners may both write it.
+        get_state_store().put_record(PLAN_KIND, key, record)
+        logger.info(
+            f"Plan {key} computed for partner_id {zone_partner.partner_id}: {len(record['findings'])} findings"
+        )
+        return record, False
+
+
+plan_cache = PlanCache()
@@ -0,0 +1,399 @@
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+import boto3
+from botocore.exceptions import ClientError
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import (
+    STATE_S3_BUCKET,
+    STATE_S3_PREFIX,
+    STATE_S3_ENDPOINT_URL,
+    STATE_S3_CACHE_PATH,
+    STATE_S3_CACHE_TTL,
+)
+from app.core.state_store import PartnerIndex, PartnerIndexMixin, StateStore, atomic_write_json, record_revision
+
+logger = setup_logger(__name__, log_level)
+
+NOT_MODIFIED_CODES = ("304", "NotModified")
+NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
+CONFLICT_CODES = ("412", "PreconditionFailed", "409", "ConditionalRequestConflict")
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
+class S3StateStore(PartnerIndexMixin, StateStore):
+    """
+    State store writing directly to S3 instead of through a FUSE mount of the bucket.
+
+    * Reads go through a local disk cache. A cached object is trusted for
+      ``cache_ttl`` seconds and then revalidated with a conditional GET on its ETag.
+    * Status records are written with conditional puts (If-Match on the last
+      known ETag, If-None-Match on create). On a conflict the remote record is
+      reloaded and only the keys the write changed are layered on top of it.
+    * Generic records are indexed by state with zero-byte marker objects, so
+      listing the records in a state reads only those.
+    * Journal events are written as they are appended, one chunk object per
+      status update however many keys it sets, so they are durable before
+      the status writer flushes the snapshot they recover.
+
+    Point ``endpoint_url`` at moto's server mode or another S3-compatible
+    service to run it locally.
+    """
+
+    def __init__(
+        self,
+        bucket: str = STATE_S3_BUCKET,
+        prefix: str = STATE_S3_PREFIX,
+        cache_path: str = STATE_S3_CACHE_PATH,
+        endpoint_url: Optional[str] = STATE_S3_ENDPOINT_URL,
+        cache_ttl: float = STATE_S3_CACHE_TTL,
+    ):
+        if not bucket:
+            raise ValueError("STATE_S3_BUCKET must be set to use the s3 state backend")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        # A dedicated session keeps this client on the service's own credentials,
+        # whichever partner's credentials the current job is using.
+        self.s3 = boto3.session.Session().client("s3", endpoint_url=endpoint_url)
+        self._etags: Dict[str, Tuple[str, float]] = {}
+        self._etags_lock = threading.Lock()
+        self._index: Optional[PartnerIndex] = None
+        self._index_lock = threading.Lock()
+        self._indexed_kinds: set = set()
+
+    def _key(self, *parts: str) -> str:
+        return "/".join([self.prefix, *parts]) if self.prefix else "/".join(parts)
+
+    def _zone_partner_key(self, partner_id: str) -> str:
+        return self._key(str(partner_id), f"zone_partner_{partner_id}.json")
+
+    def _status_key(self, partner_id: str) -> str:
+        return self._key(str(partner_id), "status", f"status_{partner_id}.json")
+
+    def _events_prefix(self, partner_id: str) -> str:
+        return self._key(str(partner_id), "status", "events") + "/"
+
+    def _cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_path, key)
+
+    def _remember(self, key: str, etag: str, data: dict) -> None:
+        cache_file = self._cache_file(key)
+        atomic_write_json(cache_file, data)
+        with open(f"{cache_file}.etag", 'w') as f:
+            f.write(etag)
+        with self._etags_lock:
+            self._etags[key] = (etag, time.time())
+
+    def _forget(self, key: str) -> None:
+        with self._etags_lock:
+            self._etags.pop(key, None)
+        for path in (self._cache_file(key), f"{self._cache_file(key)}.etag"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _known_etag(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._etags_lock:
+            known = self._etags.get(key)
+        if known is None and os.path.exists(f"{self._cache_file(key)}.etag"):
+            # Cache files survive restarts; their ETag still allows a conditional GET.
+            with open(f"{self._cache_file(key)}.etag", 'r') as f:
+                known = (f.read().strip(), 0.0)
+        return known
+
+    def _read_cached(self, key: str) -> dict:
+        with open(self._cache_file(key), 'r') as f:
+            return json.load(f)
+
+    def _get_json(self, key: str, revalidate: bool = False) -> Optional[dict]:
+        known = self._known_etag(key)
+        cached = known is not None and os.path.exists(self._cache_file(key))
+        if cached and not revalidate and time.time() - known[1] < self.cache_ttl:
+            return self._read_cached(key)
+
+        kwargs = {"IfNoneMatch": known[0]} if cached else {}
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=key, **kwargs)
+        except ClientError as e:
+            code = _error_code(e)
+            if code in NOT_MODIFIED_CODES:
+                with self._etags_lock:
+                    self._etags[key] = (known[0], time.time())
+                return self._read_cached(key)
+            if code in NOT_FOUND_CODES:
+                self._forget(key)
+                return None
+            raise
+        data = json.loads(response["Body"].read())
+        self._remember(key, response["ETag"], data)
+        return data
+
+    def _put_json(self, key: str, data: dict, indent: Optional[int] = None, conditional: bool = False) -> None:
+        kwargs = {}
+        if conditional:
+            known = self._known_etag(key)
+            kwargs = {"IfMatch": known[0]} if known else {"IfNoneMatch": "*"}
+        response = self.s3.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(data, indent=indent).encode("utf-8"),
+            ContentType="application/json",
+            **kwargs,
+        )
+        self._remember(key, response["ETag"], data)
+
+    def save_zone_partner(self, partner_id: str, payload: dict) -> None:
+        self._put_json(self._zone_partner_key(partner_id), payload)
+        if self._index is not None:
+            self._index.update_payload(partner_id, payload)
+
+    def load_zone_partner(self, partner_id: str) -> Optional[dict]:
+        return self._get_json(self._zone_partner_key(partner_id))
+
+    def load_status(self, partner_id: str) -> Optional[dict]:
+        return self._get_json(self._status_key(partner_id))
+
+    def write_status(self, partner_id: str, data: dict, changes: Optional[dict] = None, max_attempts: int = 3) -> None:
+        key = self._status_key(partner_id)
+        changes = data if changes is None else changes
+        for attempt in range(max_attempts):
+            try:
+                self._put_json(key, data, indent=4, conditional=True)
+                break
+            except ClientError as e:
+                if _error_code(e) not in CONFLICT_CODES or attempt == max_attempts - 1:
+                    raise
+                # Someone else wrote the record since we last saw it: keep their record,
+                # reapply only the keys we changed and move the version past both.
+                remote = self._get_json(key, revalidate=True) or {}
+                version = max(remote.get("Version", 0), data.get("Version", 0)) + 1
+                data = {**remote, **changes, "Version": version}
+                logger.warning(f"Conditional status write conflict for partner_id {partner_id}, retrying")
+        if self._index is not None:
+            self._index.update_status(partner_id, data)
+
+    def status_version(self, partner_id: str) -> Optional[Hashable]:
+        key = self._status_key(partner_id)
+        known = self._known_etag(key)
+        if known is not None and time.time() - known[1] < self.cache_ttl:
+            return known[0]
+        try:
+            response = self.s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if _error_code(e) in NOT_FOUND_CODES:
+                self._forget(key)
+                return None
+            raise
+        if known is not None and known[0] == response["ETag"]:
+            with self._etags_lock:
+                self._etags[key] = (known[0], time.time())
+        return response["ETag"]
+
+    def append_status_event(self, partner_id: str, event: dict) -> None:
+        self.append_status_events(partner_id, [event])
+
+    def append_status_events(self, partner_id: str, events: List[dict]) -> None:
+        if events:
+            self._put_event_chunk(str(partner_id), events)
+
+    def _put_event_chunk(self, partner_id: str, events: List[dict], chunk_ts: Optional[float] = None) -> None:
+        # Chunk keys start with the newest event time so listings come back in journal order
+        # and whole chunks can be skipped or expired by key alone.
+        chunk_ts = chunk_ts if chunk_ts is not None else max(event["ts"] for event in events)
+        key = f"{self._events_prefix(partner_id)}{int(chunk_ts * 1e9):020d}-{uuid.uuid4().hex[:8]}.jsonl"
+        body = "".join(json.dumps(event) + "\n" for event in events)
+        self.s3.put_object(Bucket=self.bucket, Key=key, Body=body.encode("utf-8"), ContentType="application/x-ndjson")
+
+    def _list_event_chunks(self, partner_id: str) -> List[Tuple[str, float]]:
+        chunks = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._events_prefix(partner_id)):
+            for obj in page.get("Contents", []):
+                name = obj["Key"].rsplit("/", 1)[-1]
+                chunks.append((obj["Key"], int(name.split("-", 1)[0]) / 1e9))
+        return sorted(chunks)
+
+    def _read_event_chunk(self, key: str) -> Iterator[dict]:
+        body = self.s3.get_object(Bucket=self.bucket, Key=key)["Body"]
+        for line in body.iter_lines():
+            if line.strip():
+                yield json.loads(line)
+
+    def iter_status_events(
+        self, partner_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[dict]:
+        for key, chunk_ts in self._list_event_chunks(partner_id):
+            if since is not None and chunk_ts < since:
+                continue
+            for event in self._read_event_chunk(key):
+                if (since is None or event["ts"] >= since) and (until is None or event["ts"] <= until):
+                    yield event
+
+    def compact_status_events(self, partner_id: str, before: float) -> int:
+        chunks = self._list_event_chunks(partner_id)
+        if len(chunks) <= 1 and not any(chunk_ts < before for _, chunk_ts in chunks):
+            return 0
+        # Merge every chunk into one object holding only the retained events.
+        events = [event for key, _ in chunks for event in self._read_event_chunk(key)]
+        kept = [event for event in events if event["ts"] >= before]
+        if kept:
+            self._put_event_chunk(partner_id, kept, chunk_ts=chunks[-1][1])
+        keys = [{"Key": key} for key, _ in chunks]
+        for start in range(0, len(keys), 1000):
+            self.s3.delete_objects(Bucket=self.bucket, Delete={"Objects": keys[start:start + 1000], "Quiet": True})
+        return len(events) - len(kept)
+
+    def list_partner_ids(self) -> List[str]:
+        partner_ids = []
+        root = self._key("") if self.prefix else ""
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=root, Delimiter="/"):
+            for common_prefix in page.get("CommonPrefixes", []):
+                name = common_prefix["Prefix"][len(root):].rstrip("/")
+                if not name.startswith("_"):
+                    partner_ids.append(name)
+        return sorted(partner_ids)
+
+    def _record_key(self, kind: str, record_id: str) -> str:
+        return self._key("_records", kind, f"{record_id}.json")
+
+    def _state_prefix(self, kind: str, state: str) -> str:
+        return self._key("_record_states", kind, state) + "/"
+
+    def _known_state(self, key: str) -> Optional[str]:
+        """State of a record as this process last wrote or read it, from the local cache."""
+        if self._known_etag(key) is None or not os.path.exists(self._cache_file(key)):
+            return None
+        try:
+            return self._read_cached(key).get("state")
+        except (OSError, ValueError):
+            return None
+
+    def _mark_state(self, kind: str, record_id: str, state: Optional[str], previous: Optional[str]) -> None:
+        # Written after the record, so a marker never leads to a record that does not have
+        # its state yet. The random body gives every marker write its own ETag (see list_records).
+        if state is not None:
+            self.s3.put_object(
+                Bucket=self.bucket, Key=f"{self._state_prefix(kind, state)}{record_id}", Body=uuid.uuid4().hex.encode()
+            )
+        if previous is not None and previous != state:
+            self.s3.delete_object(Bucket=self.bucket, Key=f"{self._state_prefix(kind, previous)}{record_id}")
+
+    def _ensure_state_index(self, kind: str) -> None:
+        """Mark the state of records written before states were indexed, once per kind."""
+        if kind in self._indexed_kinds:
+            return
+        flag = self._key("_record_states", kind, ".indexed")
+        try:
+            self.s3.head_object(Bucket=self.bucket, Key=flag)
+        except ClientError as e:
+            if _error_code(e) not in NOT_FOUND_CODES:
+                raise
+            for record in self._scan_records(kind):
+                self._mark_state(kind, record["id"], record.get("state"), None)
+            self.s3.put_object(Bucket=self.bucket, Key=flag, Body=b"")
+        self._indexed_kinds.add(kind)
+
+    def put_record(self, kind: str, record_id: str, data: dict) -> None:
+        key = self._record_key(kind, record_id)
+        previous = self._known_state(key)
+        self._put_json(key, data)
+        self._mark_state(kind, record_id, data.get("state"), previous)
+
+    def get_record(self, kind: str, record_id: str) -> Optional[dict]:
+        # Records drive work scheduling, so never serve them from a stale cache entry.
+        return self._get_json(self._record_key(kind, record_id), revalidate=True)
+
+    def _scan_records(self, kind: str) -> List[dict]:
+        records = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self._key("_records", kind) + "/"):
+            for obj in page.get("Contents", []):
+                record = self._get_json(obj["Key"], revalidate=True)
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def list_records(self, kind: str, state: Optional[str] = None) -> List[dict]:
+        if state is None:
+            return self._scan_records(kind)
+        # One zero-byte marker per record under _record_states/<kind>/<state>/, so a
+        # sweep over active records reads only those, however many finished ones exist.
+        self._ensure_state_index(kind)
+        records = []
+        prefix = self._state_prefix(kind, state)
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                record_id = obj["Key"][len(prefix):]
+                record = self.get_record(kind, record_id)
+                if record is not None and record.get("state") == state:
+                    records.append(record)
+                    continue
+                # Stale: the record moved on and its old marker was not removed. Conditional on
+                # the listed ETag, so a writer that just marked the record again keeps its marker.
+                try:
+                    self.s3.delete_object(Bucket=self.bucket, Key=obj["Key"], IfMatch=obj["ETag"])
+                except ClientError as e:
+                    if _error_code(e) not in CONFLICT_CODES and _error_code(e) not in NOT_FOUND_CODES:
+                        raise
+        return records
+
+    def delete_record(self, kind: str, record_id: str) -> None:
+        key = self._record_key(kind, record_id)
+        previous = self._known_state(key)
+        self.s3.delete_object(Bucket=self.bucket, Key=key)
+        self._forget(key)
+        if previous is not None:
+            self._mark_state(kind, record_id, None, previous)
+
+    def swap_record(self, kind: str, record_id: str, data: Optional[dict], expected_revision: Optional[int]) -> bool:
+        # The revision is checked against a fresh read and the write is conditional on
+        # that read's ETag, so a concurrent writer in another process makes it fail.
+        key = self._record_key(kind, record_id)
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=key)
+            current, etag = json.loads(response["Body"].read()), response["ETag"]
+        except ClientError as e:
+            if _error_code(e) not in NOT_FOUND_CODES:
+                raise
+            current, etag = None, None
+        if record_revision(current) != expected_revision:
+            return False
+        revision = (expected_revision or 0) + 1
+        previous = current.get("state") if current else None
+        try:
+            if data is None:
+                self.s3.delete_object(Bucket=self.bucket, Key=key, IfMatch=etag)
+                self._forget(key)
+                self._mark_state(kind, record_id, None, previous)
+                return True
+            body = {**data, "revision": revision}
+            response = self.s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=json.dumps(body).encode("utf-8"),
+                ContentType="application/json",
+                **({"IfMatch": etag} if etag else {"IfNoneMatch": "*"}),
+            )
+        except ClientError as e:
+            if _error_code(e) in CONFLICT_CODES or _error_code(e) in NOT_FOUND_CODES:
+                return False
+            raise
+        self._remember(key, response["ETag"], body)
+        self._mark_state(kind, record_id, body.get("state"), previous)
+        data["revision"] = revision
+        return True
+
+    def close(self) -> None:
+        self.flush()
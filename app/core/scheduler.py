@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+from app.core.constants import JOB_ACCOUNT_CONCURRENCY, JOB_REGION_CONCURRENCY
+
+
+@dataclass
+class ScheduledJob:
+    job_id: str
+    user_id: Optional[str] = None
+    account_id: Optional[str] = None
+    region: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.time)
+
+
+class FairScheduler:
+    """
+    Dispatch order for queued jobs.
+
+    Jobs wait in one FIFO per user_id and users are served round-robin, so one
+    user onboarding many partners cannot starve the others. A job is only
+    dispatched while fewer than the configured number of jobs are running in
+    its AWS account and in its region (0 disables a cap); a user's later job in
+    another account may overtake an earlier one that is capped. Jobs without an
+    account or region are not capped on that key.
+    """
+
+    def __init__(self, account_cap: int = JOB_ACCOUNT_CONCURRENCY, region_cap: int = JOB_REGION_CONCURRENCY):
+        self.account_cap = account_cap
+        self.region_cap = region_cap
+        self._queues: Dict[Optional[str], Deque[ScheduledJob]] = {}
+        self._users: Deque[Optional[str]] = deque()
+        self._running = {"account": {}, "region": {}}
+        self._waits: Dict[str, Dict[str, dict]] = {"account": {}, "region": {}}
+        self._size = 0
+        # Set whenever a job is queued or finishes; all of this runs on the event loop thread.
+        self._wakeup = asyncio.Event()
+
+    def qsize(self) -> int:
+        return self._size
+
+    def put(self, job: ScheduledJob) -> None:
+        if job.user_id not in self._queues:
+            self._queues[job.user_id] = deque()
+            self._users.append(job.user_id)
+        self._queues[job.user_id].append(job)
+        self._size += 1
+        self._wakeup.set()
+
+    def _capped(self, job: ScheduledJob) -> bool:
+        for kind, key, cap in (("account", job.account_id, self.account_cap), ("region", job.region, self.region_cap)):
+            if cap and key is not None and self._running[kind].get(key, 0) >= cap:
+                return True
+        return False
+
+    def _take(self) -> Optional[ScheduledJob]:
+        for _ in range(len(self._users)):
+            user_id = self._users[0]
+            self._users.rotate(-1)
+            queue = self._queues[user_id]
+            for job in queue:
+                if not self._capped(job):
+                    queue.remove(job)
+                    if not queue:
+                        del self._queues[user_id]
+                        self._users.remove(user_id)
+                    self._size -= 1
+                    return job
+        return None
+
+    def _dispatch(self, job: ScheduledJob) -> None:
+        waited = time.time() - job.enqueued_at
+        for kind, key in (("account", job.account_id), ("region", job.region)):
+            if key is None:
+                continue
+            self._running[kind][key] = self._running[kind].get(key, 0) + 1
+            stats = self._waits[kind].setdefault(key, {"dispatched": 0, "total_wait": 0.0, "max_wait": 0.0})
+            stats["dispatched"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+
+    async def get(self) -> ScheduledJob:
+        """Wait for the next job that may run under the caps, and mark it running."""
+        while True:
+            job = self._take()
+            if job is not None:
+                self._dispatch(job)
+                return job
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    def done(self, job: ScheduledJob) -> None:
+        for kind, key in (("account", job.account_id), ("region", job.region)):
+            if key is None:
+                continue
+            self._running[kind][key] -= 1
+            if not self._running[kind][key]:
+                del self._running[kind][key]
+        self._wakeup.set()
+
+    def stats(self) -> dict:
+        """Queued, running and wait-time figures per account and region."""
+        now = time.time()
+        result = {"account": {}, "region": {}}
+        caps = {"account": self.account_cap, "region": self.region_cap}
+
+        def entry(kind: str, key: Optional[str]) -> dict:
+            return result[kind].setdefault(key or "unknown", {
+                "queued": 0, "running": 0, "cap": caps[kind] or None,
+                "oldest_wait": 0.0, "dispatched": 0, "avg_wait": 0.0, "max_wait": 0.0,
+            })
+
+        for queue in self._queues.values():
+            for job in queue:
+                for kind, key in (("account", job.account_id), ("region", job.region)):
+                    stats = entry(kind, key)
+                    stats["queued"] += 1
+                    stats["oldest_wait"] = max(stats["oldest_wait"], now - job.enqueued_at)
+        for kind in result:
+            for key, running in self._running[kind].items():
+                entry(kind, key)["running"] = running
+            for key, waits in self._waits[kind].items():
+                entry(kind, key).update(
+                    dispatched=waits["dispatched"],
+                    avg_wait=waits["total_wait"] / waits["dispatched"],
+                    max_wait=waits["max_wait"],
+                )
+        return {
+            "queued": self._size,
+            "users_waiting": len(self._users),
+            "accounts": result["account"],
+            "regions": result["region"],
+        }
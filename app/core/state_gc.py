@@ -0,0 +1,284 @@
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import (
+    STATE_PATH,
+    STATE_GC_INTERVAL,
+    STATE_GC_RETENTION_HOURS,
+    STATE_DISK_QUOTA_BYTES,
+    JOB_RETENTION_HOURS,
+    IDEMPOTENCY_KEY_TTL_HOURS,
+)
+from app.core.batches import BATCH_COMPLETED, BATCH_KIND
+from app.core.build_logs import pipeline_logs
+from app.core.builds import BUILD_FINISHED, BUILD_KIND
+from app.core.fleet import FLEET_ABORTED, FLEET_COMPLETED, FLEET_KIND
+from app.core.jobs import IDEMPOTENCY_KIND, JOB_FAILED, JOB_KIND, JOB_SUCCEEDED
+from app.core.metrics import metrics
+from app.core.plans import PLAN_KIND
+from app.core.state_store import get_state_store
+
+logger = setup_logger(__name__, log_level)
+
+# Artifacts of a deleted partner can be dropped: DSUtils.deploy recreates both if the
+# partner is ever deployed again. Live partners keep theirs, since pre_cleanup needs
+# the manifests and kubeconfig that deploy wrote.
+RECLAIMABLE_STATES = ("Deleted",)
+
+# One record per partner whose artifacts are reclaimable, remembering when it was
+# first seen deleted: the retention clock, which later status updates do not reset.
+ARTIFACT_KIND = "artifacts"
+ARTIFACTS_HELD = "held"
+ARTIFACTS_RECLAIMED = "reclaimed"
+
+
+def _path_size(path: str) -> int:
+    if os.path.isfile(path) or os.path.islink(path):
+        return os.lstat(path).st_size
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+def _last_used(path: str) -> float:
+    # A directory's atime is not used: listing it to measure its size updates it.
+    stat = os.stat(path)
+    if not os.path.isdir(path):
+        return max(stat.st_atime, stat.st_mtime)
+    last_used = stat.st_mtime
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                file_stat = os.lstat(os.path.join(root, name))
+            except FileNotFoundError:
+                continue
+            last_used = max(last_used, file_stat.st_atime, file_stat.st_mtime)
+    return last_used
+
+
+def _remove(path: str) -> int:
+    size = _path_size(path)
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        # Another worker process reclaimed it first.
+        return 0
+    return size
+
+
+class StateReclaimer:
+    """
+    Background reclaimer for per-partner artifacts (manifests, kubeconfig and pipeline log).
+
+    Work is driven by the state store's partner index, never by listing
+    STATE_PATH, which on the S3 mount would list the whole bucket. A ledger
+    keeps the size of every partner's artifacts and measures a partner again
+    only when its index row changes. Partners "Deleted" for longer than the
+    retention window, counted from when the reclaimer first saw them deleted,
+    lose their artifacts. When a disk quota is set and the ledger's total is
+    over it, the remaining reclaimable artifacts are evicted least recently
+    used first. Finished job records past their retention are deleted.
+    Reclaimed bytes are reported through the metrics registry.
+    """
+
+    def __init__(
+        self,
+        state_path: str = STATE_PATH,
+        interval: float = STATE_GC_INTERVAL,
+        retention_hours: float = STATE_GC_RETENTION_HOURS,
+        quota_bytes: int = STATE_DISK_QUOTA_BYTES,
+    ):
+        self.state_path = state_path
+        self.interval = interval
+        self.retention = retention_hours * 3600
+        self.quota_bytes = quota_bytes
+        # partner_id -> {"size", "last_used", "last_updated", "deleted"}, rebuilt lazily per process.
+        self._ledger: Dict[str, dict] = {}
+        # Artifact records of deleted partners, loaded from the store on the first cycle.
+        self._deleted: Optional[Dict[str, dict]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def artifact_paths(self, partner_id: str) -> List[str]:
+        partner_dir = os.path.join(self.state_path, partner_id)
+        paths = [
+            os.path.join(partner_dir, "manifests"),
+            os.path.join(partner_dir, f"config_{partner_id}"),
+            pipeline_logs.path(partner_id),
+        ]
+        return [path for path in paths if os.path.exists(path)]
+
+    def _partners(self, page_size: int = 500) -> Iterator[dict]:
+        cursor = None
+        while True:
+            rows = get_state_store().query_zone_partners({}, cursor, page_size)
+            yield from rows
+            if len(rows) < page_size:
+                break
+            cursor = rows[-1]["partner_id"]
+
+    def _measure(self, partner_id: str, row: dict, now: float) -> dict:
+        paths = self.artifact_paths(partner_id)
+        return {
+            "size": sum(_path_size(path) for path in paths),
+            "last_used": max((_last_used(path) for path in paths), default=now),
+            "last_updated": row["last_updated"],
+            "deleted": row["terraform_state"] in RECLAIMABLE_STATES,
+        }
+
+    def _refresh_ledger(self, now: float) -> None:
+        """Bring the ledger up to date with the partner index, measuring only partners whose row changed."""
+        seen = set()
+        for row in self._partners():
+            partner_id = row["partner_id"]
+            seen.add(partner_id)
+            entry = self._ledger.get(partner_id)
+            deleted = row["terraform_state"] in RECLAIMABLE_STATES
+            if entry is None or entry["last_updated"] != row["last_updated"] or entry["deleted"] != deleted:
+                self._ledger[partner_id] = self._measure(partner_id, row, now)
+        for partner_id in set(self._ledger) - seen:
+            del self._ledger[partner_id]
+
+    def _deleted_records(self) -> Dict[str, dict]:
+        if self._deleted is None:
+            self._deleted = {record["id"]: record for record in get_state_store().list_records(ARTIFACT_KIND)}
+        return self._deleted
+
+    def _track_deleted(self, now: float) -> None:
+        """Start the retention clock of newly deleted partners, and stop it for partners deployed again."""
+        store = get_state_store()
+        records = self._deleted_records()
+        for partner_id, entry in self._ledger.items():
+            record = records.get(partner_id)
+            if entry["deleted"] and record is None and entry["size"]:
+                record = {
+                    "id": partner_id,
+                    "state": ARTIFACTS_HELD,
+                    "deleted_at": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+                }
+                store.put_record(ARTIFACT_KIND, partner_id, record)
+                records[partner_id] = record
+            elif not entry["deleted"] and record is not None:
+                store.delete_record(ARTIFACT_KIND, partner_id)
+                del records[partner_id]
+
+    def _reclaim_partner(self, partner_id: str) -> int:
+        reclaimed = sum(_remove(path) for path in self.artifact_paths(partner_id))
+        self._ledger[partner_id]["size"] = 0
+        record = {**self._deleted_records()[partner_id], "state": ARTIFACTS_RECLAIMED}
+        get_state_store().put_record(ARTIFACT_KIND, partner_id, record)
+        self._deleted_records()[partner_id] = record
+        return reclaimed
+
+    def prune_jobs(self, now: float) -> int:
+        """
+        Delete finished jobs, batches, fleet operations and builds and cached plans past
+        JOB_RETENTION_HOURS, and expired idempotency keys.
+        """
+        store = get_state_store()
+        pruned = 0
+        finished_states = (
+            (JOB_KIND, JOB_SUCCEEDED),
+            (JOB_KIND, JOB_FAILED),
+            (BATCH_KIND, BATCH_COMPLETED),
+            (FLEET_KIND, FLEET_COMPLETED),
+            (FLEET_KIND, FLEET_ABORTED),
+            (BUILD_KIND, BUILD_FINISHED),
+        )
+        for kind, state in finished_states:
+            for record in store.list_records(kind, state):
+                finished_at = record.get("finished_at")
+                finished = datetime.fromisoformat(finished_at).timestamp() if finished_at else now
+                if now - finished >= JOB_RETENTION_HOURS * 3600:
+                    store.delete_record(kind, record["id"])
+                    pruned += 1
+        for record in store.list_records(PLAN_KIND):
+            if now - datetime.fromisoformat(record["created_at"]).timestamp() >= JOB_RETENTION_HOURS * 3600:
+                store.delete_record(PLAN_KIND, record["id"])
+        for record in store.list_records(IDEMPOTENCY_KIND):
+            if now - datetime.fromisoformat(record["created_at"]).timestamp() >= IDEMPOTENCY_KEY_TTL_HOURS * 3600:
+                store.delete_record(IDEMPOTENCY_KIND, record["id"])
+        return pruned
+
+    def reclaim(self) -> int:
+        """
+        Run one reclamation cycle
+
+        Returns:
+            int: Number of bytes reclaimed
+        """
+        now = time.time()
+        reclaimed = 0
+        candidates = []
+
+        self._refresh_ledger(now)
+        self._track_deleted(now)
+        for partner_id, record in self._deleted_records().items():
+            if record["state"] != ARTIFACTS_HELD or partner_id not in self._ledger:
+                continue
+            if now - datetime.fromisoformat(record["deleted_at"]).timestamp() >= self.retention:
+                reclaimed += self._reclaim_partner(partner_id)
+                logger.info(f"Reclaimed artifacts of deleted partner_id {partner_id}")
+            else:
+                candidates.append((self._ledger[partner_id]["last_used"], partner_id))
+
+        usage = sum(entry["size"] for entry in self._ledger.values())
+        if self.quota_bytes and usage > self.quota_bytes:
+            for _, partner_id in sorted(candidates):
+                usage -= self._ledger[partner_id]["size"]
+                reclaimed += self._reclaim_partner(partner_id)
+                logger.info(f"Evicted artifacts of deleted partner_id {partner_id} to honour the disk quota")
+                if usage <= self.quota_bytes:
+                    break
+            if usage > self.quota_bytes:
+                logger.warning(
+                    f"Partner artifacts use {usage} bytes, still over the quota of {self.quota_bytes} bytes "
+                    "after evicting all reclaimable artifacts"
+                )
+
+        pruned = self.prune_jobs(now)
+        if pruned:
+            logger.info(f"Pruned {pruned} finished job, batch, fleet operation and build records")
+
+        metrics.incr("state_gc_reclaimed_bytes", reclaimed)
+        metrics.set_gauge("state_disk_usage_bytes", usage)
+        if reclaimed:
+            logger.info(f"State reclamation freed {reclaimed} bytes")
+        return reclaimed
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="state-reclaimer", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.reclaim()
+            except Exception as e:
+                logger.error(f"State reclamation failed: {str(e)}")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+state_reclaimer = StateReclaimer()
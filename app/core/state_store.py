@@ -0,0 +1,955 @@
+import fcntl
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Hashable, Iterator, List, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import STATE_PATH, STATE_BACKEND, STATE_DB_PATH, WEB_WORKERS
+
+logger = setup_logger(__name__, log_level)
+
+
+class StateStore:
+    """
+    Persistence interface for zone partner payloads and status records.
+
+    Payloads and statuses are plain dicts; callers in fs_utils are responsible
+    for converting them to and from models.
+    """
+
+    def save_zone_partner(self, partner_id: str, payload: dict) -> None:
+        raise NotImplementedError
+
+    def load_zone_partner(self, partner_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def load_status(self, partner_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def write_status(self, partner_id: str, data: dict, changes: Optional[dict] = None) -> None:
+        """
+        Replace the partner's status record with ``data``
+
+        ``changes`` holds the keys ``data`` changed relative to the record it was
+        built from (all of ``data`` when None). Backends that detect concurrent
+        writers reapply only these onto the newer record on a conflict.
+        """
+        raise NotImplementedError
+
+    def status_version(self, partner_id: str) -> Optional[Hashable]:
+        """Cheap validator that changes whenever the status record changes, or None if absent."""
+        raise NotImplementedError
+
+    def update_status(self, partner_id: str, updates: dict) -> dict:
+        data = self.load_status(partner_id) or {}
+        data.update(updates)
+        self.write_status(partner_id, data)
+        return data
+
+    def append_status_event(self, partner_id: str, event: dict) -> None:
+        """Append one event (``ts``, ``timestamp``, ``key``, ``value``) to the partner's status journal."""
+        raise NotImplementedError
+
+    def append_status_events(self, partner_id: str, events: List[dict]) -> None:
+        """Append several events to the partner's status journal in one write."""
+        for event in events:
+            self.append_status_event(partner_id, event)
+
+    def iter_status_events(
+        self, partner_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[dict]:
+        """Yield journal events in append order, optionally limited to ``since <= ts <= until``."""
+        raise NotImplementedError
+
+    def compact_status_events(self, partner_id: str, before: float) -> int:
+        """Drop journal events older than ``before`` and return how many were removed."""
+        raise NotImplementedError
+
+    def query_zone_partners(
+        self, filters: Dict[str, str], cursor: Optional[str] = None, limit: int = 100
+    ) -> List[dict]:
+        """
+        Return index rows (see ``PARTNER_INDEX_FIELDS``) for zone partners matching every filter.
+
+        Rows are ordered by partner_id; pass the last partner_id seen as ``cursor``
+        to fetch the next page.
+        """
+        raise NotImplementedError
+
+    def list_partner_ids(self) -> List[str]:
+        raise NotImplementedError
+
+    def put_record(self, kind: str, record_id: str, data: dict) -> None:
+        """Create or replace a generic record (see ``RECORD_KINDS``); ``data["state"]`` is indexed for listing."""
+        raise NotImplementedError
+
+    def get_record(self, kind: str, record_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def list_records(self, kind: str, state: Optional[str] = None) -> List[dict]:
+        """Return every record of a kind, optionally only those whose ``state`` matches."""
+        raise NotImplementedError
+
+    def delete_record(self, kind: str, record_id: str) -> None:
+        raise NotImplementedError
+
+    def swap_record(self, kind: str, record_id: str, data: Optional[dict], expected_revision: Optional[int]) -> bool:
+        """
+        Compare-and-swap a generic record, atomically across processes sharing the store.
+
+        The swap only happens if the stored record's ``revision`` (0 when it has
+        none) equals ``expected_revision``, or, when ``expected_revision`` is None,
+        if no record exists yet. ``data`` None deletes the record; otherwise
+        ``data["revision"]`` is set to the new revision.
+
+        Returns:
+            bool: Whether the swap happened
+        """
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Push any writes the backend batches internally; called whenever the status writer flushes."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def atomic_write_json(filename: str, data: dict, indent: Optional[int] = None) -> None:
+    """Write JSON to a temporary file next to ``filename`` and rename it into place."""
+    directory = os.path.dirname(filename)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_within(path: str, directory: str) -> bool:
+    path, directory = os.path.realpath(path), os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory
+
+
+def record_revision(record: Optional[dict]) -> Optional[int]:
+    """Revision compared by ``swap_record``: None if the record is absent, 0 if it predates revisions."""
+    return None if record is None else record.get("revision", 0)
+
+
+# Kinds of generic records; each record carries its own "id" and an optional "state".
+# Worker heartbeats ("worker") are records too, but are left out: they are never migrated.
+RECORD_KINDS = ("job", "lease", "idempotency", "batch", "fleet_operation", "plan", "build", "artifacts")
+
+# Columns served by query_zone_partners; the first five can be used as filters.
+PARTNER_FILTER_FIELDS = ("user_id", "account_id", "region", "deployment_name", "terraform_state")
+PARTNER_INDEX_FIELDS = ("partner_id", "cloud", "ml_workbench_state", "last_updated") + PARTNER_FILTER_FIELDS
+
+
+def partner_index_row(partner_id: str, payload: Optional[dict], status: Optional[dict]) -> dict:
+    payload = payload or {}
+    status = status or {}
+    variables = payload.get("variables") or {}
+    return {
+        "partner_id": str(partner_id),
+        "cloud": payload.get("cloud"),
+        "user_id": payload.get("user_id"),
+        "account_id": payload.get("account_id"),
+        "region": variables.get("region"),
+        "deployment_name": variables.get("deployment_name"),
+        "terraform_state": status.get("Terraform"),
+        "ml_workbench_state": status.get("MLWorkbench"),
+        "last_updated": status.get("Last Updated"),
+    }
+
+
+class PartnerIndex:
+    """
+    In-memory secondary indexes over zone partners for stores without a query engine.
+
+    Rows are kept per partner and every filter field maps value -> partner ids, so
+    filtered listings only touch matching partners. Stores update the index on
+    every payload or status write.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows: Dict[str, dict] = {}
+        self._by_field: Dict[str, Dict[str, set]] = {field: {} for field in PARTNER_FILTER_FIELDS}
+
+    def _unlink(self, row: dict) -> None:
+        for field in PARTNER_FILTER_FIELDS:
+            ids = self._by_field[field].get(row[field])
+            if ids is not None:
+                ids.discard(row["partner_id"])
+                if not ids:
+                    del self._by_field[field][row[field]]
+
+    def _put(self, row: dict) -> None:
+        old = self._rows.get(row["partner_id"])
+        if old is not None:
+            self._unlink(old)
+        self._rows[row["partner_id"]] = row
+        for field in PARTNER_FILTER_FIELDS:
+            self._by_field[field].setdefault(row[field], set()).add(row["partner_id"])
+
+    def update_payload(self, partner_id: str, payload: dict) -> None:
+        with self._lock:
+            row = dict(self._rows.get(partner_id) or partner_index_row(partner_id, None, None))
+            row.update({
+                key: value for key, value in partner_index_row(partner_id, payload, None).items()
+                if key not in ("terraform_state", "ml_workbench_state", "last_updated")
+            })
+            self._put(row)
+
+    def update_status(self, partner_id: str, status: dict) -> None:
+        with self._lock:
+            row = dict(self._rows.get(partner_id) or partner_index_row(partner_id, None, None))
+            row.update({
+                "terraform_state": status.get("Terraform"),
+                "ml_workbench_state": status.get("MLWorkbench"),
+                "last_updated": status.get("Last Updated"),
+            })
+            self._put(row)
+
+    def query(self, filters: Dict[str, str], cursor: Optional[str] = None, limit: int = 100) -> List[dict]:
+        with self._lock:
+            candidates = None
+            for field, value in filters.items():
+                ids = self._by_field[field].get(value, set())
+                candidates = set(ids) if candidates is None else candidates & ids
+            if candidates is None:
+                candidates = self._rows.keys()
+            # Only partners with a saved payload are listed.
+            ordered = sorted(
+                pid for pid in candidates
+                if (cursor is None or pid > cursor) and self._rows[pid]["cloud"] is not None
+            )
+            return [dict(self._rows[pid]) for pid in ordered[:limit]]
+
+
+class PartnerIndexMixin:
+    """
+    Serves ``query_zone_partners`` from a ``PartnerIndex`` for stores without a query engine.
+
+    Stores using it must initialise ``_index`` to None and ``_index_lock``, and
+    call ``_index.update_payload``/``update_status`` on writes once it exists.
+    """
+
+    _index: Optional[PartnerIndex]
+    _index_lock: threading.Lock
+
+    def _partner_index(self) -> PartnerIndex:
+        # Built from one pass over all partners on first use and maintained by writes afterwards.
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    index = PartnerIndex()
+                    for partner_id in self.list_partner_ids():
+                        try:
+                            payload = self.load_zone_partner(partner_id)
+                            if payload is not None:
+                                index.update_payload(partner_id, payload)
+                            status = self.load_status(partner_id)
+                            if status is not None:
+                                index.update_status(partner_id, status)
+                        except Exception as e:
+                            logger.error(f"Error indexing partner_id {partner_id}: {str(e)}")
+                    self._index = index
+        return self._index
+
+    def query_zone_partners(
+        self, filters: Dict[str, str], cursor: Optional[str] = None, limit: int = 100
+    ) -> List[dict]:
+        return self._partner_index().query(filters, cursor, limit)
+
+
+class JsonFileStateStore(PartnerIndexMixin, StateStore):
+    """
+    State store keeping one JSON file per payload and status under STATE_PATH.
+
+    Generic records are indexed by state with one empty marker file per record
+    under ``_record_states/<kind>/<state>/``, so listing the records in a state
+    reads only those.
+    """
+
+    def __init__(self, state_path: str = STATE_PATH):
+        self.state_path = state_path
+        self._journal_lock = threading.Lock()
+        self._index: Optional[PartnerIndex] = None
+        self._index_lock = threading.Lock()
+        # Serialises record writes with the clean-up of stale state markers.
+        self._records_lock = threading.Lock()
+        self._indexed_kinds: set = set()
+
+    def _zone_partner_file(self, partner_id: str) -> str:
+        return os.path.join(self.state_path, str(partner_id), f"zone_partner_{partner_id}.json")
+
+    def _status_file(self, partner_id: str) -> str:
+        return os.path.join(self.state_path, str(partner_id), "status", f"status_{partner_id}.json")
+
+    def _journal_file(self, partner_id: str) -> str:
+        return os.path.join(self.state_path, str(partner_id), "status", f"status_{partner_id}.jsonl")
+
+    def save_zone_partner(self, partner_id: str, payload: dict) -> None:
+        atomic_write_json(self._zone_partner_file(partner_id), payload)
+        if self._index is not None:
+            self._index.update_payload(partner_id, payload)
+
+    def load_zone_partner(self, partner_id: str) -> Optional[dict]:
+        filename = self._zone_partner_file(partner_id)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+    def load_status(self, partner_id: str) -> Optional[dict]:
+        filename = self._status_file(partner_id)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+    def write_status(self, partner_id: str, data: dict, changes: Optional[dict] = None) -> None:
+        atomic_write_json(self._status_file(partner_id), data, indent=4)
+        if self._index is not None:
+            self._index.update_status(partner_id, data)
+
+    def status_version(self, partner_id: str) -> Optional[Hashable]:
+        try:
+            stat = os.stat(self._status_file(partner_id))
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def append_status_event(self, partner_id: str, event: dict) -> None:
+        self.append_status_events(partner_id, [event])
+
+    def append_status_events(self, partner_id: str, events: List[dict]) -> None:
+        filename = self._journal_file(partner_id)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        with self._journal_lock:
+            with open(filename, 'a') as f:
+                f.write(lines)
+
+    def iter_status_events(
+        self, partner_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[dict]:
+        filename = self._journal_file(partner_id)
+        if not os.path.exists(filename):
+            return
+        with open(filename, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if since is not None and event["ts"] < since:
+                    continue
+                if until is not None and event["ts"] > until:
+                    continue
+                yield event
+
+    def compact_status_events(self, partner_id: str, before: float) -> int:
+        filename = self._journal_file(partner_id)
+        if not os.path.exists(filename):
+            return 0
+        with self._journal_lock:
+            with open(filename, 'r') as f:
+                lines = [line for line in f if line.strip()]
+            kept = [line for line in lines if json.loads(line)["ts"] >= before]
+            removed = len(lines) - len(kept)
+            if removed:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filename), prefix=".tmp-", suffix=".jsonl")
+                with os.fdopen(fd, 'w') as f:
+                    f.writelines(kept)
+                os.replace(tmp_path, filename)
+        return removed
+
+    def list_partner_ids(self) -> List[str]:
+        if not os.path.isdir(self.state_path):
+            return []
+        return sorted(
+            entry for entry in os.listdir(self.state_path)
+            if os.path.exists(self._zone_partner_file(entry)) or os.path.exists(self._status_file(entry))
+        )
+
+    def _record_file(self, kind: str, record_id: str) -> str:
+        return os.path.join(self.state_path, "_records", kind, f"{record_id}.json")
+
+    def _state_directory(self, kind: str, state: str) -> str:
+        return os.path.join(self.state_path, "_record_states", kind, state)
+
+    def _mark_state(self, kind: str, record_id: str, state: Optional[str], previous: Optional[str]) -> None:
+        # Callers hold _records_lock. The marker of the new state is written after the record,
+        # so a marker never leads to a record that does not have its state yet.
+        if state is not None:
+            directory = self._state_directory(kind, state)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, str(record_id)), 'a'):
+                pass
+        if previous is not None and previous != state:
+            self._unmark(kind, previous, record_id)
+
+    def _unmark(self, kind: str, state: str, record_id: str) -> None:
+        try:
+            os.remove(os.path.join(self._state_directory(kind, state), str(record_id)))
+        except FileNotFoundError:
+            pass
+
+    def _ensure_state_index(self, kind: str) -> None:
+        """Mark the state of records written before states were indexed, once per kind."""
+        if kind in self._indexed_kinds:
+            return
+        flag = os.path.join(self.state_path, "_record_states", kind, ".indexed")
+        if not os.path.exists(flag):
+            with self._records_lock:
+                for record in self._scan_records(kind):
+                    self._mark_state(kind, record["id"], record.get("state"), None)
+                os.makedirs(os.path.dirname(flag), exist_ok=True)
+                with open(flag, 'a'):
+                    pass
+        self._indexed_kinds.add(kind)
+
+    def _write_record(self, kind: str, record_id: str, data: dict, previous: Optional[dict]) -> None:
+        atomic_write_json(self._record_file(kind, record_id), data)
+        self._mark_state(kind, record_id, data.get("state"), previous.get("state") if previous else None)
+
+    def put_record(self, kind: str, record_id: str, data: dict) -> None:
+        with self._records_lock:
+            self._write_record(kind, record_id, data, self.get_record(kind, record_id))
+
+    def get_record(self, kind: str, record_id: str) -> Optional[dict]:
+        filename = self._record_file(kind, record_id)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r') as f:
+            return json.load(f)
+
+    def _scan_records(self, kind: str) -> List[dict]:
+        directory = os.path.join(self.state_path, "_records", kind)
+        if not os.path.isdir(directory):
+            return []
+        records = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json") or name.startswith("."):
+                continue
+            record = self.get_record(kind, name[:-len(".json")])
+            if record is not None:
+                records.append(record)
+        return records
+
+    def list_records(self, kind: str, state: Optional[str] = None) -> List[dict]:
+        if state is None:
+            return self._scan_records(kind)
+        # Only the records marked with the state are read, so sweeps over active
+        # records do not grow with the number of finished ones.
+        self._ensure_state_index(kind)
+        directory = self._state_directory(kind, state)
+        if not os.path.isdir(directory):
+            return []
+        records = []
+        for record_id in sorted(os.listdir(directory)):
+            record = self.get_record(kind, record_id)
+            if record is None or record.get("state") != state:
+                # Left behind by a transition whose old marker was not removed; re-checked under the lock.
+                with self._records_lock:
+                    record = self.get_record(kind, record_id)
+                    if record is None or record.get("state") != state:
+                        self._unmark(kind, state, record_id)
+                        continue
+            records.append(record)
+        return records
+
+    def _remove_record(self, kind: str, record_id: str, current: Optional[dict]) -> None:
+        if current is None:
+            return
+        os.remove(self._record_file(kind, record_id))
+        if current.get("state") is not None:
+            self._unmark(kind, current["state"], record_id)
+
+    def delete_record(self, kind: str, record_id: str) -> None:
+        with self._records_lock:
+            self._remove_record(kind, record_id, self.get_record(kind, record_id))
+
+    def swap_record(self, kind: str, record_id: str, data: Optional[dict], expected_revision: Optional[int]) -> bool:
+        # One lock file per kind; flock serialises the read-compare-write across processes.
+        directory = os.path.join(self.state_path, "_records", kind)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with self._records_lock:
+                    current = self.get_record(kind, record_id)
+                    if record_revision(current) != expected_revision:
+                        return False
+                    if data is None:
+                        self._remove_record(kind, record_id, current)
+                    else:
+                        data["revision"] = (expected_revision or 0) + 1
+                        self._write_record(kind, record_id, data, current)
+                    return True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    State store backed by a single SQLite database in WAL mode.
+
+    Partner attributes used for lookups (user, account, region, deployment name)
+    and the Terraform/MLWorkbench states are kept in indexed columns next to the
+    JSON documents, so cross-partner queries do not need to parse every record.
+    """
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS zone_partners (
+            partner_id TEXT PRIMARY KEY,
+            user_id TEXT,
+            account_id TEXT,
+            cloud TEXT,
+            region TEXT,
+            deployment_name TEXT,
+            payload TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_zone_partners_user_id ON zone_partners (user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_zone_partners_account_id ON zone_partners (account_id)",
+        "CREATE INDEX IF NOT EXISTS idx_zone_partners_region ON zone_partners (region)",
+        "CREATE INDEX IF NOT EXISTS idx_zone_partners_deployment_name ON zone_partners (deployment_name)",
+        """
+        CREATE TABLE IF NOT EXISTS statuses (
+            partner_id TEXT PRIMARY KEY,
+            terraform TEXT,
+            ml_workbench TEXT,
+            data TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_statuses_terraform ON statuses (terraform)",
+        "CREATE INDEX IF NOT EXISTS idx_statuses_ml_workbench ON statuses (ml_workbench)",
+        "CREATE INDEX IF NOT EXISTS idx_statuses_updated_at ON statuses (updated_at)",
+        """
+        CREATE TABLE IF NOT EXISTS status_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            partner_id TEXT NOT NULL,
+            ts REAL NOT NULL,
+            event TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_status_events_partner_ts ON status_events (partner_id, ts)",
+        """
+        CREATE TABLE IF NOT EXISTS records (
+            kind TEXT NOT NULL,
+            id TEXT NOT NULL,
+            state TEXT,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_records_kind_state ON records (kind, state)",
+    ]
+
+    # Journal reads are paged so a streaming consumer never holds a cursor
+    # across threads (sqlite3 connections are per thread).
+    EVENT_PAGE_SIZE = 500
+
+    def __init__(self, db_path: str = STATE_DB_PATH, state_path: str = STATE_PATH):
+        if is_within(db_path, state_path):
+            # STATE_PATH is the S3 FUSE mount, which has neither the byte-range locks
+            # nor the shared memory WAL mode relies on.
+            raise ValueError(
+                f"STATE_DB_PATH ({db_path}) must be on local disk, outside STATE_PATH ({state_path})"
+            )
+        self.db_path = db_path
+        self._local = threading.local()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        with conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared across threads, so keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save_zone_partner(self, partner_id: str, payload: dict) -> None:
+        variables = payload.get("variables") or {}
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO zone_partners
+                    (partner_id, user_id, account_id, cloud, region, deployment_name, payload, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (partner_id) DO UPDATE SET
+                    user_id = excluded.user_id,
+                    account_id = excluded.account_id,
+                    cloud = excluded.cloud,
+                    region = excluded.region,
+                    deployment_name = excluded.deployment_name,
+                    payload = excluded.payload,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    str(partner_id),
+                    payload.get("user_id"),
+                    payload.get("account_id"),
+                    payload.get("cloud"),
+                    variables.get("region"),
+                    variables.get("deployment_name"),
+                    json.dumps(payload),
+                    time.time(),
+                ),
+            )
+
+    def load_zone_partner(self, partner_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT payload FROM zone_partners WHERE partner_id = ?", (str(partner_id),)
+        ).fetchone()
+        return json.loads(row["payload"]) if row else None
+
+    def load_status(self, partner_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT data FROM statuses WHERE partner_id = ?", (str(partner_id),)
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def status_version(self, partner_id: str) -> Optional[Hashable]:
+        row = self._connection().execute(
+            "SELECT version FROM statuses WHERE partner_id = ?", (str(partner_id),)
+        ).fetchone()
+        return row["version"] if row else None
+
+    def _write_status(self, conn: sqlite3.Connection, partner_id: str, data: dict) -> None:
+        conn.execute(
+            """
+            INSERT INTO statuses (partner_id, terraform, ml_workbench, data, version, updated_at)
+            VALUES (?, ?, ?, ?, 1, ?)
+            ON CONFLICT (partner_id) DO UPDATE SET
+                terraform = excluded.terraform,
+                ml_workbench = excluded.ml_workbench,
+                data = excluded.data,
+                version = statuses.version + 1,
+                updated_at = excluded.updated_at
+            """,
+            (
+                str(partner_id),
+                data.get("Terraform"),
+                data.get("MLWorkbench"),
+                json.dumps(data),
+                time.time(),
+            ),
+        )
+
+    def write_status(self, partner_id: str, data: dict, changes: Optional[dict] = None) -> None:
+        conn = self._connection()
+        if changes is None:
+            with conn:
+                self._write_status(conn, partner_id, data)
+            return
+        # Other processes write the same row: apply only this writer's keys onto the
+        # current record, under the write lock. Without a concurrent writer the
+        # current record is the one ``data`` was built from, so the result is ``data``.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM statuses WHERE partner_id = ?", (str(partner_id),)
+            ).fetchone()
+            current = json.loads(row["data"]) if row else {}
+            version = data.get("Version", 0)
+            if current.get("Version", 0) >= version:
+                version = current["Version"] + 1
+            self._write_status(conn, partner_id, {**current, **changes, "Version": version})
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_status(self, partner_id: str, updates: dict) -> dict:
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent updaters
+        # cannot interleave between the read and the write.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM statuses WHERE partner_id = ?", (str(partner_id),)
+            ).fetchone()
+            data = json.loads(row["data"]) if row else {}
+            data.update(updates)
+            self._write_status(conn, partner_id, data)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return data
+
+    def append_status_event(self, partner_id: str, event: dict) -> None:
+        self.append_status_events(partner_id, [event])
+
+    def append_status_events(self, partner_id: str, events: List[dict]) -> None:
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO status_events (partner_id, ts, event) VALUES (?, ?, ?)",
+                [(str(partner_id), event["ts"], json.dumps(event)) for event in events],
+            )
+
+    def iter_status_events(
+        self, partner_id: str, since: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[dict]:
+        last_id = 0
+        while True:
+            rows = self._connection().execute(
+                """
+                SELECT id, event FROM status_events
+                WHERE partner_id = ? AND id > ? AND ts >= ? AND ts <= ?
+                ORDER BY id LIMIT ?
+                """,
+                (
+                    str(partner_id),
+                    last_id,
+                    since if since is not None else float("-inf"),
+                    until if until is not None else float("inf"),
+                    self.EVENT_PAGE_SIZE,
+                ),
+            ).fetchall()
+            for row in rows:
+                yield json.loads(row["event"])
+            if len(rows) < self.EVENT_PAGE_SIZE:
+                return
+            last_id = rows[-1]["id"]
+
+    def compact_status_events(self, partner_id: str, before: float) -> int:
+        conn = self._connection()
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM status_events WHERE partner_id = ? AND ts < ?", (str(partner_id), before)
+            )
+        return cursor.rowcount
+
+    FILTER_COLUMNS = {
+        "user_id": "z.user_id",
+        "account_id": "z.account_id",
+        "region": "z.region",
+        "deployment_name": "z.deployment_name",
+        "terraform_state": "s.terraform",
+    }
+
+    def query_zone_partners(
+        self, filters: Dict[str, str], cursor: Optional[str] = None, limit: int = 100
+    ) -> List[dict]:
+        clauses = []
+        params: List = []
+        for field, value in filters.items():
+            clauses.append(f"{self.FILTER_COLUMNS[field]} = ?")
+            params.append(value)
+        if cursor is not None:
+            clauses.append("z.partner_id > ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"""
+            SELECT z.partner_id, z.cloud, z.user_id, z.account_id, z.region, z.deployment_name,
+                   s.terraform AS terraform_state, s.ml_workbench AS ml_workbench_state,
+                   json_extract(s.data, '$."Last Updated"') AS last_updated
+            FROM zone_partners z LEFT JOIN statuses s ON s.partner_id = z.partner_id
+            {where}
+            ORDER BY z.partner_id LIMIT ?
+            """,
+            params + [limit],
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def list_partner_ids(self) -> List[str]:
+        rows = self._connection().execute(
+            "SELECT partner_id FROM zone_partners UNION SELECT partner_id FROM statuses ORDER BY partner_id"
+        ).fetchall()
+        return [row["partner_id"] for row in rows]
+
+    def put_record(self, kind: str, record_id: str, data: dict) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO records (kind, id, state, data, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, id) DO UPDATE SET
+                    state = excluded.state,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+                """,
+                (kind, str(record_id), data.get("state"), json.dumps(data), time.time()),
+            )
+
+    def get_record(self, kind: str, record_id: str) -> Optional[dict]:
+        row = self._connection().execute(
+            "SELECT data FROM records WHERE kind = ? AND id = ?", (kind, str(record_id))
+        ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def list_records(self, kind: str, state: Optional[str] = None) -> List[dict]:
+        if state is None:
+            rows = self._connection().execute(
+                "SELECT data FROM records WHERE kind = ? ORDER BY id", (kind,)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT data FROM records WHERE kind = ? AND state = ? ORDER BY id", (kind, state)
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def delete_record(self, kind: str, record_id: str) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM records WHERE kind = ? AND id = ?", (kind, str(record_id)))
+
+    def swap_record(self, kind: str, record_id: str, data: Optional[dict], expected_revision: Optional[int]) -> bool:
+        conn = self._connection()
+        current_revision = "IFNULL(json_extract(data, '$.revision'), 0)"
+        with conn:
+            if data is None:
+                cursor = conn.execute(
+                    f"DELETE FROM records WHERE kind = ? AND id = ? AND {current_revision} = ?",
+                    (kind, str(record_id), expected_revision),
+                )
+                return cursor.rowcount == 1
+            revision = (expected_revision or 0) + 1
+            params = (data.get("state"), json.dumps({**data, "revision": revision}), time.time(), kind, str(record_id))
+            if expected_revision is None:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO records (state, data, updated_at, kind, id) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (kind, id) DO NOTHING
+                    """,
+                    params,
+                )
+            else:
+                cursor = conn.execute(
+                    f"UPDATE records SET state = ?, data = ?, updated_at = ? "
+                    f"WHERE kind = ? AND id = ? AND {current_revision} = ?",
+                    params + (expected_revision,),
+                )
+            if cursor.rowcount != 1:
+                return False
+            data["revision"] = revision
+            return True
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def create_state_store(backend: str = STATE_BACKEND) -> StateStore:
+    backend = backend.lower()
+    if backend == "json":
+        return JsonFileStateStore(STATE_PATH)
+    if backend == "sqlite":
+        return SQLiteStateStore(STATE_DB_PATH)
+    if backend == "s3":
+        # Imported lazily so the json/sqlite backends do not pay for the S3 client setup.
+        from app.core.s3_state_store import S3StateStore
+        return S3StateStore()
+    raise ValueError(f"Unsupported state backend: {backend}")
+
+
+# Backends whose writes are safe from several service processes at once. The
+# JSON store's file locks mean nothing on the S3 mount, and the JSON and S3
+# stores answer queries from a partner index each process builds for itself.
+MULTI_WORKER_BACKENDS = ("sqlite",)
+
+
+def check_web_workers(backend: str = STATE_BACKEND, workers: int = WEB_WORKERS) -> None:
+    """
+    Refuse to run several service processes on a backend that cannot share state between them
+
+    Raises:
+        ValueError: If ``workers`` > 1 and the backend is not in ``MULTI_WORKER_BACKENDS``
+    """
+    if workers > 1 and backend not in MULTI_WORKER_BACKENDS:
+        raise ValueError(
+            f"WEB_WORKERS={workers} needs a STATE_BACKEND shared safely between processes "
+            f"({', '.join(MULTI_WORKER_BACKENDS)}); the '{backend}' backend supports a single worker"
+        )
+
+
+def get_state_store() -> StateStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_state_store()
+                logger.info(f"Using '{STATE_BACKEND}' state store backend")
+    return _store
+
+
+def migrate_state(source: StateStore, target: StateStore) -> Dict[str, int]:
+    """
+    Copy every zone partner payload, status record, status journal and generic record from one store into another.
+
+    Args:
+        source: Store to read from, e.g. the legacy JSON tree
+        target: Store to write into
+
+    Returns:
+        dict: Number of payloads, statuses, journal events and records copied
+    """
+    counts = {"zone_partners": 0, "statuses": 0, "status_events": 0, "records": 0}
+    for partner_id in source.list_partner_ids():
+        try:
+            payload = source.load_zone_partner(partner_id)
+            if payload is not None:
+                target.save_zone_partner(partner_id, payload)
+                counts["zone_partners"] += 1
+            status = source.load_status(partner_id)
+            if status is not None:
+                target.write_status(partner_id, status)
+                counts["statuses"] += 1
+            for event in source.iter_status_events(partner_id):
+                target.append_status_event(partner_id, event)
+                counts["status_events"] += 1
+        except Exception as e:
+            logger.error(f"Error migrating state for partner_id {partner_id}: {str(e)}")
+    for kind in RECORD_KINDS:
+        for record in source.list_records(kind):
+            target.put_record(kind, record["id"], record)
+            counts["records"] += 1
+    logger.info(f"State migration complete: {counts}")
+    return counts
+
+
+if __name__ == "__main__":
+    # One-shot migration of the legacy JSON tree into SQLite:
+    #   python -m app.core.state_store [state_path] [db_path]
+    source_path = sys.argv[1] if len(sys.argv) > 1 else STATE_PATH
+    db_path = sys.argv[2] if len(sys.argv) > 2 else STATE_DB_PATH
+    migrate_state(JsonFileStateStore(source_path), SQLiteStateStore(db_path, state_path=source_path))
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+
+class StatusBroker:
+    """
+    In-process pub/sub for status changes.
+
+    Subscribers are plain futures parked on the event loop, so an idle stream or
+    long-poll costs nothing until ``publish`` resolves them. ``publish`` may be
+    called from any thread (status updates come from background work).
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[str, Set[asyncio.Future]] = {}
+
+    def publish(self, partner_id: str, version: int) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._notify(partner_id, version)
+        else:
+            loop.call_soon_threadsafe(self._notify, partner_id, version)
+
+    def _notify(self, partner_id: str, version: int) -> None:
+        for future in self._waiters.pop(partner_id, ()):
+            if not future.done():
+                future.set_result(version)
+
+    def subscribe(self, partner_id: str) -> asyncio.Future:
+        """
+        Register for the next status change of a partner
+
+        Subscribe before reading the current status and pass the subscription to
+        ``wait``, so a change published between the read and the wait is not missed.
+        """
+        self._loop = asyncio.get_running_loop()
+        future = self._loop.create_future()
+        self._waiters.setdefault(partner_id, set()).add(future)
+        return future
+
+    def unsubscribe(self, partner_id: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(partner_id)
+        if waiters is not None:
+            waiters.discard(future)
+            if not waiters:
+                del self._waiters[partner_id]
+
+    async def wait(
+        self, partner_id: str, timeout: float, subscription: Optional[asyncio.Future] = None
+    ) -> Optional[int]:
+        """
+        Wait for the next status change of a partner
+
+        Args:
+            partner_id: The ID of the partner zone
+            timeout: Seconds to wait before giving up
+            subscription: Future returned by ``subscribe``; a new one is taken if omitted
+
+        Returns:
+            Optional[int]: The new status version, or None on timeout
+        """
+        future = subscription if subscription is not None else self.subscribe(partner_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.unsubscribe(partner_id, future)
+
+    def subscriber_count(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+
+status_broker = StatusBroker()
@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.constants import STATUS_CACHE_SIZE
+from app.core.metrics import metrics
+
+
+class StatusCache:
+    """
+    Bounded LRU cache of parsed status responses.
+
+    Each entry is stored together with the validator token the state store
+    reported when it was loaded (file mtime/size or a version counter). A lookup
+    only hits when the caller's current token still matches.
+
+    Separately, the latest status ``Version`` seen per partner is remembered
+    (written by status updates, read back from loads). It is one int per partner
+    and is not evicted with the entries, so conditional reads can be answered
+    without asking the store.
+    """
+
+    def __init__(self, max_size: int = STATUS_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Hashable, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, partner_id: str, token: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(partner_id)
+            if entry is None or entry[0] != token:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(partner_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, partner_id: str, token: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[partner_id] = (token, value)
+            self._entries.move_to_end(partner_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, partner_id: str) -> None:
+        with self._lock:
+            self._entries.pop(partner_id, None)
+
+    def set_version(self, partner_id: str, version: int) -> None:
+        with self._lock:
+            # Versions only grow; a load racing an update must not move it back.
+            if version > self._versions.get(partner_id, 0):
+                self._versions[partner_id] = version
+
+    def version(self, partner_id: str) -> Optional[int]:
+        with self._lock:
+            return self._versions.get(partner_id)
+
+    def forget(self, partner_id: str) -> None:
+        with self._lock:
+            self._entries.pop(partner_id, None)
+            self._versions.pop(partner_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "versions": len(self._versions),
+                "max_size": self.max_size,
+            }
+
+
+status_cache = StatusCache()
+metrics.register_collector("status_cache", status_cache.stats)
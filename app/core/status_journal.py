@@ -0,0 +1,110 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import STATUS_JOURNAL_RETENTION_DAYS, STATUS_JOURNAL_COMPACT_INTERVAL
+from app.core.state_store import get_state_store
+from app.core.status_writer import status_writer
+
+logger = setup_logger(__name__, log_level)
+
+
+def record_status_event(partner_id: str, key: str, value: Any) -> dict:
+    return record_status_events(partner_id, {key: value})[0]
+
+
+def record_status_events(partner_id: str, values: Dict[str, Any]) -> List[dict]:
+    """Journal several keys changed together, as one append with a shared timestamp."""
+    now = time.time()
+    timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    events = [{"ts": now, "timestamp": timestamp, "key": key, "value": value} for key, value in values.items()]
+    get_state_store().append_status_events(partner_id, events)
+    return events
+
+
+def compact_partner_journal(partner_id: str, before: Optional[float] = None) -> int:
+    """
+    Fold a partner's journal into its current-state snapshot and drop expired events
+
+    Replaying the journal in order is idempotent, so this also recovers updates
+    that were journaled but never flushed to the snapshot (e.g. after a crash).
+
+    Args:
+        partner_id: The ID of the partner zone
+        before: Drop events older than this epoch timestamp (defaults to the retention window)
+
+    Returns:
+        int: Number of journal events removed
+    """
+    store = get_state_store()
+    if before is None:
+        before = time.time() - STATUS_JOURNAL_RETENTION_DAYS * 86400
+
+    # Hold the writer's partner lock so no update lands between the replay and the comparison;
+    # updates journal and apply under the same lock, so the journal's order is the snapshot's.
+    with status_writer.locked(partner_id):
+        folded = {}
+        last_ts = None
+        for event in store.iter_status_events(partner_id):
+            folded[event["key"]] = event["value"]
+            last_ts = event["ts"]
+        current = status_writer.get_pending(partner_id) or store.load_status(partner_id) or {}
+        missing = {key: value for key, value in folded.items() if current.get(key) != value}
+        if missing:
+            # Imported here: fs_utils journals through this module.
+            from app.core.fs_utils import update_status_fields
+            missing["Last Updated"] = datetime.fromtimestamp(last_ts).strftime("%Y-%m-%d %H:%M:%S")
+            # The full write path, so the summary, the status cache and subscribers see the recovered keys.
+            update_status_fields(partner_id, missing, journal=False)
+            logger.warning(f"Recovered unflushed status keys for partner_id {partner_id}: {list(missing)}")
+
+    return store.compact_status_events(partner_id, before)
+
+
+def compact_all_journals() -> int:
+    removed = 0
+    for partner_id in get_state_store().list_partner_ids():
+        try:
+            removed += compact_partner_journal(partner_id)
+        except Exception as e:
+            logger.error(f"Error compacting status journal for partner_id {partner_id}: {str(e)}")
+    status_writer.flush()
+    logger.info(f"Status journal compaction complete, removed {removed} events")
+    return removed
+
+
+class JournalCompactor:
+    """Background thread that periodically compacts every partner's status journal."""
+
+    def __init__(self, interval: float = STATUS_JOURNAL_COMPACT_INTERVAL):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="status-journal-compactor", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        # Compact once at startup to fold in anything left unflushed by the last process.
+        while not self._stop.is_set():
+            try:
+                compact_all_journals()
+            except Exception as e:
+                logger.error(f"Status journal compaction failed: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+journal_compactor = JournalCompactor()
@@ -0,0 +1,112 @@
+import threading
+from typing import Dict, Optional
+
+from app.core.config import log_level
+from app.core.executors import run_blocking
+from app.core.logging import setup_logger
+from app.core.state_store import get_state_store
+
+logger = setup_logger(__name__, log_level)
+
+UNKNOWN = "Unknown"
+
+# Status keys that are counted, mapped to the entry field that tracks them.
+SUMMARY_STATUS_KEYS = {"Terraform": "terraform", "MLWorkbench": "ml_workbench"}
+
+
+class StatusSummary:
+    """
+    Fleet-wide counters of partners by Terraform state, MLWorkbench state and region.
+
+    Every transition decrements the partner's previous bucket and increments the
+    new one, so reading the summary is O(1). Only partners with a saved payload
+    are counted; status updates for other IDs are remembered until it arrives.
+    Counters only see this process's transitions; with several service
+    processes, ``resync`` runs on every worker sweep to pick up the others'.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        self.total = 0
+        self.terraform: Dict[str, int] = {}
+        self.ml_workbench: Dict[str, int] = {}
+        self.regions: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _bump(counter: Dict[str, int], key: str, delta: int) -> None:
+        counter[key] = counter.get(key, 0) + delta
+        if counter[key] <= 0:
+            del counter[key]
+
+    def _count(self, entry: dict, delta: int) -> None:
+        terraform = entry["terraform"] or UNKNOWN
+        region = entry["region"] or UNKNOWN
+        self.total += delta
+        self._bump(self.terraform, terraform, delta)
+        self._bump(self.ml_workbench, entry["ml_workbench"] or UNKNOWN, delta)
+        self._bump(self.regions.setdefault(region, {}), terraform, delta)
+        if not self.regions[region]:
+            del self.regions[region]
+
+    def _update(self, partner_id: str, **changes) -> None:
+        with self._lock:
+            old = self._entries.get(partner_id)
+            new = dict(old or {"tracked": False, "region": None, "terraform": None, "ml_workbench": None})
+            new.update(changes)
+            if old is not None and old["tracked"]:
+                self._count(old, -1)
+            if new["tracked"]:
+                self._count(new, 1)
+            self._entries[partner_id] = new
+
+    def record_payload(self, partner_id: str, region: Optional[str]) -> None:
+        self._update(partner_id, region=region, tracked=True)
+
+    def record_status(self, partner_id: str, key: str, value) -> None:
+        field = SUMMARY_STATUS_KEYS.get(key)
+        if field is not None:
+            self._update(partner_id, **{field: value if isinstance(value, str) else None})
+
+    def rebuild(self, page_size: int = 1000) -> None:
+        """Recompute every counter from the state store's partner index."""
+        entries = {}
+        cursor = None
+        while True:
+            rows = get_state_store().query_zone_partners({}, cursor, page_size)
+            for row in rows:
+                entries[row["partner_id"]] = {
+                    "tracked": True,
+                    "region": row["region"],
+                    "terraform": row["terraform_state"],
+                    "ml_workbench": row["ml_workbench_state"],
+                }
+            if len(rows) < page_size:
+                break
+            cursor = rows[-1]["partner_id"]
+
+        with self._lock:
+            self._entries = entries
+            self._reset_counters()
+            for entry in entries.values():
+                self._count(entry, 1)
+        logger.info(f"Status summary rebuilt for {len(entries)} partners")
+
+    async def resync(self) -> None:
+        """Rebuild off the event loop, picking up transitions written by other service processes."""
+        await run_blocking("io", self.rebuild)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "total": self.total,
+                "terraform": dict(self.terraform),
+                "ml_workbench": dict(self.ml_workbench),
+                "regions": {region: dict(states) for region, states in self.regions.items()},
+            }
+
+
+status_summary = StatusSummary()
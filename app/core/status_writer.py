@@ -0,0 +1,127 @@
+import threading
+import weakref
+from typing import Dict, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import STATUS_FLUSH_INTERVAL
+from app.core.state_store import get_state_store
+
+logger = setup_logger(__name__, log_level)
+
+
+class StatusWriter:
+    """
+    Applies status updates under a per-partner lock and coalesces bursts of
+    updates into a single write.
+
+    Every update bumps the record's ``Version`` counter. Updates are merged into
+    an in-memory copy of the partner's status record and marked dirty; dirty records are written to the state store after
+    ``flush_interval`` seconds, or immediately when the interval is 0. Readers
+    should consult ``get_pending`` first so they observe unflushed updates.
+    """
+
+    def __init__(self, flush_interval: float = STATUS_FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._locks: "weakref.WeakValueDictionary[str, threading.RLock]" = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        self._pending: Dict[str, dict] = {}
+        # Keys set since each pending record was loaded, so a store that detects a
+        # concurrent writer can reapply just these onto the newer record.
+        self._changes: Dict[str, dict] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+
+    def locked(self, partner_id: str) -> threading.RLock:
+        """Per-partner lock; hold it to read and update a record without interleaving writers."""
+        with self._locks_guard:
+            lock = self._locks.get(partner_id)
+            if lock is None:
+                lock = threading.RLock()
+                self._locks[partner_id] = lock
+            return lock
+
+    def update(self, partner_id: str, updates: dict) -> dict:
+        """
+        Merge updates into the partner's status record
+
+        Args:
+            partner_id: The ID of the partner zone
+            updates: Status keys and values to set
+
+        Returns:
+            dict: The merged status record
+        """
+        with self.locked(partner_id):
+            current = self._pending.get(partner_id)
+            if current is None:
+                current = get_state_store().load_status(partner_id) or {}
+            data = {**current, **updates, "Version": current.get("Version", 0) + 1}
+            if self.flush_interval <= 0:
+                get_state_store().write_status(partner_id, data, changes=updates)
+                get_state_store().flush()
+                return data
+            self._pending[partner_id] = data
+            self._changes[partner_id] = {**self._changes.get(partner_id, {}), **updates}
+        self._schedule_flush()
+        return data
+
+    def get_pending(self, partner_id: str) -> Optional[dict]:
+        data = self._pending.get(partner_id)
+        return dict(data) if data is not None else None
+
+    def pending_version(self, partner_id: str) -> Optional[int]:
+        data = self._pending.get(partner_id)
+        return data.get("Version") if data is not None else None
+
+    def _schedule_flush(self) -> None:
+        with self._timer_lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        with self._timer_lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Write every dirty status record to the state store
+
+        Returns:
+            int: Number of records written
+        """
+        written = 0
+        for partner_id in list(self._pending):
+            # Keep the record pending until it is on disk so that a concurrent
+            # update never re-reads a stale copy from the store.
+            with self.locked(partner_id):
+                data = self._pending.get(partner_id)
+                if data is None:
+                    continue
+                try:
+                    get_state_store().write_status(partner_id, data, changes=self._changes.get(partner_id))
+                    del self._pending[partner_id]
+                    self._changes.pop(partner_id, None)
+                    written += 1
+                except Exception as e:
+                    logger.error(f"Error flushing status for partner_id {partner_id}: {str(e)}")
+        try:
+            get_state_store().flush()
+        except Exception as e:
+            logger.error(f"Error flushing state store: {str(e)}")
+        if self._pending:
+            self._schedule_flush()
+        return written
+
+    def close(self) -> None:
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+
+
+status_writer = StatusWriter()
@@ -0,0 +1,191 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import log_level
+from app.core.logging import setup_logger
+from app.core.constants import WORKER_HEARTBEAT_INTERVAL, WORKER_TTL
+from app.core.executors import run_blocking
+from app.core.metrics import metrics
+from app.core.state_store import get_state_store, record_revision
+
+logger = setup_logger(__name__, log_level)
+
+WORKER_KIND = "worker"
+WORKER_ALIVE = "alive"
+
+Sweep = Callable[[], Awaitable[None]]
+
+
+class RecordSuperseded(Exception):
+    """Raised when an owned record was changed by another worker since it was last read."""
+
+
+def _new_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class WorkerRegistry:
+    """
+    Liveness of the service processes sharing one state store.
+
+    Every process registers a "worker" record and refreshes its heartbeat from
+    a daemon thread, so a busy event loop does not make it look dead. Jobs,
+    batches and fleet operations name the worker that owns them in ``owner``.
+    Records change hands only through ``claim``, a compare-and-swap on the
+    record: a worker may take a record it already owns, or one whose owner has
+    not heartbeated for ``ttl`` seconds, and when two try at once exactly one
+    wins. Components register sweeps that periodically adopt orphaned work.
+    """
+
+    def __init__(self, heartbeat_interval: float = WORKER_HEARTBEAT_INTERVAL, ttl: float = WORKER_TTL):
+        self.heartbeat_interval = heartbeat_interval
+        self.ttl = ttl
+        self.worker_id = _new_worker_id()
+        self._started_at: Optional[str] = None
+        self._sweeps: Dict[str, Sweep] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sweeper: Optional[asyncio.Task] = None
+        metrics.register_collector("workers", self.stats)
+
+    def heartbeat(self) -> None:
+        get_state_store().put_record(WORKER_KIND, self.worker_id, {
+            "id": self.worker_id,
+            "state": WORKER_ALIVE,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "started_at": self._started_at,
+            "heartbeat_at": time.time(),
+        })
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.heartbeat_interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.error(f"Error writing heartbeat for worker {self.worker_id}: {str(e)}")
+
+    def is_alive(self, worker_id: Optional[str]) -> bool:
+        if worker_id is None:
+            return False
+        if worker_id == self.worker_id:
+            return True
+        record = get_state_store().get_record(WORKER_KIND, worker_id)
+        return record is not None and time.time() - record["heartbeat_at"] < self.ttl
+
+    def claim(self, kind: str, record: dict, **updates) -> Optional[dict]:
+        """
+        Take ownership of a record and apply ``updates`` in one compare-and-swap
+
+        Args:
+            kind: Record kind
+            record: The record as last read
+            **updates: Fields to change together with the owner
+
+        Returns:
+            Optional[dict]: The claimed record, or None if a live worker owns it or
+            it changed since it was read
+        """
+        owner = record.get("owner")
+        if owner != self.worker_id and self.is_alive(owner):
+            return None
+        claimed = {**record, **updates, "owner": self.worker_id}
+        if not get_state_store().swap_record(kind, record["id"], claimed, record_revision(record)):
+            return None
+        if owner != self.worker_id:
+            logger.warning(f"Worker {self.worker_id} adopted {kind} {record['id']} from {owner}")
+        return claimed
+
+    @staticmethod
+    def save(kind: str, record: dict) -> None:
+        """
+        Write back an owned record, unless another worker changed it in the meantime
+
+        Raises:
+            RecordSuperseded: If the stored revision is not the one ``record`` was read at
+        """
+        if not get_state_store().swap_record(kind, record["id"], record, record_revision(record)):
+            raise RecordSuperseded(f"{kind} {record['id']} was changed by another worker")
+
+    def orphaned(self, kind: str, states: List[str]) -> List[dict]:
+        """Records of a kind in any of ``states`` whose owner is neither this worker nor alive."""
+        alive = {}
+        orphans = []
+        for state in states:
+            for record in get_state_store().list_records(kind, state):
+                owner = record.get("owner")
+                if owner == self.worker_id:
+                    continue
+                if owner not in alive:
+                    alive[owner] = self.is_alive(owner)
+                if not alive[owner]:
+                    orphans.append(record)
+        return orphans
+
+    def register_sweep(self, name: str, sweep: Sweep) -> None:
+        self._sweeps[name] = sweep
+
+    async def _sweep_loop(self) -> None:
+        # Owners are only considered dead after ``ttl``, so sweeping more often gains nothing.
+        while True:
+            await asyncio.sleep(self.ttl / 2)
+            for name, sweep in list(self._sweeps.items()):
+                try:
+                    await sweep()
+                except Exception as e:
+                    logger.error(f"Error running {name} sweep: {str(e)}")
+            try:
+                await run_blocking("io", self._reap)
+            except Exception as e:
+                logger.error(f"Error reaping dead workers: {str(e)}")
+
+    def _reap(self) -> None:
+        """Drop the records of workers that stopped heartbeating; their work has been adopted by now."""
+        store = get_state_store()
+        for record in store.list_records(WORKER_KIND, WORKER_ALIVE):
+            if record["id"] != self.worker_id and time.time() - record["heartbeat_at"] >= self.ttl * 2:
+                store.delete_record(WORKER_KIND, record["id"])
+
+    async def start(self) -> None:
+        if self._thread is not None:
+            return
+        # A fresh id per start, so a process that forked after import never shares its parent's.
+        self.worker_id = _new_worker_id()
+        self._started_at = datetime.now(timezone.utc).isoformat()
+        self.heartbeat()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="worker-heartbeat", daemon=True)
+        self._thread.start()
+        self._sweeper = asyncio.create_task(self._sweep_loop(), name="worker-sweeps")
+        logger.info(f"Worker {self.worker_id} registered")
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        # Deregistering lets other workers adopt whatever this one still owns right away.
+        get_state_store().delete_record(WORKER_KIND, self.worker_id)
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "worker_id": self.worker_id,
+            "alive": sorted(
+                record["id"] for record in get_state_store().list_records(WORKER_KIND, WORKER_ALIVE)
+                if now - record["heartbeat_at"] < self.ttl
+            ),
+        }
+
+
+worker_registry = WorkerRegistry()
@@ -2,7 +2,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.routers import api_router
 from app.core.config import config, log_level
+from app.core.constants import WEB_WORKERS
+from app.core.batches import batch_manager
+from app.core.builds import build_tracker
+from app.core.executors import executors
+from app.core.fleet import fleet_manager
+from app.core.jobs import job_queue
 from app.core.logging import setup_logger
+from app.core.state_gc import state_reclaimer
+from app.core.status_journal import journal_compactor
+from app.core.status_summary import status_summary
+from app.core.status_writer import status_writer
+from app.core.workers import worker_registry
 from app.utils.utils import check_tools
 
 logger = setup_logger(__name__, log_level)
@@ -38,6 +49,18 @@ tags_metadata = [
         "name": "status",
         "description": "Retrieve status information for partner zones.",
     },
+    {
+        "name": "jobs",
+        "description": "Track queued and running zone partner operations.",
+    },
+    {
+        "name": "fleet-operations",
+        "description": "Redeploy or delete many zone partners in waves.",
+    },
+    {
+        "name": "callbacks",
+        "description": "Completion callbacks from the provisioning pipelines.",
+    },
     {
         "name": "auth",
         "description": "Operations related to authentication.",
@@ -52,10 +75,30 @@ tags_metadata = [
 async def lifespan(app_: FastAPI):
     # Startup
     check_tools()
+    journal_compactor.start()
+    status_summary.rebuild()
+    state_reclaimer.start()
+    await worker_registry.start()
+    if WEB_WORKERS > 1:
+        worker_registry.register_sweep("status_summary", status_summary.resync)
+    await job_queue.start()
+    await batch_manager.start()
+    await fleet_manager.start()
+    await build_tracker.start()
     logger.info("Application startup complete.")
     yield
     # Shutdown
     logger.warning("Application shutting down.")
+    await build_tracker.stop()
+    await fleet_manager.stop()
+    await batch_manager.stop()
+    await job_queue.drain()
+    await job_queue.stop()
+    await worker_registry.stop()
+    executors.shutdown()
+    state_reclaimer.stop()
+    journal_compactor.stop()
+    status_writer.close()
 
 app = FastAPI(
     title="Partner Zone Management API",
@@ -121,6 +121,9 @@ class DeployMLWorkbench(BaseModel):
     metadata_bucket_name_production: str = "string"
     sftp_bucket_name_staging: str = "string"
     metadata_bucket_name_staging: str = "string"
+    dynamotable_dev: Optional[str] = None
+    dynamotable_production: Optional[str] = None
+    dynamotable_staging: Optional[str] = None
     telesign_certificate_arn: str = "string"
     autoscaler_role_arn: str = "string"
     fsx_iam_role_arn: str = "string"
@@ -1,44 +1,89 @@
 import logging
-from app.core.jenkins_utils import trigger_pipeline_create_aws, trigger_pipeline_redeploy_aws, trigger_pipeline_destroy_aws
+import re
+from typing import List
+from app.core.builds import build_tracker
+from app.core.config import config
+from app.core.constants import AWS_REGIONS
+from app.core.jenkins_utils import pipeline_requests, trigger_pipeline
+from app.core.jobs import current_job
+from app.providers.base import FINDING_ERROR, FINDING_WARNING, CloudProvider, ProviderStep, finding
 from app.utils.k8s_utils import patch_service_type
 
 logger = logging.getLogger(__name__)
 
+INSTANCE_TYPE_PATTERN = re.compile(r"^[a-z][a-z0-9-]*\.[a-z0-9]+$")
 
-class AWSCloudProvider:
-    def __init__(self, zone_partner):
-        self.zone_partner = zone_partner
-        self.variables = self.zone_partner.variables
-        self.plan_only = self.zone_partner.plan_only
-        self.partner_id = self.zone_partner.partner_id
-
-    def create_zone_partner(self):
-        try:
-            trigger_pipeline_create_aws(self.zone_partner, self.variables)
-            return "Creation pipeline triggered successfully"
-        except Exception as e:
-            logger.error(f"An error occurred during zone partner creation: {str(e)}")
-            raise
-
-    def delete_zone_partner(self):
-        try:
-            no_lb_services = self.pre_cleanup(self.partner_id)
-            if no_lb_services:
-                trigger_pipeline_destroy_aws(self.zone_partner, self.variables)
-                return "Deletion pipeline triggered successfully"
-            else:
-                raise ValueError("LoadBalancer services could not be removed. Cannot proceed with deletion.")
-        except Exception as e:
-            logger.error(f"An error occurred during zone partner deletion: {str(e)}")
-            raise
-
-    def redeploy_zone_partner(self):
-        try:
-            trigger_pipeline_redeploy_aws(self.zone_partner, self.variables)
-            return "Redeployment pipeline triggered successfully"
-        except Exception as e:
-            logger.error(f"An error occurred during zone partner redeployment: {str(e)}")
-            raise
+
+class AWSCloudProvider(CloudProvider):
+    def plan(self) -> dict:
+        return {"pipelines": pipeline_requests(self.zone_partner, self.variables), "findings": self._findings()}
+
+    def _findings(self) -> List[dict]:
+        # Checks beyond the ZonePartner model validation, which has already rejected malformed input.
+        findings = []
+        region = self.variables["region"]
+        if region not in AWS_REGIONS:
+            findings.append(finding(FINDING_ERROR, "region", f"Region {region} is not a supported AWS region"))
+        instance_types = self.variables["instance_types"]
+        for instance_type in instance_types:
+            if not isinstance(instance_type, str) or not INSTANCE_TYPE_PATTERN.match(instance_type):
+                findings.append(
+                    finding(FINDING_ERROR, "instance_types", f"{instance_type!r} is not an EC2 instance type")
+                )
+        if len(set(map(str, instance_types))) != len(instance_types):
+            findings.append(finding(FINDING_WARNING, "instance_types", "Instance types are listed more than once"))
+        if self.variables["subnet_count"] < 2:
+            findings.append(
+                finding(FINDING_WARNING, "subnet_count", "EKS needs subnets in at least two availability zones")
+            )
+        if self.variables["max_nodes"] == 0:
+            findings.append(finding(FINDING_ERROR, "max_nodes", "The node group can never run any nodes"))
+        elif self.variables["min_nodes"] == 0:
+            findings.append(finding(FINDING_WARNING, "min_nodes", "The node group may scale down to no nodes"))
+        return findings
+
+    def _trigger(self, operation: str) -> int:
+        plan = self.applied_plan or {"pipelines": pipeline_requests(self.zone_partner, self.variables)}
+        queue_item = trigger_pipeline(plan["pipelines"][operation]["parameters"])
+        job = current_job.get()
+        build_tracker.track(
+            self.partner_id, operation, config.get_jenkins_config()["pipeline_name"], queue_item,
+            job_id=job["id"] if job is not None else None,
+        )
+        return queue_item
+
+    def steps(self, operation: str) -> List[ProviderStep]:
+        if operation == "create":
+            return [
+                ProviderStep(
+                    "trigger_create_pipeline",
+                    lambda: self._trigger("create"),
+                    "Creation pipeline triggered successfully",
+                ),
+            ]
+        if operation == "delete":
+            return [
+                # Patching the LoadBalancer services waits on the cluster, so it is most of the work.
+                ProviderStep("pre_cleanup", self._remove_load_balancers, "LoadBalancer services removed", weight=3),
+                ProviderStep(
+                    "trigger_destroy_pipeline",
+                    lambda: self._trigger("delete"),
+                    "Deletion pipeline triggered successfully",
+                ),
+            ]
+        if operation == "redeploy":
+            return [
+                ProviderStep(
+                    "trigger_redeploy_pipeline",
+                    lambda: self._trigger("redeploy"),
+                    "Redeployment pipeline triggered successfully",
+                ),
+            ]
+        return super().steps(operation)
+
+    def _remove_load_balancers(self):
+        if not self.pre_cleanup(self.partner_id):
+            raise ValueError("LoadBalancer services could not be removed. Cannot proceed with deletion.")
 
     def pre_cleanup(self, partner_id):
         services_to_patch = [
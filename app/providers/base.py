@@ -0,0 +1,116 @@
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from app.core.executors import run_blocking
+from app.core.jobs import run_step
+
+logger = logging.getLogger(__name__)
+
+FINDING_ERROR = "error"
+FINDING_WARNING = "warning"
+
+
+def finding(severity: str, field: str, message: str) -> dict:
+    """A validation finding of a plan; any "error" finding blocks applying it."""
+    return {"severity": severity, "field": field, "message": message}
+
+
+@dataclass
+class ProgressEvent:
+    """
+    Progress of a provider operation, emitted when a phase starts and when it finishes.
+
+    ``percent`` is the share of the operation's weighted phases completed so far;
+    ``started_at`` is the wall-clock time the operation started.
+    """
+    operation: str
+    phase: str
+    percent: int
+    message: str
+    started_at: float
+    elapsed: float = 0.0
+    phase_duration: Optional[float] = None
+    done: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class ProviderStep:
+    """One phase of an operation: a blocking callable and its share of the work."""
+    phase: str
+    func: Callable[[], Any]
+    message: str
+    weight: float = 1.0
+
+
+class CloudProvider:
+    """
+    Base class for cloud providers.
+
+    Subclasses describe each operation as a list of ``ProviderStep`` and get an
+    async generator per operation yielding ``ProgressEvent``. Steps run in the
+    provider executor as resumable job steps (see ``run_step``), so a resumed
+    job does not repeat the phases an earlier attempt completed. ``plan``
+    computes an operation's inputs up front, for plan-only requests and for
+    applying a stored plan.
+    """
+
+    def __init__(self, zone_partner, plan: Optional[dict] = None):
+        self.zone_partner = zone_partner
+        self.variables = self.zone_partner.variables
+        self.plan_only = self.zone_partner.plan_only
+        self.partner_id = self.zone_partner.partner_id
+        # A stored plan to apply; operations compute what they need themselves without one.
+        self.applied_plan = plan
+
+    def plan(self) -> dict:
+        """
+        Compute what creating the partner would do, without doing it
+
+        Returns:
+            dict: "pipelines" (the pipeline and parameters of each operation) and
+            "findings" (validation findings of the inputs)
+        """
+        return {"pipelines": {}, "findings": []}
+
+    def steps(self, operation: str) -> List[ProviderStep]:
+        raise NotImplementedError(f"{type(self).__name__} does not support {operation}")
+
+    async def run(self, operation: str) -> AsyncIterator[ProgressEvent]:
+        steps = self.steps(operation)
+        total = sum(step.weight for step in steps) or 1
+        completed = 0.0
+        started_at = time.time()
+        started = time.monotonic()
+        for step in steps:
+            phase_started = time.monotonic()
+            yield ProgressEvent(
+                operation, step.phase, round(100 * completed / total), f"{step.phase} started", started_at,
+                elapsed=phase_started - started,
+            )
+            try:
+                await run_blocking("provider", run_step, step.phase, step.func)
+            except Exception as e:
+                logger.error(f"An error occurred during zone partner {operation} ({step.phase}): {str(e)}")
+                raise
+            completed += step.weight
+            finished = time.monotonic()
+            yield ProgressEvent(
+                operation, step.phase, round(100 * completed / total), step.message, started_at,
+                elapsed=finished - started,
+                phase_duration=finished - phase_started,
+                done=completed >= total,
+            )
+
+    def create_zone_partner(self) -> AsyncIterator[ProgressEvent]:
+        return self.run("create")
+
+    def delete_zone_partner(self) -> AsyncIterator[ProgressEvent]:
+        return self.run("delete")
+
+    def redeploy_zone_partner(self) -> AsyncIterator[ProgressEvent]:
+        return self.run("redeploy")
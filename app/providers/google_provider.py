@@ -1,15 +1,8 @@
-class GoogleCloudProvider:
-    def __init__(self, zone_partner):
-        self.zone_partner = zone_partner
+from typing import List
+from app.providers.base import CloudProvider, ProviderStep
 
-    def create_zone_partner(self):
-        # Implementation here
-        pass
-
-    def delete_zone_partner(self):
-        # Implementation here
-        pass
 
-    def redeploy_zone_partner(self):
+class GoogleCloudProvider(CloudProvider):
+    def steps(self, operation: str) -> List[ProviderStep]:
         # Implementation here
-        pass
\ No newline at end of file
+        return []
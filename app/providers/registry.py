@@ -0,0 +1,41 @@
+import importlib
+import threading
+from typing import Dict, Type
+
+# Provider class of each cloud as "module:Class". A provider module pulls in the
+# Kubernetes client, so it is only imported the first time a partner on that
+# cloud is handled.
+PROVIDERS: Dict[str, str] = {
+    "aws": "app.providers.aws_provider:AWSCloudProvider",
+    "azure": "app.providers.azure_provider:AzureCloudProvider",
+    "google": "app.providers.google_provider:GoogleCloudProvider",
+}
+
+_classes: Dict[str, Type] = {}
+_lock = threading.Lock()
+
+
+def register_provider(cloud: str, path: str) -> None:
+    with _lock:
+        PROVIDERS[cloud] = path
+        _classes.pop(cloud, None)
+
+
+def get_provider_class(cloud: str) -> Type:
+    """
+    Provider class for a cloud, importing its module on first use
+
+    Raises:
+        ValueError: If no provider is registered for the cloud
+    """
+    with _lock:
+        provider_class = _classes.get(cloud)
+        if provider_class is not None:
+            return provider_class
+        path = PROVIDERS.get(cloud)
+        if path is None:
+            raise ValueError(f"Invalid cloud provider: {cloud}")
+        module_name, class_name = path.split(":")
+        provider_class = getattr(importlib.import_module(module_name), class_name)
+        _classes[cloud] = provider_class
+        return provider_class
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 
-from app.api.endpoints import zone_partners, ml_workbench, status, auth, health, root
+from app.api.endpoints import zone_partners, ml_workbench, status, auth, health, root, jobs, fleet, callbacks
 from app.core.auth import token_dependency
 
 api_router = APIRouter()
@@ -10,7 +10,11 @@ api_router.include_router(zone_partners.router, prefix="/zone-partners", tags=["
 api_router.include_router(ml_workbench.router, prefix="/ml-workbench", tags=["ml-workbench"])
 # api_router.include_router(profile_access.router, prefix="/profile-access", tags=["profile-access"], dependencies=[Depends(token_dependency)])
 api_router.include_router(status.router, prefix="/status", tags=["status"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(fleet.router, prefix="/fleet-operations", tags=["fleet-operations"])
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+# Path fixed by the call_back_url handed to the pipeline; authenticated by callback_dependency.
+api_router.include_router(callbacks.router, tags=["callbacks"])
 # api_router.include_router(zone_partners.router, prefix="/zone-partners", tags=["zone-partners"], dependencies=[Depends(token_dependency)])
 # api_router.include_router(ml_workbench.router, prefix="/ml-workbench", tags=["ml-workbench"], dependencies=[Depends(token_dependency)])
 # api_router.include_router(profile_access.router, prefix="/profile-access", tags=["profile-access"], dependencies=[Depends(token_dependency)])
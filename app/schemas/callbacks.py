@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class PipelineCallbackResponse(BaseModel):
+    """Response model for the pipeline completion callback"""
+    message: str
+    result: str = Field(description="Pipeline result as reported by the callback")
+    job_id: Optional[str] = Field(None, description="ML Workbench deployment job started by a successful pipeline")
+    duplicate: bool = Field(False, description="True if this callback was already received and its job reused")
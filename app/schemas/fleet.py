@@ -0,0 +1,55 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class FleetOperationFilters(BaseModel):
+    """Partner selection; every given field must match"""
+    user_id: Optional[str] = None
+    account_id: Optional[str] = None
+    region: Optional[str] = None
+    deployment_name: Optional[str] = None
+    terraform_state: Optional[str] = None
+
+
+class FleetOperationRequest(BaseModel):
+    """Request model for starting a fleet operation"""
+    operation: Literal["redeploy", "delete"] = Field(description="Operation to run on every selected partner")
+    filters: FleetOperationFilters = Field(default_factory=FleetOperationFilters)
+    wave_size: int = Field(10, ge=1, le=500, description="Number of partners per wave")
+    concurrency: int = Field(5, ge=1, le=100, description="Maximum number of jobs in flight within a wave")
+    error_threshold: float = Field(
+        0.2, ge=0, le=1, description="Fraction of a wave that may fail before the operation halts"
+    )
+    on_threshold: Literal["pause", "abort"] = Field("pause", description="What to do when a wave crosses the threshold")
+
+
+class FleetWaveItem(BaseModel):
+    partner_id: str
+    job_id: Optional[str] = None
+    state: str = Field(description="pending, queued, running, succeeded, failed or skipped")
+    error: Optional[str] = None
+
+
+class FleetWaveProgress(BaseModel):
+    index: int
+    state: str = Field(description="pending, running, halted or completed")
+    progress: Dict[str, int] = Field(description="Number of partners per item state")
+    error_rate: float = Field(description="Failed partners as a fraction of the wave")
+    items: List[FleetWaveItem]
+
+
+class FleetOperationResponse(BaseModel):
+    """Response model for fleet operation progress"""
+    id: str
+    operation: str
+    filters: Dict[str, str]
+    state: str = Field(description="running, paused, aborted or completed")
+    wave_size: int
+    concurrency: int
+    error_threshold: float
+    on_threshold: str
+    current_wave: int = Field(description="Index of the wave being run")
+    total: int = Field(description="Number of selected partners")
+    created_at: str
+    finished_at: Optional[str] = None
+    waves: List[FleetWaveProgress]
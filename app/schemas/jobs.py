@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+from fastapi import Header
+from pydantic import BaseModel, Field
+from app.schemas.common import ErrorResponse
+
+
+class JobResponse(BaseModel):
+    """Response model for the job endpoint"""
+    id: str = Field(description="Job ID")
+    kind: str = Field(description="Operation the job runs, e.g. create_zone_partner")
+    partner_id: Optional[str] = Field(None, description="Partner zone the job acts on")
+    user_id: Optional[str] = Field(None, description="User the job is scheduled under")
+    account_id: Optional[str] = Field(None, description="Cloud account the job counts against")
+    region: Optional[str] = Field(None, description="Region the job counts against")
+    state: str = Field(description="queued, running, succeeded or failed")
+    attempts: int = Field(0, description="Number of times a worker has started the job")
+    created_at: str = Field(description="Submission time (ISO 8601, UTC)")
+    started_at: Optional[str] = Field(None, description="Time the latest attempt started")
+    finished_at: Optional[str] = Field(None, description="Time the job finished")
+    result: Optional[Any] = Field(None, description="Value returned by the operation")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    owner: Optional[str] = Field(None, description="Worker process (host:pid:id) that owns the job")
+    checkpoints: Dict[str, dict] = Field(
+        default_factory=dict,
+        description="Steps completed so far, with completion time and result; a resumed job skips them",
+    )
+    interrupted_at: Optional[str] = Field(None, description="Time the job was last interrupted by a shutdown")
+
+
+class JobQueueStatsResponse(BaseModel):
+    """Response model for the job queue statistics endpoint"""
+    workers: int = Field(description="Number of running workers")
+    draining: bool = Field(False, description="True while the service is shutting down and rejects new jobs")
+    max_queued: int = Field(description="Maximum number of waiting jobs")
+    queued: int = Field(description="Number of waiting jobs")
+    users_waiting: int = Field(0, description="Number of users with waiting jobs")
+    accounts: Dict[str, dict] = Field(
+        default_factory=dict,
+        description="Per account: queued, running, cap, oldest_wait, dispatched, avg_wait and max_wait (seconds)",
+    )
+    regions: Dict[str, dict] = Field(default_factory=dict, description="The same figures per region")
+
+
+class JobSubmittedResponse(BaseModel):
+    """Response model for endpoints that queue a job"""
+    message: str
+    job_id: str = Field(description="ID to poll at /jobs/{job_id}")
+    duplicate: bool = Field(False, description="True if the request was coalesced onto an existing job")
+
+
+JOB_SUBMITTED_RESPONSES = {
+    200: {"model": JobSubmittedResponse, "description": "Job queued, or an existing job for the same request"},
+    409: {"model": ErrorResponse, "description": "Another operation is in progress for the partner"},
+    422: {"model": ErrorResponse, "description": "Idempotency-Key reused for a different request"},
+    503: {"model": ErrorResponse, "description": "Job queue is full or the service is shutting down, retry later"}
+}
+
+# Header accepted by every endpoint that queues a job.
+IDEMPOTENCY_KEY_HEADER = Header(
+    None, alias="Idempotency-Key", description="Repeating a key returns the job created by its first use"
+)
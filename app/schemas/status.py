@@ -1,13 +1,22 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import AliasChoices, BaseModel, Field
 
 
 class StatusResponse(BaseModel):
     """Response model for status endpoint"""
-    Last_Updated: datetime = Field(description="Last updated timestamp")
+    Last_Updated: datetime = Field(
+        description="Last updated timestamp",
+        validation_alias=AliasChoices("Last_Updated", "Last Updated"),
+    )
+    Version: Optional[int] = Field(None, description="Status record version, incremented on every update")
     Terraform: Optional[str] = Field(None, description="Terraform deployment status")
     MLWorkbench: Optional[str] = Field(None, description="MLWorkbench deployment status")
+    Phase: Optional[str] = Field(None, description="Phase of the running or last provider operation")
+    Progress: Optional[int] = Field(None, description="Percent of the provider operation completed")
+    Plan: Optional[str] = Field(None, description="ID of the partner's latest creation plan")
+    Pipeline_Build: Optional[int] = Field(None, description="Jenkins build number of the latest pipeline")
+    Pipeline_Result: Optional[str] = Field(None, description="Result of the latest pipeline once it finished")
     cluster_name: Optional[str] = Field(None, description="EKS cluster name")
 
     # DynamoDB tables
@@ -34,6 +43,7 @@ class StatusResponse(BaseModel):
         json_schema_extra = {
             "example": {
                 "Last_Updated": "2024-10-23T10:00:00",
+                "Version": 4,
                 "Terraform": "Complete",
                 "MLWorkbench": "Complete",
                 "cluster_name": "eks-cluster-1",
@@ -50,4 +60,45 @@ class StatusResponse(BaseModel):
                 "SFTP_URL": "sftp://sftp.example.com",
                 "PZ_External_URL": "https://pz.example.com"
             }
-        }
\ No newline at end of file
+        }
+
+
+class BulkStatusRequest(BaseModel):
+    """Request model for the bulk status endpoint"""
+    partner_ids: Optional[List[str]] = Field(
+        None, max_length=500, description="Explicit partner IDs; when omitted partners are selected by the filters"
+    )
+    user_id: Optional[str] = Field(None, description="Only partners owned by this user")
+    account_id: Optional[str] = Field(None, description="Only partners in this cloud account")
+    region: Optional[str] = Field(None, description="Only partners in this region")
+    deployment_name: Optional[str] = Field(None, description="Only partners with this deployment name")
+    terraform_state: Optional[str] = Field(None, description="Only partners in this Terraform state")
+    fields: Optional[List[str]] = Field(None, description="StatusResponse fields to return; all when omitted")
+    cursor: Optional[str] = Field(None, description="Cursor returned by the previous page")
+    limit: int = Field(100, ge=1, le=500, description="Maximum number of partners per page")
+
+
+class BulkStatusResponse(BaseModel):
+    """Response model for the bulk status endpoint"""
+    items: Dict[str, Optional[dict]] = Field(
+        description="Status per partner ID, restricted to the requested fields; null when no status exists"
+    )
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class StatusSummaryResponse(BaseModel):
+    """Response model for the fleet status summary endpoint"""
+    total: int = Field(description="Number of zone partners")
+    terraform: Dict[str, int] = Field(description="Partner count per Terraform state")
+    ml_workbench: Dict[str, int] = Field(description="Partner count per MLWorkbench state")
+    regions: Dict[str, Dict[str, int]] = Field(description="Partner count per region and Terraform state")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "total": 12,
+                "terraform": {"Complete": 9, "Creating": 2, "Error": 1},
+                "ml_workbench": {"Complete": 9, "Unknown": 3},
+                "regions": {"us-east-1": {"Complete": 7, "Creating": 2}, "eu-west-1": {"Complete": 2, "Error": 1}}
+            }
+        }
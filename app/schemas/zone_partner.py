@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from app.core.constants import BATCH_MAX_ITEMS
+
+
+class ZonePartnerListResponse(BaseModel):
+    """Response model for the zone partner listing endpoint"""
+    items: List[dict] = Field(description="Zone partner index rows, restricted to the requested fields")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+
+
+class BatchCreateRequest(BaseModel):
+    """Request model for batch zone partner creation"""
+    items: List[dict] = Field(
+        ..., min_length=1, max_length=BATCH_MAX_ITEMS, description="ZonePartner payloads, validated one by one"
+    )
+    fanout: Optional[int] = Field(
+        None, ge=1, le=100, description="Maximum number of this batch's creations in flight at once"
+    )
+
+
+class BatchItemResult(BaseModel):
+    """Validation result and progress of one batch item"""
+    index: int = Field(description="Position of the payload in the request")
+    partner_id: Optional[str] = Field(None, description="partner_id of the payload, if present")
+    status: str = Field(description="accepted or invalid")
+    errors: List[str] = Field(default_factory=list, description="Validation errors of an invalid payload")
+    job_id: Optional[str] = Field(None, description="Creation job, once queued")
+    job_state: Optional[str] = Field(
+        None, description="invalid, pending, queued, running, succeeded or failed"
+    )
+    error: Optional[str] = Field(None, description="Why the creation failed or could not be queued")
+
+
+class BatchCreateResponse(BaseModel):
+    """Response model for batch zone partner creation"""
+    batch_id: str = Field(description="ID to poll at /zone-partners/batch/{batch_id}")
+    accepted: int = Field(description="Number of payloads accepted for creation")
+    invalid: int = Field(description="Number of payloads rejected by validation")
+    items: List[BatchItemResult]
+
+
+class BatchStatusResponse(BaseModel):
+    """Response model for batch progress"""
+    batch_id: str
+    state: str = Field(description="running until every accepted creation has finished, then completed")
+    created_at: str
+    finished_at: Optional[str] = None
+    total: int = Field(description="Number of payloads in the batch")
+    progress: Dict[str, int] = Field(description="Number of items per job_state")
+    items: List[BatchItemResult]
+
+
+class PlanFinding(BaseModel):
+    """Validation finding of a plan"""
+    severity: str = Field(description="error, which blocks applying the plan, or warning")
+    field: str = Field(description="Variable the finding is about")
+    message: str
+
+
+class PipelineRequest(BaseModel):
+    """Pipeline an operation triggers and its parameters"""
+    pipeline: Optional[str] = Field(None, description="Jenkins pipeline name")
+    parameters: Dict[str, Any]
+
+
+class PlanResponse(BaseModel):
+    """Response model for a zone partner creation plan"""
+    id: str = Field(description="sha256 of the inputs the plan was computed from")
+    partner_id: str
+    cloud: str
+    created_at: str
+    pipelines: Dict[str, PipelineRequest] = Field(description="Pipeline request of each operation, by operation")
+    findings: List[PlanFinding]
@@ -1,57 +1,20 @@
 import os
-import threading
-import time
-from typing import Tuple
 
 from fastapi import HTTPException
 
 from app.core.logging import setup_logger
 from app.core.config import log_level, config
-from app.core.constants import USE_ASSUMED_ROLES
+from app.core.constants import USE_ASSUMED_ROLES, AWS_CREDENTIALS_TTL
+from app.core.credentials import AWS_CREDENTIAL_VARIABLES, credential_environment, shared_credentials
 from app.schemas.auth import AWSCredentialsPayload
 
 logger = setup_logger(__name__, log_level)
 
 
 class AWSCredentialsService:
-    def __init__(self):
-        self._credentials_thread = None
-
-    @staticmethod
-    def _expire_aws_credentials(expiration_time: int = 7200) -> None:
-        """
-        Expire AWS credentials after specified time
-
-        Args:
-            expiration_time: Time in seconds after which credentials expire (default 2 hours)
-        """
-        time.sleep(expiration_time)
-        os.environ.pop("AWS_ACCESS_KEY_ID", None)
-        os.environ.pop("AWS_SECRET_ACCESS_KEY", None)
-        os.environ.pop("AWS_SESSION_TOKEN", None)
-        logger.info("AWS credentials expired and removed from environment")
-
-    def _start_expiration_thread(self, expiration_time: int = 7200) -> threading.Thread:
-        """
-        Start a thread to handle credential expiration
-
-        Args:
-            expiration_time: Time in seconds after which credentials expire
-
-        Returns:
-            threading.Thread: The started expiration thread
-        """
-        thread = threading.Thread(
-            target=self._expire_aws_credentials,
-            args=(expiration_time,),
-            daemon=True
-        )
-        thread.start()
-        return thread
-
     def set_credentials(self, credentials: AWSCredentialsPayload) -> str:
         """
-        Set AWS credentials in environment variables
+        Share AWS credentials with every worker process until they expire
 
         Args:
             credentials: AWS credentials model
@@ -70,14 +33,14 @@ class AWSCredentialsService:
             )
 
         try:
-            os.environ["AWS_ACCESS_KEY_ID"] = credentials.aws_access_key_id
-            os.environ["AWS_SECRET_ACCESS_KEY"] = credentials.aws_secret_access_key
-            os.environ["AWS_SESSION_TOKEN"] = credentials.aws_session_token
-
-            logger.info(f"AWS credentials set successfully {credentials.aws_session_token}")
+            shared_credentials.set(
+                credentials.aws_access_key_id,
+                credentials.aws_secret_access_key,
+                credentials.aws_session_token,
+                AWS_CREDENTIALS_TTL,
+            )
 
-            # Start expiration thread
-            self._credentials_thread = self._start_expiration_thread()
+            logger.info("AWS credentials set successfully")
 
             return "AWS credentials set successfully"
 
@@ -91,16 +54,13 @@ class AWSCredentialsService:
     @staticmethod
     def check_aws_credentials() -> None:
         """
-        Check if AWS credentials are set in environment
+        Check if AWS credentials are set, either shared or in the environment
 
         Raises:
             HTTPException: If AWS credentials are not set
         """
-        if (
-                not os.environ.get("AWS_ACCESS_KEY_ID")
-                or not os.environ.get("AWS_SECRET_ACCESS_KEY")
-                or not os.environ.get("AWS_SESSION_TOKEN")
-        ):
+        environment = credential_environment()
+        if not all(environment.get(name) or os.environ.get(name) for name in AWS_CREDENTIAL_VARIABLES):
             raise HTTPException(
                 status_code=400,
                 detail="AWS credentials not set"
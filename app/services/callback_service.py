@@ -0,0 +1,83 @@
+from fastapi import HTTPException
+
+from app.core.logging import setup_logger
+from app.core.config import log_level
+from app.core.builds import BUILD_SUCCESS, build_outcome, build_tracker
+from app.core.executors import run_blocking
+from app.core.fs_utils import load_zone_partner_json, update_status_fields
+from app.models import DeployMLWorkbench
+from app.schemas.callbacks import PipelineCallbackResponse
+from app.services.job_service import JobService
+
+logger = setup_logger(__name__, log_level)
+
+# Terraform outputs in the callback payload and the status fields they are recorded as.
+OUTPUT_STATUS_FIELDS = {
+    "eks_cluster_name": "cluster_name",
+    "sftp_bucket_name_dev": "s3_sftp_bucket_dev",
+    "sftp_bucket_name_production": "s3_sftp_bucket_production",
+    "sftp_bucket_name_staging": "s3_sftp_bucket_staging",
+    "metadata_bucket_name_dev": "s3_metadata_bucket_dev",
+    "metadata_bucket_name_production": "s3_metadata_bucket_production",
+    "metadata_bucket_name_staging": "s3_metadata_bucket_staging",
+    "dynamotable_dev": "dynamotable_dev",
+    "dynamotable_production": "dynamotable_production",
+    "dynamotable_staging": "dynamotable_staging",
+}
+
+
+class CallbackService:
+    @staticmethod
+    async def pipeline_completed(payload: DeployMLWorkbench) -> PipelineCallbackResponse:
+        """
+        Record the result and Terraform outputs of a creation pipeline, and start the ML Workbench deployment
+
+        Args:
+            payload: Completion payload posted by the pipeline
+
+        Returns:
+            PipelineCallbackResponse: The recorded result and the deployment job, if one was started
+
+        Raises:
+            HTTPException: 404 if the partner does not exist, or as raised by ``JobService.submit_job``
+        """
+        partner_id = payload.partner_id
+        zone_partner = await run_blocking("io", load_zone_partner_json, partner_id)
+        if zone_partner is None:
+            raise HTTPException(status_code=404, detail=f"No Zone Partner found with id: {partner_id}")
+
+        result = payload.jenkins_job_status.upper()
+        build_number = int(payload.jenkins_job_id) if payload.jenkins_job_id.isdigit() else None
+        fields = build_outcome("create", result)
+        if build_number is not None:
+            fields["Pipeline_Build"] = build_number
+        if result == BUILD_SUCCESS:
+            # Only the outputs the pipeline actually sent; the model's defaults are placeholders.
+            sent = payload.model_dump(exclude_unset=True)
+            fields.update({
+                status_field: sent[output] for output, status_field in OUTPUT_STATUS_FIELDS.items() if output in sent
+            })
+            fields["MLWorkbench"] = "Queued"
+        await run_blocking("io", update_status_fields, partner_id, fields)
+        # The result is in; the build tracker can stop polling for it.
+        await run_blocking("io", build_tracker.resolve, partner_id, "create", build_number, result)
+        logger.info(f"Creation pipeline for partner_id {partner_id} reported {result}")
+
+        if result != BUILD_SUCCESS:
+            return PipelineCallbackResponse(
+                message=f"Creation pipeline failed for partner_id: {partner_id}", result=result
+            )
+
+        job, created = await JobService.submit_job(
+            "deploy_ml_workbench",
+            payload.model_dump(mode="json"),
+            partner_id,
+            # Jenkins may deliver the callback more than once; each build starts one deployment.
+            idempotency_key=f"pipeline-callback:{partner_id}:{payload.jenkins_job_id}",
+        )
+        return PipelineCallbackResponse(
+            message=f"ML Workbench deployment started for partner_id: {partner_id}",
+            result=result,
+            job_id=job["id"],
+            duplicate=not created,
+        )
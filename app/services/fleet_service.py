@@ -0,0 +1,114 @@
+from fastapi import HTTPException
+
+from app.core.logging import setup_logger
+from app.core.config import log_level
+from app.core.executors import run_blocking
+from app.core.fleet import FINAL_ITEM_STATES, fleet_manager
+from app.core.jobs import JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, job_queue
+from app.schemas.fleet import FleetOperationRequest, FleetOperationResponse, FleetWaveItem, FleetWaveProgress
+
+logger = setup_logger(__name__, log_level)
+
+
+class FleetService:
+    @staticmethod
+    def _response(fleet_op: dict) -> FleetOperationResponse:
+        waves = []
+        for wave in fleet_op["waves"]:
+            items = []
+            progress = {}
+            for item in wave["items"]:
+                state = item["state"]
+                if state not in FINAL_ITEM_STATES:
+                    job = job_queue.get(item["job_id"]) if item["job_id"] else None
+                    state = job["state"] if job is not None else "pending"
+                    if state == JOB_SUCCEEDED:
+                        # The job only triggered the pipeline, which is still running.
+                        state = JOB_RUNNING
+                progress[state] = progress.get(state, 0) + 1
+                items.append(FleetWaveItem(**{**item, "state": state}))
+            waves.append(FleetWaveProgress(
+                index=wave["index"],
+                state=wave["state"],
+                progress=progress,
+                error_rate=progress.get(JOB_FAILED, 0) / len(items) if items else 0.0,
+                items=items,
+            ))
+        return FleetOperationResponse(
+            **{key: value for key, value in fleet_op.items() if key != "waves"},
+            total=sum(len(wave["items"]) for wave in fleet_op["waves"]),
+            waves=waves,
+        )
+
+    @staticmethod
+    def _get(operation_id: str) -> dict:
+        fleet_op = fleet_manager.get(operation_id)
+        if fleet_op is None:
+            raise HTTPException(status_code=404, detail=f"Fleet operation not found for id: {operation_id}")
+        return fleet_op
+
+    @staticmethod
+    def start_operation(request: FleetOperationRequest) -> FleetOperationResponse:
+        """
+        Select partners by filter and start running the operation on them in waves
+
+        Args:
+            request: Operation, partner filters and wave settings
+
+        Returns:
+            FleetOperationResponse: The new operation and its waves
+
+        Raises:
+            HTTPException: 400 if a fleet-wide delete is requested without any filter
+        """
+        filters = request.filters.model_dump(exclude_none=True)
+        if request.operation == "delete" and not filters:
+            raise HTTPException(status_code=400, detail="A fleet delete requires at least one filter")
+        fleet_op = fleet_manager.create(
+            request.operation,
+            filters,
+            request.wave_size,
+            request.concurrency,
+            request.error_threshold,
+            request.on_threshold,
+        )
+        return FleetService._response(fleet_op)
+
+    @staticmethod
+    def get_operation(operation_id: str) -> FleetOperationResponse:
+        """
+        Get the progress of a fleet operation, per wave
+
+        Args:
+            operation_id: The ID of the fleet operation
+
+        Returns:
+            FleetOperationResponse: Operation state and per-wave progress
+
+        Raises:
+            HTTPException: 404 if the operation does not exist
+        """
+        return FleetService._response(FleetService._get(operation_id))
+
+    @staticmethod
+    async def pause_operation(operation_id: str) -> FleetOperationResponse:
+        await run_blocking("io", FleetService._get, operation_id)
+        return await run_blocking("io", FleetService._response, await fleet_manager.pause(operation_id))
+
+    @staticmethod
+    async def abort_operation(operation_id: str) -> FleetOperationResponse:
+        await run_blocking("io", FleetService._get, operation_id)
+        return await run_blocking("io", FleetService._response, await fleet_manager.abort(operation_id))
+
+    @staticmethod
+    async def resume_operation(operation_id: str) -> FleetOperationResponse:
+        """
+        Resume a paused fleet operation
+
+        Raises:
+            HTTPException: 404 if the operation does not exist, 409 if it is not paused
+        """
+        fleet_op = await run_blocking("io", FleetService._get, operation_id)
+        if fleet_op["state"] != "paused":
+            raise HTTPException(status_code=409, detail=f"Fleet operation is {fleet_op['state']}, not paused")
+        return await run_blocking("io", FleetService._response, await fleet_manager.resume(operation_id))
@@ -0,0 +1,97 @@
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+from app.core.logging import setup_logger
+from app.core.config import log_level
+from app.core.jobs import IdempotencyKeyReused, JobConflict, JobQueueFull, job_queue
+from app.models import DeployMLWorkbench, ZonePartner
+from app.schemas.jobs import JobQueueStatsResponse, JobResponse
+from app.svc import (
+    create_zone_partner_service,
+    delete_zone_partner_service,
+    redeploy_zone_partner_service,
+    deploy_ml_workbench_service,
+)
+
+logger = setup_logger(__name__, log_level)
+
+# Seconds a client is asked to wait before resubmitting when the queue is full.
+QUEUE_FULL_RETRY_AFTER = 30
+
+# Job kinds and the service functions that run them, rebuilt from the job's JSON parameters.
+JOB_HANDLERS = {
+    "create_zone_partner": lambda params: create_zone_partner_service(ZonePartner(**params)),
+    "delete_zone_partner": lambda params: delete_zone_partner_service(params["partner_id"]),
+    "redeploy_zone_partner": lambda params: redeploy_zone_partner_service(params["partner_id"]),
+    "deploy_ml_workbench": lambda params: deploy_ml_workbench_service(DeployMLWorkbench(**params)),
+}
+
+for _kind, _handler in JOB_HANDLERS.items():
+    job_queue.register(_kind, _handler)
+
+
+class JobService:
+    @staticmethod
+    async def submit_job(
+        kind: str, params: dict, partner_id: Optional[str] = None, idempotency_key: Optional[str] = None
+    ) -> Tuple[dict, bool]:
+        """
+        Queue a job for the worker pool, or return the existing job for a duplicate request
+
+        Args:
+            kind: Registered job kind
+            params: JSON-serialisable parameters for the job handler
+            partner_id: The ID of the partner zone the job acts on
+            idempotency_key: Value of the request's Idempotency-Key header
+
+        Returns:
+            Tuple[dict, bool]: The job record, and whether this request created it
+
+        Raises:
+            HTTPException: 409 if another operation holds the partner,
+                422 if the Idempotency-Key was used for a different request,
+                503 with Retry-After if the job queue is full or the service is shutting down
+        """
+        try:
+            return await job_queue.submit(kind, params, partner_id, idempotency_key)
+        except JobConflict as e:
+            logger.warning(f"Rejected {kind} job: {str(e)}")
+            raise HTTPException(status_code=409, detail=str(e))
+        except IdempotencyKeyReused as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except JobQueueFull as e:
+            logger.warning(f"Rejected {kind} job for partner_id {partner_id}: {str(e)}")
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(QUEUE_FULL_RETRY_AFTER)},
+            )
+
+    @staticmethod
+    def get_job(job_id: str) -> JobResponse:
+        """
+        Get a job by ID
+
+        Args:
+            job_id: The ID of the job
+
+        Returns:
+            JobResponse: The job's current state
+
+        Raises:
+            HTTPException: 404 if the job does not exist
+        """
+        job = job_queue.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job not found for job_id: {job_id}")
+        return JobResponse(**job)
+
+    @staticmethod
+    def get_stats() -> JobQueueStatsResponse:
+        """
+        Get queue depth, running jobs and wait times per account and region
+
+        Returns:
+            JobQueueStatsResponse: Job queue statistics
+        """
+        return JobQueueStatsResponse(**job_queue.stats())
@@ -1,15 +1,123 @@
-from typing import Optional
-from fastapi import HTTPException
+import json
+import time
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional, Tuple
+from fastapi import HTTPException, Request
 
 from app.core.logging import setup_logger
 from app.core.config import log_level
+from app.core.build_logs import pipeline_logs
 from app.core.fs_utils import load_status_json
-from app.schemas.status import StatusResponse
+from app.core.state_store import PARTNER_FILTER_FIELDS, get_state_store
+from app.core.constants import STATUS_STREAM_HEARTBEAT, WEB_WORKERS
+from app.core.executors import run_blocking
+from app.core.status_broker import status_broker
+from app.core.status_cache import status_cache
+from app.core.status_summary import status_summary
+from app.core.status_writer import status_writer
+from app.schemas.status import BulkStatusRequest, BulkStatusResponse, StatusResponse, StatusSummaryResponse
 
 logger = setup_logger(__name__, log_level)
 
 
 class StatusService:
+    @staticmethod
+    def _load_status_response(partner_id: str) -> Optional[StatusResponse]:
+        """
+        Load the parsed status of a partner zone, using the status cache
+
+        Parsed responses are served from the in-process status cache as long as
+        the state store still reports the version they were loaded at. Updates
+        that the status writer has not flushed yet bypass the cache.
+
+        Args:
+            partner_id: The ID of the partner zone
+
+        Returns:
+            Optional[StatusResponse]: Status information, or None if no status exists
+
+        Raises:
+            ValueError: If the stored status cannot be parsed
+        """
+        token = None
+        data = status_writer.get_pending(partner_id)
+        if data is None:
+            token = get_state_store().status_version(partner_id)
+            if token is None:
+                return None
+            cached = status_cache.get(partner_id, token)
+            if cached is not None:
+                return cached
+            data = load_status_json(partner_id)
+            if data is None:
+                return None
+
+        response = StatusResponse(**data)
+        if token is not None:
+            status_cache.put(partner_id, token, response)
+        if response.Version is not None:
+            status_cache.set_version(partner_id, response.Version)
+        return response
+
+    @staticmethod
+    def known_version(partner_id: str) -> Optional[int]:
+        """
+        Version of the partner's latest status as known in memory, without touching the store
+
+        Answers from unflushed writer state, or from the version the status cache
+        last saw. The latter is only trusted with a single worker process: with
+        several, another process may have written a newer version.
+
+        Args:
+            partner_id: The ID of the partner zone
+
+        Returns:
+            Optional[int]: Current status version, or None if it is not known in memory
+        """
+        version = status_writer.pending_version(partner_id)
+        if version is not None:
+            return version
+        if WEB_WORKERS == 1:
+            return status_cache.version(partner_id)
+        return None
+
+    @staticmethod
+    def current_version(partner_id: str) -> Optional[int]:
+        """
+        Version of the partner's latest status without reading or parsing the record
+
+        Answers from memory (see ``known_version``) or from a cache entry that is
+        still valid for the store's version token; returns None when neither is available.
+
+        Args:
+            partner_id: The ID of the partner zone
+
+        Returns:
+            Optional[int]: Current status version, if known
+        """
+        version = StatusService.known_version(partner_id)
+        if version is not None:
+            return version
+        token = get_state_store().status_version(partner_id)
+        if token is None:
+            return None
+        cached = status_cache.get(partner_id, token)
+        return cached.Version if cached is not None else None
+
+    @staticmethod
+    def etag(version: Optional[int]) -> Optional[str]:
+        return f'"{version}"' if version is not None else None
+
+    @staticmethod
+    def etag_matches(if_none_match: str, etag: Optional[str]) -> bool:
+        if etag is None:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return any(
+            candidate == "*" or candidate.removeprefix("W/") == etag
+            for candidate in candidates
+        )
+
     @staticmethod
     def get_status(partner_id: str) -> StatusResponse:
         """
@@ -24,18 +132,208 @@ class StatusService:
         Raises:
             HTTPException: If status file not found
         """
-        data = load_status_json(partner_id)
-        if data is None:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No status file found for partner_id: {partner_id}"
-            )
-
         try:
-            return StatusResponse(**data)
+            response = StatusService._load_status_response(partner_id)
         except Exception as e:
             logger.error(f"Error parsing status data: {str(e)}")
             raise HTTPException(
                 status_code=500,
                 detail="Error processing status data"
-            )
\ No newline at end of file
+            )
+
+        if response is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No status file found for partner_id: {partner_id}"
+            )
+        return response
+
+    @staticmethod
+    async def wait_for_status(partner_id: str, version: int, timeout: float) -> StatusResponse:
+        """
+        Long-poll for a status change
+
+        Returns immediately when the current status version differs from the
+        version the client already has, otherwise as soon as the status writer
+        publishes a change or the timeout expires.
+
+        Args:
+            partner_id: The ID of the partner zone
+            version: Status version the client already has
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            StatusResponse: The current status information
+
+        Raises:
+            HTTPException: If no status exists once the wait is over
+        """
+        # Changes written by another worker process are not published here, so the
+        # version is also re-read every STATUS_STREAM_HEARTBEAT seconds.
+        deadline = time.monotonic() + timeout
+        while True:
+            # Subscribed before the read, so a change published in between still ends the wait.
+            subscription = status_broker.subscribe(partner_id)
+            try:
+                try:
+                    current = await run_blocking("io", StatusService._load_status_response, partner_id)
+                except Exception:
+                    current = None
+                remaining = deadline - time.monotonic()
+                if (current is not None and current.Version != version) or remaining <= 0:
+                    break
+                changed = await status_broker.wait(
+                    partner_id, min(remaining, STATUS_STREAM_HEARTBEAT), subscription
+                )
+                if changed is not None:
+                    break
+            finally:
+                status_broker.unsubscribe(partner_id, subscription)
+        return await run_blocking("io", StatusService.get_status, partner_id)
+
+    @staticmethod
+    async def stream_status(
+        partner_id: str, request: Request, last_event_id: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Server-Sent Events stream of status changes
+
+        Emits the current status (unless the client already has it, per
+        Last-Event-ID) and then one event per published change. Comment lines
+        are sent as heartbeats while nothing changes.
+
+        Args:
+            partner_id: The ID of the partner zone
+            request: Incoming request, used to detect client disconnects
+            last_event_id: Status version the client received last
+
+        Returns:
+            AsyncIterator[str]: SSE formatted messages
+        """
+        sent_version = last_event_id
+        while not await request.is_disconnected():
+            # Subscribed before the read, so a change published in between is streamed right away.
+            subscription = status_broker.subscribe(partner_id)
+            try:
+                try:
+                    # The store read may be a network round trip (S3), so keep it off the event loop.
+                    response = await run_blocking("io", StatusService._load_status_response, partner_id)
+                except Exception as e:
+                    logger.error(f"Error parsing status data: {str(e)}")
+                    response = None
+                if response is not None and response.Version != sent_version:
+                    sent_version = response.Version
+                    yield f"event: status\nid: {response.Version}\ndata: {response.model_dump_json()}\n\n"
+                if await status_broker.wait(partner_id, STATUS_STREAM_HEARTBEAT, subscription) is None:
+                    yield ": keep-alive\n\n"
+            finally:
+                status_broker.unsubscribe(partner_id, subscription)
+
+    @staticmethod
+    def get_summary() -> StatusSummaryResponse:
+        """
+        Get fleet-wide partner counts by Terraform state, MLWorkbench state and region
+
+        Returns:
+            StatusSummaryResponse: Counters maintained incrementally by update_status
+        """
+        return StatusSummaryResponse(**status_summary.snapshot())
+
+    @staticmethod
+    def get_bulk_status(request: BulkStatusRequest) -> BulkStatusResponse:
+        """
+        Get the status of many partner zones in one call
+
+        Partners are either listed explicitly or selected through the zone
+        partner indexes using the request filters, one page at a time.
+
+        Args:
+            request: Partner selection, field projection and pagination
+
+        Returns:
+            BulkStatusResponse: Status per partner ID and the cursor of the next page
+
+        Raises:
+            HTTPException: If unknown fields are requested
+        """
+        fields = set(request.fields) if request.fields else None
+        if fields:
+            unknown = fields - set(StatusResponse.model_fields)
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown status fields: {', '.join(sorted(unknown))}"
+                )
+
+        next_cursor = None
+        if request.partner_ids is not None:
+            partner_ids = request.partner_ids
+        else:
+            filters = {
+                field: getattr(request, field)
+                for field in PARTNER_FILTER_FIELDS
+                if getattr(request, field) is not None
+            }
+            rows = get_state_store().query_zone_partners(filters, request.cursor, request.limit + 1)
+            partner_ids = [row["partner_id"] for row in rows[:request.limit]]
+            if len(rows) > request.limit:
+                next_cursor = partner_ids[-1]
+
+        items = {}
+        for partner_id in partner_ids:
+            try:
+                response = StatusService._load_status_response(partner_id)
+            except Exception as e:
+                logger.error(f"Error parsing status data for partner_id {partner_id}: {str(e)}")
+                response = None
+            items[partner_id] = response.model_dump(include=fields) if response is not None else None
+
+        return BulkStatusResponse(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def iter_status_history(
+        partner_id: str, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Iterator[str]:
+        """
+        Stream the status journal of a partner zone as newline-delimited JSON
+
+        Args:
+            partner_id: The ID of the partner zone
+            since: Only include events at or after this time
+            until: Only include events at or before this time
+
+        Returns:
+            Iterator[str]: One JSON encoded event per line
+        """
+        events = get_state_store().iter_status_events(
+            partner_id,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+        )
+        for event in events:
+            yield json.dumps(event) + "\n"
+
+    @staticmethod
+    def get_pipeline_log(
+        partner_id: str, offset: Optional[int] = None, tail: Optional[int] = None
+    ) -> Tuple[bytes, int, int]:
+        """
+        Read the console output of a partner zone's pipelines
+
+        Args:
+            partner_id: The ID of the partner zone
+            offset: Return the bytes from this offset on
+            tail: Return the last ``tail`` bytes instead
+
+        Returns:
+            Tuple[bytes, int, int]: The bytes, the offset they start at and the current size of the log
+
+        Raises:
+            HTTPException: 400 if both offset and tail are given, 404 if the partner has no pipeline log
+        """
+        if offset is not None and tail is not None:
+            raise HTTPException(status_code=400, detail="Pass either offset or tail, not both")
+        result = pipeline_logs.read(partner_id, offset=offset, tail=tail)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"No pipeline log found for partner_id: {partner_id}")
+        return result
@@ -0,0 +1,141 @@
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+
+from app.core.logging import setup_logger
+from app.core.config import log_level
+from app.core.batches import ITEM_INVALID, batch_manager
+from app.core.constants import BATCH_FANOUT
+from app.core.jobs import job_queue
+from app.core.plans import plan_cache
+from app.core.state_store import PARTNER_INDEX_FIELDS, get_state_store
+from app.schemas.zone_partner import (
+    BatchCreateRequest,
+    BatchCreateResponse,
+    BatchItemResult,
+    BatchStatusResponse,
+    PlanResponse,
+    ZonePartnerListResponse,
+)
+
+logger = setup_logger(__name__, log_level)
+
+
+class ZonePartnerService:
+    @staticmethod
+    def list_zone_partners(
+        filters: Dict[str, str],
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> ZonePartnerListResponse:
+        """
+        List zone partners from the state store's partner indexes
+
+        Args:
+            filters: Exact-match filters keyed by index field
+            fields: Index fields to return; all when omitted
+            cursor: partner_id after which the page starts
+            limit: Maximum number of partners to return
+
+        Returns:
+            ZonePartnerListResponse: One page of partners and the cursor of the next page
+
+        Raises:
+            HTTPException: If unknown fields are requested
+        """
+        if fields:
+            unknown = set(fields) - set(PARTNER_INDEX_FIELDS)
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown zone partner fields: {', '.join(sorted(unknown))}"
+                )
+
+        rows = get_state_store().query_zone_partners(filters, cursor, limit + 1)
+        next_cursor = rows[limit - 1]["partner_id"] if len(rows) > limit else None
+        rows = rows[:limit]
+        if fields:
+            rows = [{field: row[field] for field in fields} for row in rows]
+        return ZonePartnerListResponse(items=rows, next_cursor=next_cursor)
+
+    @staticmethod
+    def create_batch(request: BatchCreateRequest) -> BatchCreateResponse:
+        """
+        Validate a batch of zone partner payloads and queue the valid ones for creation
+
+        Args:
+            request: Payloads and optional fan-out limit
+
+        Returns:
+            BatchCreateResponse: Batch ID and the validation result of every payload
+        """
+        batch = batch_manager.create(request.items, request.fanout or BATCH_FANOUT)
+        items = [BatchItemResult(**item) for item in batch["items"]]
+        invalid = sum(item.status == ITEM_INVALID for item in items)
+        return BatchCreateResponse(
+            batch_id=batch["id"], accepted=len(items) - invalid, invalid=invalid, items=items
+        )
+
+    @staticmethod
+    def get_batch(batch_id: str) -> BatchStatusResponse:
+        """
+        Get the aggregate progress of a batch creation
+
+        Args:
+            batch_id: The ID returned when the batch was submitted
+
+        Returns:
+            BatchStatusResponse: Item counts per job state and the state of every item
+
+        Raises:
+            HTTPException: 404 if the batch does not exist
+        """
+        batch = batch_manager.get(batch_id)
+        if batch is None:
+            raise HTTPException(status_code=404, detail=f"Batch not found for batch_id: {batch_id}")
+
+        items = []
+        progress: Dict[str, int] = {}
+        for item in batch["items"]:
+            if item["status"] == ITEM_INVALID:
+                job_state = ITEM_INVALID
+            elif item["error"] is not None:
+                job_state = "failed"
+            elif item["job_id"] is None:
+                job_state = "pending"
+            else:
+                job = job_queue.get(item["job_id"])
+                job_state = job["state"] if job is not None else "unknown"
+                if job is not None and job["error"]:
+                    item = {**item, "error": job["error"]}
+            progress[job_state] = progress.get(job_state, 0) + 1
+            items.append(BatchItemResult(**item, job_state=job_state))
+
+        return BatchStatusResponse(
+            batch_id=batch["id"],
+            state=batch["state"],
+            created_at=batch["created_at"],
+            finished_at=batch["finished_at"],
+            total=len(items),
+            progress=progress,
+            items=items,
+        )
+
+    @staticmethod
+    def get_plan(plan_id: str) -> PlanResponse:
+        """
+        Get a stored zone partner creation plan
+
+        Args:
+            plan_id: The plan ID, as recorded in the partner's status and the creation job's result
+
+        Returns:
+            PlanResponse: Pipeline requests and validation findings of the plan
+
+        Raises:
+            HTTPException: 404 if the plan does not exist or has been pruned
+        """
+        plan = plan_cache.get(plan_id)
+        if plan is None:
+            raise HTTPException(status_code=404, detail=f"Plan not found for plan_id: {plan_id}")
+        return PlanResponse(**plan)
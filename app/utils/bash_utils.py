@@ -1,11 +1,12 @@
 import os
 import logging
 import subprocess
+from app.core.credentials import subprocess_environment
 
 logger = logging.getLogger(__name__)
 
 
-def execute_bash(script_name, *args):
+def execute_bash(script_name, *args, env=None):
     project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     script_path = os.path.join(project_root, "scripts", script_name)
 
@@ -14,9 +15,11 @@ def execute_bash(script_name, *args):
         return -1
 
     command = ["/bin/bash", script_path] + list(args)
+    # Scripts call the AWS CLI, so they get the current job's credentials explicitly.
+    env = env if env is not None else subprocess_environment()
 
     try:
-        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as process:
+        with subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env) as process:
             stdout, stderr = process.communicate()
             if stdout:
                 logger.info(f"Script Output: {stdout.strip()}")
@@ -1,25 +1,132 @@
+import hashlib
+import json
 import logging
+import threading
 import time
 import os
+from collections import OrderedDict
+from typing import Dict, Tuple
+import yaml
 from kubernetes import config, client
 from kubernetes.client.rest import ApiException
+from app.core.constants import KUBE_CLIENT_POOL_SIZE, KUBE_CLIENT_TTL
+from app.core.credentials import credential_environment
+from app.core.interrupts import interruptible_sleep
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
 
-def load_kube_config(config_file):
-    if os.path.exists(config_file):
-        config.load_kube_config(config_file=config_file)
-    else:
-        config.load_kube_config(os.path.expanduser("~/.kube/config"))
+def _kube_config_path(config_file) -> str:
+    if not os.path.exists(config_file):
+        config_file = os.path.expanduser("~/.kube/config")
+    return os.path.abspath(config_file)
+
+
+def _new_api_client(config_file: str, environment: Dict[str, str]) -> client.ApiClient:
+    with open(config_file, 'r') as f:
+        kube_config = yaml.safe_load(f)
+    # The exec plugin (aws eks get-token) authenticates with the credentials in its
+    # environment; give it the current job's rather than whatever os.environ holds.
+    credentials = [{"name": name, "value": value} for name, value in environment.items()]
+    if credentials:
+        for user in kube_config.get("users") or []:
+            exec_config = (user.get("user") or {}).get("exec")
+            if exec_config is not None:
+                exec_config["env"] = [*(exec_config.get("env") or []), *credentials]
+    # A client of its own, rather than the global default configuration that
+    # load_kube_config sets, so partners handled at once never share one.
+    return config.new_client_from_config_dict(
+        kube_config, persist_config=False, temp_file_path=os.path.dirname(config_file)
+    )
+
+
+class KubeClientPool:
+    """
+    Kubernetes ApiClients per kubeconfig, shared by every thread of the process.
+
+    A client is built the first time a kubeconfig is used with a given set of
+    AWS credentials, and reused (with its connection pool) until it is older
+    than ``ttl``, the kubeconfig file changes, or a request through it is
+    rejected with 401; the exec plugin then runs again with the current
+    credentials. At most ``max_size`` clients are kept, least recently used
+    evicted first.
+    """
+
+    def __init__(self, max_size: int = KUBE_CLIENT_POOL_SIZE, ttl: float = KUBE_CLIENT_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clients: "OrderedDict[Tuple[str, str], Tuple[client.ApiClient, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "reused": 0, "refreshed": 0, "evicted": 0}
+        metrics.register_collector("kube_clients", self.stats)
+
+    def _fresh(self, entry, mtime: float) -> bool:
+        return entry[2] == mtime and time.monotonic() - entry[1] < self.ttl
+
+    def get(self, config_file) -> client.ApiClient:
+        path = _kube_config_path(config_file)
+        environment = credential_environment()
+        key = (path, hashlib.sha256(json.dumps(environment, sort_keys=True).encode()).hexdigest())
+        mtime = os.stat(path).st_mtime
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and self._fresh(entry, mtime):
+                self._clients.move_to_end(key)
+                self._stats["reused"] += 1
+                return entry[0]
+        # Built outside the lock: parsing the kubeconfig and running the exec plugin take a while.
+        api_client = _new_api_client(path, environment)
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None and self._fresh(entry, mtime):
+                # Another thread built one meanwhile; keep a single client per key.
+                api_client.close()
+                return entry[0]
+            if entry is not None:
+                entry[0].close()
+                self._stats["refreshed"] += 1
+            self._clients[key] = (api_client, time.monotonic(), mtime)
+            self._clients.move_to_end(key)
+            self._stats["created"] += 1
+            while len(self._clients) > self.max_size:
+                _, (evicted, _, _) = self._clients.popitem(last=False)
+                evicted.close()
+                self._stats["evicted"] += 1
+        return api_client
+
+    def invalidate(self, config_file) -> None:
+        """Drop every client of a kubeconfig, so the next request authenticates afresh."""
+        path = _kube_config_path(config_file)
+        with self._lock:
+            for key in [key for key in self._clients if key[0] == path]:
+                self._clients.pop(key)[0].close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._clients)}
+
+
+kube_clients = KubeClientPool()
+
+
+def core_v1_api(kube_config_out) -> client.CoreV1Api:
+    return client.CoreV1Api(kube_clients.get(kube_config_out))
+
+
+def _check_unauthorized(kube_config_out, error: Exception) -> None:
+    # Expired exec credentials show up as 401; the next attempt gets a freshly authenticated client.
+    if isinstance(error, ApiException) and error.status == 401:
+        kube_clients.invalidate(kube_config_out)
 
 
 def wait_for_pod_initialization(kube_config_out, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
+    # Resolve the client up front so a bad kubeconfig fails fast instead of retrying until the timeout.
+    core_v1_api(kube_config_out)
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             pods = v1.list_pod_for_all_namespaces(watch=False)
             pods_ready = all(
                 pod.status.phase == "Running" and all(cs.ready for cs in (pod.status.container_statuses or []))
@@ -29,20 +136,21 @@ def wait_for_pod_initialization(kube_config_out, timeout=300):
                 logger.info("All pods are ready.")
                 return True
             logger.info("Waiting for pods to be ready...")
-            time.sleep(10)
+            interruptible_sleep(10)
         except Exception as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while checking pods: {e}")
+            interruptible_sleep(10)
     else:
         logger.error("Timeout waiting for pods to initialize.")
         return False
 
 
 def return_lb_dns_name(kube_config_out, service_name, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             services = v1.list_service_for_all_namespaces(watch=False)
             for service in services.items:
                 if service.metadata.name == service_name and service.status.load_balancer:
@@ -51,8 +159,9 @@ def return_lb_dns_name(kube_config_out, service_name, timeout=300):
                         logger.info(f"LoadBalancer hostname found for service '{service_name}': {hostname}")
                         return hostname
             logger.info(f"Waiting for LoadBalancer IP for service '{service_name}'...")
-            time.sleep(10)
+            interruptible_sleep(10)
         except Exception as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while retrieving service IP: {e}")
             return None
     else:
@@ -61,47 +170,48 @@ def return_lb_dns_name(kube_config_out, service_name, timeout=300):
 
 
 def update_configmap(kube_config_out, namespace, configmap_name, new_data, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             current_configmap = v1.read_namespaced_config_map(configmap_name, namespace)
             current_configmap.data = {'authorized_keys': new_data}
             v1.replace_namespaced_config_map(configmap_name, namespace, current_configmap)
             logger.info(f"ConfigMap {configmap_name} updated successfully.")
             return True
         except ApiException as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while updating the configmap: {e}")
-            time.sleep(10)
+            interruptible_sleep(10)
     else:
         logger.error(f"Timeout waiting for the configmap {configmap_name} to be updated.")
         return False
 
 
 def force_delete_pod(kube_config_out, namespace, label_selector, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             v1.delete_collection_namespaced_pod(namespace, label_selector=label_selector, grace_period_seconds=0)
             logger.info(f"Pods with label selector {label_selector} deleted successfully.")
             return True
         except ApiException as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while deleting the pod: {e}")
-            time.sleep(10)
+            interruptible_sleep(10)
     else:
         logger.error(f"Timeout waiting for the pods with label selector {label_selector} to be deleted.")
         return False
 
 
 def wait_for_pod_ready(kube_config_out, namespace, label_selector, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
+    # Resolve the client up front so a bad kubeconfig fails fast instead of retrying until the timeout.
+    core_v1_api(kube_config_out)
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             pods = v1.list_namespaced_pod(namespace, label_selector=label_selector)
             pods_ready = all(
                 pod.status.phase == "Running" and all(cs.ready for cs in (pod.status.container_statuses or []))
@@ -111,28 +221,30 @@ def wait_for_pod_ready(kube_config_out, namespace, label_selector, timeout=300):
                 logger.info(f"All pods with label selector {label_selector} are ready.")
                 return True
             logger.info(f"Waiting for pods with label selector {label_selector} to be ready...")
-            time.sleep(10)
+            interruptible_sleep(10)
         except Exception as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while checking pods: {e}")
+            interruptible_sleep(10)
     else:
         logger.error(f"Timeout waiting for pods with label selector {label_selector} to be ready.")
         return False
 
 
 def patch_service_type(kube_config_out, namespace, service_name, service_type, timeout=300):
-    load_kube_config(kube_config_out)
-    v1 = client.CoreV1Api()
     end_time = time.time() + timeout
     while time.time() < end_time:
         try:
+            v1 = core_v1_api(kube_config_out)
             patch = [{"op": "replace", "path": "/spec/type", "value": service_type}]
             v1.patch_namespaced_service(name=service_name, namespace=namespace, body=patch)
             logger.info(
                 f"Service '{service_name}' in namespace '{namespace}' patched successfully as '{service_type}'.")
             return True
         except ApiException as e:
+            _check_unauthorized(kube_config_out, e)
             logger.error(f"An error occurred while patching the service: {e}")
-            time.sleep(10)
+            interruptible_sleep(10)
     else:
         logger.error(f"Timeout waiting for service '{service_name}' to be patched.")
         return False
@@ -1,28 +1,19 @@
 import os
 import shutil
+from typing import Dict
 from fastapi import HTTPException
 from app.core.logging import setup_logger
 from app.core.config import log_level
 from app.models import ZonePartner
-from app.providers.aws_provider import AWSCloudProvider
-from app.providers.azure_provider import AzureCloudProvider
-from app.providers.google_provider import GoogleCloudProvider
-from app.core.boto3_utils import Boto3STSService
+from app.providers.registry import get_provider_class
+from app.core.credentials import AWS_CREDENTIAL_VARIABLES, assumed_role_credentials, credential_environment
 from app.core.fs_utils import load_zone_partner_json
 
 logger = setup_logger(__name__, log_level)
 
 
 def get_cloud_provider(zone_partner: ZonePartner):
-    switcher = {
-        'aws': AWSCloudProvider,
-        'azure': AzureCloudProvider,
-        'google': GoogleCloudProvider
-    }
-    provider_class = switcher.get(zone_partner.cloud)
-    if provider_class is None:
-        raise ValueError(f"Invalid cloud provider: {zone_partner.cloud}")
-    return provider_class(zone_partner)
+    return get_provider_class(zone_partner.cloud)(zone_partner)
 
 
 def check_tools():
@@ -36,23 +27,20 @@ def check_tools():
             logger.error(f"{tool} is not installed or not found in PATH.")
 
 
-def set_aws_session(partner_id: str):
+def get_aws_session_environment(partner_id: str) -> Dict[str, str]:
+    """Assumed-role credential variables for a partner, to be used with ``partner_credentials``."""
     try:
         zone_partner = load_zone_partner_json(partner_id)
         if zone_partner.cloud != 'aws':
             raise ValueError(f"Unsupported cloud provider: {zone_partner.cloud}")
 
-        aws_manager = Boto3STSService(zone_partner)
-        aws_manager.set_aws_credentials()
+        return assumed_role_credentials.get(zone_partner)
     except Exception as e:
         logger.error(f"Error setting AWS session: {str(e)}")
         raise
 
 
 def check_aws_credentials():
-    if (
-        not os.environ.get("AWS_ACCESS_KEY_ID")
-        or not os.environ.get("AWS_SECRET_ACCESS_KEY")
-        or not os.environ.get("AWS_SESSION_TOKEN")
-    ):
+    environment = credential_environment()
+    if not all(environment.get(name) or os.environ.get(name) for name in AWS_CREDENTIAL_VARIABLES):
         raise HTTPException(status_code=400, detail="AWS credentials not set")
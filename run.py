@@ -1,14 +1,21 @@
 import uvicorn
 from app.core.config import config, log_level
+from app.core.constants import WEB_WORKERS, UVICORN_RELOAD
 from app.core.logging import get_uvicorn_log_config
+from app.core.state_store import check_web_workers
 
 
 if __name__ == "__main__":
+    # Production may run several worker processes (WEB_WORKERS) that coordinate through the
+    # state store, which needs the sqlite backend. Reload only works with a single process,
+    # so it is off whenever WEB_WORKERS > 1.
+    check_web_workers()
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
         log_level=config.log_level.lower(),
         log_config=get_uvicorn_log_config(log_level),
-        reload=True,
-    )
\ No newline at end of file
+        reload=UVICORN_RELOAD and WEB_WORKERS == 1,
+        workers=WEB_WORKERS,
+    )
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+# Settings are read from the environment when app.core.constants is imported,
+# so point every state location at a scratch directory before the app loads.
+_scratch = tempfile.mkdtemp(prefix="pz-tests-")
+os.environ.setdefault("STATE_PATH", os.path.join(_scratch, "state"))
+os.environ.setdefault("STATE_DB_PATH", os.path.join(_scratch, "db", "state.db"))
+os.environ.setdefault("STATE_S3_CACHE_PATH", os.path.join(_scratch, "s3-cache"))
+os.environ.setdefault("PIPELINE_LOG_PATH", os.path.join(_scratch, "pipeline-logs"))
+os.environ.setdefault("UVICORN_RELOAD", "False")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,36 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_malformed_item_is_reported_invalid():
+    valid_partner = str(uuid.uuid4())
+    items = [
+        {"partner_id": 123},
+        {"partner_id": ["a"], "name": 5},
+        {
+            "plan_only": True,
+            "name": "batch-test",
+            "description": "batch test",
+            "location": "us",
+            "cloud": "aws",
+            "partner_id": valid_partner,
+            "user_id": "batch-test",
+            "account_id": "123456789012",
+        },
+    ]
+    with TestClient(app) as client:
+        response = client.post("/zone-partners/batch", json={"items": items})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["accepted"] == 1 and body["invalid"] == 2
+        malformed, wrong_types, valid = body["items"]
+        assert malformed["status"] == "invalid" and malformed["partner_id"] is None and malformed["errors"]
+        assert wrong_types["status"] == "invalid"
+        assert valid["status"] == "accepted" and valid["partner_id"] == valid_partner
+
+        response = client.get(f"/zone-partners/batch/{body['batch_id']}")
+        assert response.status_code == 200, response.text
+        assert response.json()["progress"]["invalid"] == 2
@@ -0,0 +1,126 @@
+import uuid
+from typing import Tuple
+
+import jenkins
+
+from app.core.build_logs import pipeline_logs
+from app.core.builds import (
+    BUILD_CANCELLED, BUILD_FINISHED, BUILD_KIND, BUILD_LOST, BUILD_RUNNING, JenkinsBuildTracker,
+)
+from app.core.fs_utils import load_status_json, update_status_fields
+from app.core.jenkins_utils import jenkins_clients
+from app.core.leases import lease_manager
+from app.core.metrics import metrics
+from app.core.state_store import get_state_store
+
+
+class FakeResponse:
+    def __init__(self, text: bytes, size: int, more: bool):
+        self.text = text
+        self.headers = {"X-Text-Size": str(size), "X-More-Data": "true" if more else "false"}
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.text), chunk_size):
+            yield self.text[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeJenkins:
+    """Queue items, builds and console output of one pipeline, counting requests like PooledJenkins."""
+
+    def __init__(self):
+        self.queue = {}
+        self.builds = {}
+        self.console = {}
+        self.calls = 0
+
+    def reset_calls(self):
+        self.calls = 0
+
+    def get_queue_item(self, number):
+        self.calls += 1
+        if number not in self.queue:
+            raise jenkins.NotFoundException()
+        return self.queue[number]
+
+    def get_recent_builds(self, name):
+        self.calls += 1
+        return dict(self.builds)
+
+    def get_build_info(self, name, number):
+        self.calls += 1
+        return self.builds[number]
+
+    def open_progressive_text(self, name, number, start):
+        self.calls += 1
+        text = self.console.get(number, b"")
+        return FakeResponse(text[start:], len(text), self.builds[number].get("building", False))
+
+
+def tracker_with(monkeypatch) -> Tuple[JenkinsBuildTracker, FakeJenkins]:
+    client = FakeJenkins()
+    monkeypatch.setattr(jenkins_clients, "client", lambda: client)
+    # Keep the service's tracker as the "builds" metrics collector.
+    monkeypatch.setattr(metrics, "register_collector", lambda name, collector: None)
+    return JenkinsBuildTracker(), client
+
+
+def test_build_goes_from_queue_item_to_result(monkeypatch):
+    tracker, client = tracker_with(monkeypatch)
+    partner_id, job_id = str(uuid.uuid4()), str(uuid.uuid4())
+    update_status_fields(partner_id, {"Terraform": "Creating"})
+    lease_manager.acquire(partner_id, job_id, "create_zone_partner")
+    client.queue[7] = {}
+    build = tracker.track(partner_id, "create", "pz", 7, job_id=job_id)
+
+    assert tracker.poll() is False
+    assert build["state"] != BUILD_RUNNING
+
+    client.queue[7] = {"executable": {"number": 12, "url": "http://jenkins/pz/12"}}
+    client.builds[12] = {"number": 12, "building": True, "result": None}
+    client.console[12] = b"terraform apply\n"
+    assert tracker.poll() is True
+    assert build["state"] == BUILD_RUNNING and build["build_number"] == 12
+    assert load_status_json(partner_id)["Pipeline_Build"] == 12
+    assert tracker.poll() is False
+
+    client.builds[12] = {"number": 12, "building": False, "result": "SUCCESS"}
+    client.console[12] += b"Apply complete!\n"
+    assert tracker.poll() is True
+    stored = get_state_store().get_record(BUILD_KIND, job_id)
+    assert stored["state"] == BUILD_FINISHED and stored["result"] == "SUCCESS"
+    assert load_status_json(partner_id)["Terraform"] == "Complete"
+    assert lease_manager.holder(partner_id) is None
+    assert tracker.stats()["in_flight"] == 0
+    data, _, _ = pipeline_logs.read(partner_id)
+    assert data.endswith(b"terraform apply\nApply complete!\n")
+
+
+def test_cancelled_and_expired_queue_items(monkeypatch):
+    tracker, client = tracker_with(monkeypatch)
+    cancelled, expired = str(uuid.uuid4()), str(uuid.uuid4())
+    for partner_id in (cancelled, expired):
+        update_status_fields(partner_id, {"Terraform": "Redeploying"})
+    client.queue[1] = {"cancelled": True}
+    first = tracker.track(cancelled, "redeploy", "pz", 1)
+    second = tracker.track(expired, "redeploy", "pz", 2)
+
+    assert tracker.poll() is True
+    assert first["state"] == BUILD_FINISHED and first["result"] == BUILD_CANCELLED
+    assert load_status_json(cancelled)["Terraform"] == "Redeploy Error"
+    # A lost build's outcome is unknown, so the status is left alone.
+    assert second["state"] == BUILD_FINISHED and second["result"] == BUILD_LOST
+    assert load_status_json(expired)["Terraform"] == "Redeploying"
+
+
+def test_running_builds_of_a_pipeline_share_one_request(monkeypatch):
+    tracker, client = tracker_with(monkeypatch)
+    for number in (1, 2, 3):
+        client.queue[number] = {"executable": {"number": 100 + number}}
+        client.builds[100 + number] = {"number": 100 + number, "building": True}
+        tracker.track(str(uuid.uuid4()), "create", "pz", number)
+    tracker.poll()
+    tracker.poll()
+    assert client.calls == 1
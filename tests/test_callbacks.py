@@ -0,0 +1,92 @@
+import hashlib
+import hmac
+import json
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.config import config
+from app.core.fs_utils import load_status_json, save_zone_partner_payload
+from app.core.jobs import JOB_SUCCEEDED, job_queue
+from app.main import app
+from app.models import ZonePartner
+
+TOKEN = "callback-secret"
+
+
+def saved_partner() -> str:
+    partner_id = str(uuid.uuid4())
+    save_zone_partner_payload(ZonePartner(
+        name="callback-test", description="callback test", location="us", cloud="aws",
+        partner_id=partner_id, user_id="callback-test", account_id="123456789012",
+    ))
+    return partner_id
+
+
+def configure(monkeypatch, deployments: list) -> None:
+    monkeypatch.setattr(config, "get_jenkins_config", lambda: {"call_back_token": TOKEN})
+
+    async def deploy(params):
+        deployments.append(params["partner_id"])
+        return {}
+
+    monkeypatch.setitem(job_queue._handlers, "deploy_ml_workbench", deploy)
+
+
+def test_callback_requires_the_token_or_a_valid_signature(monkeypatch):
+    configure(monkeypatch, [])
+    partner_id = saved_partner()
+    body = json.dumps({"partner_id": partner_id, "jenkins_job_status": "FAILURE", "jenkins_job_id": "4"}).encode()
+    signature = "sha256=" + hmac.new(TOKEN.encode(), body, hashlib.sha256).hexdigest()
+    with TestClient(app) as client:
+        def post(headers):
+            return client.post("/deploy-ml-workbench", content=body, headers={"Content-Type": "application/json", **headers})
+
+        assert post({}).status_code == 401
+        assert post({"Authorization": "Bearer wrong"}).status_code == 401
+        assert post({"X-Signature-256": "sha256=" + "0" * 64}).status_code == 401
+        # A signature over a different body does not authenticate this one.
+        tampered = "sha256=" + hmac.new(TOKEN.encode(), body + b" ", hashlib.sha256).hexdigest()
+        assert post({"X-Signature-256": tampered}).status_code == 401
+
+        response = post({"X-Signature-256": signature})
+        assert response.status_code == 200, response.text
+        assert response.json()["result"] == "FAILURE" and response.json()["job_id"] is None
+        assert post({"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+    status = load_status_json(partner_id)
+    assert status["Terraform"] == "Error" and status["Pipeline_Build"] == 4
+
+
+def test_callback_without_a_configured_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(config, "get_jenkins_config", lambda: {})
+    with TestClient(app) as client:
+        response = client.post(
+            "/deploy-ml-workbench", json={"partner_id": saved_partner()}, headers={"Authorization": "Bearer "}
+        )
+        assert response.status_code == 401
+
+
+def test_redelivered_success_callback_deploys_once(monkeypatch):
+    deployments = []
+    configure(monkeypatch, deployments)
+    partner_id = saved_partner()
+    payload = {
+        "partner_id": partner_id, "jenkins_job_status": "SUCCESS", "jenkins_job_id": "9",
+        "eks_cluster_name": "pz-cluster",
+    }
+    with TestClient(app) as client:
+        headers = {"Authorization": f"Bearer {TOKEN}"}
+        first = client.post("/deploy-ml-workbench", json=payload, headers=headers)
+        assert first.status_code == 200, first.text
+        again = client.post("/deploy-ml-workbench", json=payload, headers=headers)
+        assert again.status_code == 200, again.text
+        assert not first.json()["duplicate"] and again.json()["duplicate"]
+        assert again.json()["job_id"] == first.json()["job_id"]
+        for _ in range(100):
+            if job_queue.get(first.json()["job_id"])["state"] == JOB_SUCCEEDED:
+                break
+            time.sleep(0.05)
+    assert deployments == [partner_id]
+    status = load_status_json(partner_id)
+    assert status["Terraform"] == "Complete" and status["cluster_name"] == "pz-cluster"
@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+
+from app.core.builds import build_tracker
+from app.core.fleet import (
+    FLEET_COMPLETED, FLEET_KIND, FLEET_PAUSED, FLEET_RUNNING, WAVE_COMPLETED, WAVE_HALTED, WAVE_RUNNING,
+    fleet_manager,
+)
+from app.core.jobs import JOB_FAILED, JOB_SUCCEEDED, current_job, job_queue
+from app.core.state_store import get_state_store
+from app.core.workers import worker_registry
+
+
+def fleet_operation(partner_ids, error_threshold, concurrency=None):
+    operation_id = str(uuid.uuid4())
+    fleet_op = {
+        "id": operation_id,
+        "operation": "redeploy",
+        "filters": {},
+        "wave_size": len(partner_ids),
+        "concurrency": concurrency or len(partner_ids),
+        "error_threshold": error_threshold,
+        "on_threshold": "pause",
+        "state": FLEET_RUNNING,
+        "current_wave": 0,
+        "created_at": None,
+        "finished_at": None,
+        "waves": [{
+            "index": 0,
+            "state": WAVE_RUNNING,
+            "acknowledged_failures": 0,
+            "items": [
+                {"partner_id": partner_id, "job_id": None, "state": None, "error": None}
+                for partner_id in partner_ids
+            ],
+        }],
+        "owner": worker_registry.worker_id,
+    }
+    get_state_store().put_record(FLEET_KIND, operation_id, fleet_op)
+    return get_state_store().get_record(FLEET_KIND, operation_id)
+
+
+def test_wave_waits_for_pipelines_and_counts_their_failures(monkeypatch):
+    async def trigger(params):
+        build_tracker.track(params["partner_id"], "redeploy", "pz", 1, job_id=current_job.get()["id"])
+        return {}
+
+    monkeypatch.setitem(job_queue._handlers, "redeploy_zone_partner", trigger)
+    monkeypatch.setattr(build_tracker, "min_interval", 0.05)
+    succeeding, failing = str(uuid.uuid4()), str(uuid.uuid4())
+
+    async def scenario():
+        await worker_registry.start()
+        await job_queue.start()
+        try:
+            fleet_op = fleet_operation([succeeding, failing], error_threshold=0.4)
+            wave = fleet_op["waves"][0]
+            task = asyncio.ensure_future(fleet_manager._run_wave(fleet_op, wave))
+
+            # Both jobs finish once their pipelines are queued; the wave must keep waiting.
+            for _ in range(100):
+                if all(item["job_id"] and build_tracker.in_flight(item["job_id"]) for item in wave["items"]):
+                    break
+                await asyncio.sleep(0.05)
+            for item in wave["items"]:
+                assert job_queue.get(item["job_id"])["state"] == JOB_SUCCEEDED
+            await asyncio.sleep(0.2)
+            assert not task.done()
+
+            build_tracker.resolve(succeeding, "redeploy", None, "SUCCESS")
+            build_tracker.resolve(failing, "redeploy", None, "FAILURE")
+            assert await asyncio.wait_for(task, 5) is True
+            states = {item["partner_id"]: item["state"] for item in wave["items"]}
+            assert states == {succeeding: JOB_SUCCEEDED, failing: JOB_FAILED}
+        finally:
+            await job_queue.stop()
+            await worker_registry.stop()
+
+    asyncio.run(scenario())
+
+
+def test_wave_over_the_error_threshold_pauses_until_resumed(monkeypatch):
+    failing = [str(uuid.uuid4()), str(uuid.uuid4())]
+    remaining = str(uuid.uuid4())
+
+    async def redeploy(params):
+        if params["partner_id"] in failing:
+            raise RuntimeError("redeploy failed")
+        return {}
+
+    monkeypatch.setitem(job_queue._handlers, "redeploy_zone_partner", redeploy)
+
+    async def scenario():
+        await worker_registry.start()
+        await job_queue.start()
+        try:
+            fleet_op = fleet_operation([*failing, remaining], error_threshold=0.5, concurrency=1)
+            await fleet_manager._drive(fleet_op)
+            stored = fleet_manager.get(fleet_op["id"])
+            wave = stored["waves"][0]
+            assert stored["state"] == FLEET_PAUSED and wave["state"] == WAVE_HALTED
+            assert [item["state"] for item in wave["items"]] == [JOB_FAILED, JOB_FAILED, None]
+            assert wave["items"][2]["job_id"] is None
+
+            resumed = await fleet_manager.resume(fleet_op["id"])
+            assert resumed["waves"][0]["acknowledged_failures"] == 2
+            await asyncio.wait_for(fleet_manager._tasks[fleet_op["id"]], 5)
+            stored = fleet_manager.get(fleet_op["id"])
+            assert stored["state"] == FLEET_COMPLETED and stored["waves"][0]["state"] == WAVE_COMPLETED
+            assert stored["waves"][0]["items"][2]["state"] == JOB_SUCCEEDED
+        finally:
+            await fleet_manager.stop()
+            await job_queue.stop()
+            await worker_registry.stop()
+
+    asyncio.run(scenario())
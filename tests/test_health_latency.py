@@ -0,0 +1,74 @@
+import statistics
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.providers.aws_provider import AWSCloudProvider
+from app.providers.base import ProviderStep
+
+# Long enough that a single step run on the event loop would show up in every /health call.
+STEP_SECONDS = 1.0
+JOBS = 4
+
+
+@pytest.fixture
+def blocking_provider(monkeypatch):
+    monkeypatch.setattr(AWSCloudProvider, "plan", lambda self: {"pipelines": {}, "findings": []})
+    monkeypatch.setattr(
+        AWSCloudProvider,
+        "steps",
+        lambda self, operation: [ProviderStep("blocking_call", lambda: time.sleep(STEP_SECONDS), "done")],
+    )
+
+
+def health_latencies(client, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        assert client.get("/health").status_code == 200
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.02)
+    return latencies
+
+
+def zone_partner_payload():
+    return {
+        "plan_only": False,
+        "name": "latency-test",
+        "description": "latency test",
+        "location": "us",
+        "cloud": "aws",
+        "partner_id": str(uuid.uuid4()),
+        "user_id": "latency-test",
+        "account_id": "123456789012",
+    }
+
+
+def test_health_latency_stays_flat_while_provider_calls_block(blocking_provider):
+    with TestClient(app) as client:
+        baseline = health_latencies(client, 10)
+
+        job_ids = []
+        for _ in range(JOBS):
+            response = client.post("/zone-partners/", json=zone_partner_payload())
+            assert response.status_code == 200, response.text
+            job_ids.append(response.json()["job_id"])
+
+        deadline = time.monotonic() + 5
+        while all(client.get(f"/jobs/{job_id}").json()["state"] == "queued" for job_id in job_ids):
+            assert time.monotonic() < deadline, "jobs never started"
+            time.sleep(0.01)
+        under_load = health_latencies(client, 20)
+
+        deadline = time.monotonic() + 10 * STEP_SECONDS
+        while any(client.get(f"/jobs/{job_id}").json()["state"] in ("queued", "running") for job_id in job_ids):
+            assert time.monotonic() < deadline, "jobs did not finish"
+            time.sleep(0.1)
+
+    assert {client.get(f"/jobs/{job_id}").json()["state"] for job_id in job_ids} == {"succeeded"}
+    # Blocking steps run in the provider executor, so /health never waits for one of them.
+    assert max(under_load) < STEP_SECONDS / 4
+    assert statistics.median(under_load) < statistics.median(baseline) + 0.05
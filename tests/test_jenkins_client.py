@@ -0,0 +1,78 @@
+import json
+import threading
+
+import requests
+from requests.adapters import BaseAdapter
+
+from app.core.jenkins_utils import PooledJenkins
+
+URL = "http://jenkins.test/"
+
+
+class FakeJenkinsServer(BaseAdapter):
+    """Issues crumbs and accepts triggers only with the crumb issued last, like Jenkins after a restart."""
+
+    def __init__(self):
+        super().__init__()
+        self.crumbs_issued = 0
+        self.triggers = []
+        self.lock = threading.Lock()
+
+    def restart(self):
+        with self.lock:
+            self.crumbs_issued += 1
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        with self.lock:
+            if "crumbIssuer" in request.url:
+                self.crumbs_issued += 1
+                body = {"crumbRequestField": "Jenkins-Crumb", "crumb": f"crumb-{self.crumbs_issued}"}
+                response.status_code, response._content = 200, json.dumps(body).encode()
+            elif request.headers.get("Jenkins-Crumb") != f"crumb-{self.crumbs_issued}":
+                response.status_code, response._content = 403, b"No valid crumb was included in the request"
+            else:
+                self.triggers.append(request.url)
+                response.status_code, response._content = 201, b""
+                response.headers["Location"] = f"{URL}queue/item/{len(self.triggers)}/"
+        return response
+
+    def close(self):
+        pass
+
+
+def client_for(server: FakeJenkinsServer) -> PooledJenkins:
+    client = PooledJenkins(URL)
+    client._session.mount(URL, server)
+    return client
+
+
+def test_crumb_is_fetched_once_and_reused():
+    server = FakeJenkinsServer()
+    client = client_for(server)
+    assert [client.build_job("pz", {"n": index}) for index in range(3)] == [1, 2, 3]
+    assert server.crumbs_issued == 1 and client.crumb_refreshes == 0
+
+
+def test_rejected_crumb_is_refreshed_and_the_request_sent_once_more():
+    server = FakeJenkinsServer()
+    client = client_for(server)
+    client.build_job("pz", {})
+    server.restart()
+    client.reset_calls()
+    assert client.build_job("pz", {}) == 2
+    assert client.crumb_refreshes == 1 and client.calls == 3
+    assert len(server.triggers) == 2
+
+
+def test_threads_share_one_crumb_fetch():
+    server = FakeJenkinsServer()
+    client = client_for(server)
+    threads = [threading.Thread(target=client.build_job, args=("pz", {"n": index})) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(server.triggers) == 8 and server.crumbs_issued == 1
@@ -0,0 +1,217 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.builds import build_tracker
+from app.core.executors import run_blocking
+from app.core.interrupts import interruptible_sleep
+from app.core.jobs import (
+    JOB_KIND, JOB_QUEUED, JOB_SUCCEEDED, IdempotencyKeyReused, JobConflict, JobQueue, JobQueueDraining,
+    current_job, run_step,
+)
+from app.core.leases import lease_manager
+from app.core.state_store import get_state_store
+from app.core.workers import worker_registry
+
+
+def run(coro):
+    async def registered():
+        await worker_registry.start()
+        try:
+            return await coro
+        finally:
+            await worker_registry.stop()
+
+    return asyncio.run(registered())
+
+
+async def started_queue(**handlers) -> JobQueue:
+    queue = JobQueue(workers=2)
+    for kind, handler in handlers.items():
+        queue.register(kind, handler)
+    await queue.start()
+    return queue
+
+
+async def noop(params):
+    return {"ok": True}
+
+
+def test_same_operation_coalesces_and_another_conflicts():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(params):
+            await release.wait()
+            return {}
+
+        queue = await started_queue(create=slow, delete=noop)
+        partner_id = str(uuid.uuid4())
+        try:
+            job, created = await queue.submit("create", {"n": 1}, partner_id)
+            again, created_again = await queue.submit("create", {"n": 1}, partner_id)
+            assert created and not created_again
+            assert again["id"] == job["id"]
+            with pytest.raises(JobConflict):
+                await queue.submit("delete", {}, partner_id)
+            release.set()
+            assert (await queue.wait(job["id"]))["state"] == JOB_SUCCEEDED
+            _, created = await queue.submit("delete", {}, partner_id)
+            assert created
+        finally:
+            await queue.stop()
+
+    run(scenario())
+
+
+def test_concurrent_submissions_take_the_lease_once():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow(params):
+            await release.wait()
+            return {}
+
+        # Two queues stand in for two service processes sharing the store.
+        first = await started_queue(create=slow, delete=slow)
+        second = await started_queue(create=slow, delete=slow)
+        partner_id = str(uuid.uuid4())
+        try:
+            results = await asyncio.gather(
+                first.submit("create", {}, partner_id),
+                second.submit("delete", {}, partner_id),
+                return_exceptions=True,
+            )
+            created = [result for result in results if not isinstance(result, Exception)]
+            conflicts = [result for result in results if isinstance(result, JobConflict)]
+            assert len(created) == 1 and len(conflicts) == 1
+            assert lease_manager.holder(partner_id)["job_id"] == created[0][0]["id"]
+        finally:
+            release.set()
+            await first.stop()
+            await second.stop()
+
+    run(scenario())
+
+
+def test_lost_lease_race_retries(monkeypatch):
+    real_acquire = lease_manager.acquire
+    racing_partner = str(uuid.uuid4())
+    attempts = []
+
+    def acquire(partner_id, job_id, kind):
+        if partner_id != racing_partner:
+            return real_acquire(partner_id, job_id, kind)
+        attempts.append(job_id)
+        if len(attempts) == 1:
+            # Another worker took the lease after the holder check, then finished.
+            return {"id": partner_id, "job_id": "other", "kind": kind}
+        return real_acquire(partner_id, job_id, kind)
+
+    monkeypatch.setattr(lease_manager, "acquire", acquire)
+
+    async def scenario():
+        queue = await started_queue(create=noop)
+        try:
+            job, created = await queue.submit("create", {}, racing_partner)
+            assert created
+            assert len(attempts) == 2 and attempts[1] == job["id"]
+            assert queue.get(attempts[0]) is None
+        finally:
+            await queue.stop()
+
+    run(scenario())
+
+
+def test_idempotency_key():
+    async def scenario():
+        queue = await started_queue(create=noop)
+        key = str(uuid.uuid4())
+        try:
+            job, created = await queue.submit("create", {"n": 1}, idempotency_key=key)
+            await queue.wait(job["id"])
+            again, created_again = await queue.submit("create", {"n": 1}, idempotency_key=key)
+            assert created and not created_again and again["id"] == job["id"]
+            with pytest.raises(IdempotencyKeyReused):
+                await queue.submit("create", {"n": 2}, idempotency_key=key)
+        finally:
+            await queue.stop()
+
+    run(scenario())
+
+
+def test_lease_is_held_until_the_triggered_pipeline_finishes():
+    partner_id = str(uuid.uuid4())
+
+    async def trigger(params):
+        build_tracker.track(partner_id, "create", "pz", 1, job_id=current_job.get()["id"])
+        return {}
+
+    async def scenario():
+        queue = await started_queue(create=trigger, delete=noop)
+        try:
+            job, _ = await queue.submit("create", {}, partner_id)
+            assert (await queue.wait(job["id"]))["state"] == JOB_SUCCEEDED
+            with pytest.raises(JobConflict):
+                await queue.submit("delete", {}, partner_id)
+            again, created = await queue.submit("create", {}, partner_id)
+            assert not created and again["id"] == job["id"]
+
+            build_tracker.resolve(partner_id, "create", None, "SUCCESS")
+            assert lease_manager.holder(partner_id) is None
+            _, created = await queue.submit("delete", {}, partner_id)
+            assert created
+        finally:
+            await queue.stop()
+
+    run(scenario())
+
+
+def test_drain_interrupts_a_blocked_job_which_resumes_after_its_checkpoint():
+    calls = {"prepare": 0, "apply": 0}
+    blocked = [True]
+
+    def prepare():
+        calls["prepare"] += 1
+        return "prepared"
+
+    def apply():
+        calls["apply"] += 1
+        while blocked[0]:
+            interruptible_sleep(0.05)
+        return "applied"
+
+    async def create(params):
+        prepared = await run_blocking("provider", run_step, "prepare", prepare)
+        return {"prepare": prepared, "apply": await run_blocking("provider", run_step, "apply", apply)}
+
+    async def scenario():
+        queue = await started_queue(create=create)
+        try:
+            job, _ = await queue.submit("create", {}, str(uuid.uuid4()))
+            while calls["apply"] == 0:
+                await asyncio.sleep(0.02)
+            await queue.drain(timeout=0.2)
+            with pytest.raises(JobQueueDraining):
+                await queue.submit("create", {}, str(uuid.uuid4()))
+        finally:
+            await queue.stop()
+
+        stored = queue.get(job["id"])
+        assert stored["state"] == JOB_QUEUED and stored["interrupted_at"]
+        assert list(stored["checkpoints"]) == ["prepare"]
+
+        # The next process finds the job owned by a worker that is gone.
+        get_state_store().put_record(JOB_KIND, job["id"], {**stored, "owner": "gone"})
+        blocked[0] = False
+        queue = await started_queue(create=create)
+        try:
+            finished = await asyncio.wait_for(queue.wait(job["id"]), 5)
+        finally:
+            await queue.stop()
+        assert finished["state"] == JOB_SUCCEEDED and finished["attempts"] == 2
+        assert finished["result"] == {"prepare": "prepared", "apply": "applied"}
+        assert calls == {"prepare": 1, "apply": 2}
+
+    run(scenario())
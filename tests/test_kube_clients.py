@@ -0,0 +1,67 @@
+import os
+
+import pytest
+import yaml
+
+from app.core.metrics import metrics
+from app.utils import k8s_utils
+from app.utils.k8s_utils import KubeClientPool
+
+
+@pytest.fixture(autouse=True)
+def keep_service_collector(monkeypatch):
+    # Keep the service's pool as the "kube_clients" metrics collector.
+    monkeypatch.setattr(metrics, "register_collector", lambda name, collector: None)
+
+
+def kubeconfig(tmp_path, name: str = "config") -> str:
+    path = tmp_path / name
+    path.write_text(yaml.safe_dump({
+        "apiVersion": "v1",
+        "kind": "Config",
+        "clusters": [{"name": "pz", "cluster": {"server": "https://pz.example"}}],
+        "users": [{"name": "pz", "user": {"token": "token"}}],
+        "contexts": [{"name": "pz", "context": {"cluster": "pz", "user": "pz"}}],
+        "current-context": "pz",
+    }))
+    return str(path)
+
+
+def test_client_is_reused_until_the_kubeconfig_changes(tmp_path):
+    pool = KubeClientPool(max_size=4, ttl=600)
+    path = kubeconfig(tmp_path)
+    first = pool.get(path)
+    assert pool.get(path) is first
+
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert pool.get(path) is not first
+    assert pool.stats() == {"created": 2, "reused": 1, "refreshed": 1, "evicted": 0, "size": 1}
+
+
+def test_clients_are_kept_per_credentials_and_expire(tmp_path, monkeypatch):
+    path = kubeconfig(tmp_path)
+    environment = {"AWS_ACCESS_KEY_ID": "first"}
+    monkeypatch.setattr(k8s_utils, "credential_environment", lambda: dict(environment))
+    pool = KubeClientPool(max_size=4, ttl=600)
+    first = pool.get(path)
+    environment["AWS_ACCESS_KEY_ID"] = "second"
+    assert pool.get(path) is not first
+    assert pool.stats()["size"] == 2
+
+    pool.ttl = 0
+    assert pool.get(path) is not pool.get(path)
+
+
+def test_least_recently_used_client_is_evicted_and_invalidate_drops(tmp_path):
+    pool = KubeClientPool(max_size=2, ttl=600)
+    paths = [kubeconfig(tmp_path, f"config-{index}") for index in range(3)]
+    first = pool.get(paths[0])
+    pool.get(paths[1])
+    pool.get(paths[0])
+    pool.get(paths[2])
+    assert pool.stats()["evicted"] == 1
+    assert pool.get(paths[0]) is first
+
+    pool.invalidate(paths[0])
+    assert pool.get(paths[0]) is not first
@@ -0,0 +1,56 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.plans import plan_cache, plan_errors, plan_key
+from app.main import app
+from app.models import ZonePartner
+from app.providers.base import FINDING_ERROR, FINDING_WARNING, finding
+
+
+class CountingProvider:
+    def __init__(self, findings=()):
+        self.findings = list(findings)
+        self.plans = 0
+
+    def plan(self):
+        self.plans += 1
+        return {"pipelines": {"create": {"pipeline": "pz", "parameters": {}}}, "findings": self.findings}
+
+
+def zone_partner(**variables) -> ZonePartner:
+    return ZonePartner(
+        name="plan-test", description="plan test", location="us", cloud="aws",
+        partner_id=str(uuid.uuid4()), user_id="plan-test", account_id="123456789012",
+        variables={**ZonePartner.model_fields["variables"].default, **variables},
+    )
+
+
+def test_same_inputs_reuse_the_stored_plan():
+    partner = zone_partner()
+    provider = CountingProvider()
+    plan, cached = plan_cache.plan(partner, provider)
+    again, cached_again = plan_cache.plan(partner.model_copy(deep=True), provider)
+    assert not cached and cached_again
+    assert again == plan and provider.plans == 1
+
+    changed = partner.model_copy(update={"variables": {**partner.variables, "region": "us-west-2"}})
+    assert plan_key(changed) != plan["id"]
+    _, cached = plan_cache.plan(changed, provider)
+    assert not cached and provider.plans == 2
+
+
+def test_only_error_findings_block_a_plan():
+    errors = [finding(FINDING_ERROR, "region", "Unsupported region")]
+    provider = CountingProvider(findings=[finding(FINDING_WARNING, "max_nodes", "Large cluster"), *errors])
+    plan, _ = plan_cache.plan(zone_partner(), provider)
+    assert plan_errors(plan) == errors
+
+
+def test_stored_plan_is_served_by_id():
+    plan, _ = plan_cache.plan(zone_partner(), CountingProvider())
+    with TestClient(app) as client:
+        response = client.get(f"/zone-partners/plans/{plan['id']}")
+        assert response.status_code == 200, response.text
+        assert response.json()["id"] == plan["id"]
+        assert client.get(f"/zone-partners/plans/{uuid.uuid4().hex}").status_code == 404
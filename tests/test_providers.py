@@ -0,0 +1,28 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from app.providers.base import CloudProvider, ProviderStep
+
+
+class SteppedProvider(CloudProvider):
+    def steps(self, operation):
+        return [
+            ProviderStep("first", lambda: time.sleep(0.05), "first done"),
+            ProviderStep("second", lambda: time.sleep(0.05), "second done", weight=3),
+        ]
+
+
+def test_progress_events_carry_the_operation_start_time():
+    zone_partner = SimpleNamespace(variables={}, plan_only=False, partner_id="p")
+
+    async def collect():
+        return [event async for event in SteppedProvider(zone_partner).run("create")]
+
+    before = time.time()
+    events = asyncio.run(collect())
+    after = time.time()
+    assert [event.percent for event in events] == [0, 25, 25, 100]
+    assert events[-1].done and not any(event.done for event in events[:-1])
+    assert len({event.started_at for event in events}) == 1
+    assert before <= events[0].started_at <= after - events[-1].elapsed + 0.01
@@ -0,0 +1,105 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from app.core.s3_state_store import S3StateStore
+
+BUCKET = "pz-state-test"
+PARTNER_ID = "11111111-2222-3333-4444-555555555555"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        yield
+
+
+def make_store(tmp_path, name):
+    # One store per simulated process, each with its own read cache.
+    return S3StateStore(bucket=BUCKET, prefix="pz-state", cache_path=str(tmp_path / name), endpoint_url=None)
+
+
+def test_status_round_trip(s3, tmp_path):
+    store = make_store(tmp_path, "a")
+    store.write_status(PARTNER_ID, {"Terraform": "Creating", "Version": 1})
+    assert store.load_status(PARTNER_ID) == {"Terraform": "Creating", "Version": 1}
+    assert store.status_version(PARTNER_ID) is not None
+
+
+def test_conflicting_write_keeps_the_other_writers_keys(s3, tmp_path):
+    writer_a = make_store(tmp_path, "a")
+    writer_b = make_store(tmp_path, "b")
+    writer_a.write_status(PARTNER_ID, {"Terraform": "Creating", "MLWorkbench": None, "Version": 1})
+
+    # Both writers start from version 1; A finishes first.
+    stale = writer_b.load_status(PARTNER_ID)
+    writer_a.write_status(
+        PARTNER_ID, {**writer_a.load_status(PARTNER_ID), "Terraform": "Complete", "Version": 2},
+        changes={"Terraform": "Complete"},
+    )
+    writer_b.write_status(
+        PARTNER_ID, {**stale, "MLWorkbench": "Creating", "Version": 2},
+        changes={"MLWorkbench": "Creating"},
+    )
+
+    assert make_store(tmp_path, "c").load_status(PARTNER_ID) == {
+        "Terraform": "Complete",
+        "MLWorkbench": "Creating",
+        "Version": 3,
+    }
+
+
+def test_swap_record_rejects_a_stale_revision(s3, tmp_path):
+    store = make_store(tmp_path, "a")
+    record = {"id": "lease-1", "state": "held"}
+    assert store.swap_record("lease", "lease-1", record, None)
+    assert not store.swap_record("lease", "lease-1", {"id": "lease-1", "state": "held"}, None)
+    assert store.swap_record("lease", "lease-1", {"id": "lease-1", "state": "released"}, record["revision"])
+    assert not store.swap_record("lease", "lease-1", None, record["revision"])
+    assert store.get_record("lease", "lease-1")["state"] == "released"
+
+
+def test_list_records_by_state_reads_only_marked_records(s3, tmp_path):
+    writer_a = make_store(tmp_path, "a")
+    writer_b = make_store(tmp_path, "b")
+    for index in range(5):
+        writer_a.put_record("job", f"job-{index}", {"id": f"job-{index}", "state": "succeeded"})
+    running = {"id": "job-running", "state": "queued"}
+    assert writer_a.swap_record("job", "job-running", running, None)
+    assert writer_a.swap_record("job", "job-running", {**running, "state": "running"}, running["revision"])
+
+    assert [record["id"] for record in writer_b.list_records("job", "running")] == ["job-running"]
+    assert writer_b.list_records("job", "queued") == []
+    assert len(writer_b.list_records("job", "succeeded")) == 5
+
+    # Another process moves the job on without knowing its old state; the stale marker is dropped on listing.
+    writer_b.put_record("job", "job-running", {"id": "job-running", "state": "succeeded"})
+    assert writer_a.list_records("job", "running") == []
+    assert len(writer_a.list_records("job", "succeeded")) == 6
+    markers = boto3.client("s3", region_name="us-east-1").list_objects_v2(
+        Bucket=BUCKET, Prefix="pz-state/_record_states/job/running/"
+    )
+    assert markers.get("KeyCount", 0) == 0
+
+
+def test_records_written_before_the_state_index_are_listed(s3, tmp_path):
+    store = make_store(tmp_path, "a")
+    boto3.client("s3", region_name="us-east-1").put_object(
+        Bucket=BUCKET, Key="pz-state/_records/lease/p-1.json", Body=b'{"id": "p-1", "state": "held"}'
+    )
+    assert [record["id"] for record in store.list_records("lease", "held")] == ["p-1"]
+
+
+def test_journal_events_are_durable_without_a_flush(s3, tmp_path):
+    writer = make_store(tmp_path, "a")
+    events = [
+        {"ts": 1.0, "timestamp": "t1", "key": "Terraform", "value": "Creating"},
+        {"ts": 1.0, "timestamp": "t1", "key": "Pipeline_Build", "value": 7},
+    ]
+    writer.append_status_events(PARTNER_ID, events)
+
+    # A process that crashed before flushing leaves its events readable by the next one.
+    assert list(make_store(tmp_path, "b").iter_status_events(PARTNER_ID)) == events
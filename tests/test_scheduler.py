@@ -0,0 +1,55 @@
+import asyncio
+
+from app.core.scheduler import FairScheduler, ScheduledJob
+
+
+def take(scheduler: FairScheduler, timeout: float = 0.1):
+    async def get():
+        try:
+            return await asyncio.wait_for(scheduler.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    return asyncio.run(get())
+
+
+def test_users_are_served_round_robin():
+    scheduler = FairScheduler(account_cap=0, region_cap=0)
+    for index in range(3):
+        scheduler.put(ScheduledJob(f"busy-{index}", user_id="busy"))
+    scheduler.put(ScheduledJob("quiet-0", user_id="quiet"))
+    order = [take(scheduler).job_id for _ in range(4)]
+    assert order == ["busy-0", "quiet-0", "busy-1", "busy-2"]
+    assert scheduler.qsize() == 0
+
+
+def test_account_cap_lets_other_accounts_overtake():
+    scheduler = FairScheduler(account_cap=1, region_cap=0)
+    scheduler.put(ScheduledJob("a-1", user_id="u", account_id="a"))
+    scheduler.put(ScheduledJob("a-2", user_id="u", account_id="a"))
+    scheduler.put(ScheduledJob("b-1", user_id="u", account_id="b"))
+
+    first = take(scheduler)
+    assert [first.job_id, take(scheduler).job_id] == ["a-1", "b-1"]
+    assert take(scheduler) is None
+    assert scheduler.stats()["accounts"]["a"]["queued"] == 1
+
+    scheduler.done(first)
+    assert take(scheduler).job_id == "a-2"
+
+
+def test_region_cap_holds_jobs_until_one_finishes():
+    async def scenario():
+        scheduler = FairScheduler(account_cap=0, region_cap=1)
+        scheduler.put(ScheduledJob("r-1", user_id="u", region="us-east-1"))
+        scheduler.put(ScheduledJob("r-2", user_id="v", region="us-east-1"))
+        running = await scheduler.get()
+        waiting = asyncio.ensure_future(scheduler.get())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        scheduler.done(running)
+        assert (await asyncio.wait_for(waiting, 1)).job_id == "r-2"
+        stats = scheduler.stats()["regions"]["us-east-1"]
+        assert stats["running"] == 1 and stats["dispatched"] == 2 and stats["cap"] == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,61 @@
+import os
+import time
+import uuid
+
+from app.core.fs_utils import save_zone_partner_payload, update_status_fields
+from app.core.state_gc import ARTIFACT_KIND, ARTIFACTS_HELD, ARTIFACTS_RECLAIMED, StateReclaimer
+from app.core.state_store import get_state_store
+from app.core.status_writer import status_writer
+from app.models import ZonePartner
+
+
+def partner_with_artifacts(state_path, terraform_state: str, size: int = 100, used_at: float = None) -> str:
+    partner_id = str(uuid.uuid4())
+    save_zone_partner_payload(ZonePartner(
+        name="gc-test", description="gc test", location="us", cloud="aws",
+        partner_id=partner_id, user_id="gc-test", account_id="123456789012",
+    ))
+    update_status_fields(partner_id, {"Terraform": terraform_state})
+    # The reclaimer reads the partner index, which follows the flushed status.
+    status_writer.flush()
+    manifests = os.path.join(state_path, partner_id, "manifests")
+    os.makedirs(manifests)
+    path = os.path.join(manifests, "deployment.yaml")
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    if used_at is not None:
+        os.utime(path, (used_at, used_at))
+        os.utime(manifests, (used_at, used_at))
+    return partner_id
+
+
+def test_deleted_partners_lose_their_artifacts_after_the_retention(tmp_path):
+    state_path = str(tmp_path)
+    deleted = partner_with_artifacts(state_path, "Deleted")
+    live = partner_with_artifacts(state_path, "Complete")
+
+    reclaimer = StateReclaimer(state_path=state_path, retention_hours=1, quota_bytes=0)
+    assert reclaimer.reclaim() == 0
+    # The retention clock starts when the reclaimer first sees the partner deleted.
+    assert get_state_store().get_record(ARTIFACT_KIND, deleted)["state"] == ARTIFACTS_HELD
+
+    reclaimer.retention = 0
+    assert reclaimer.reclaim() == 100
+    assert reclaimer.artifact_paths(deleted) == []
+    assert get_state_store().get_record(ARTIFACT_KIND, deleted)["state"] == ARTIFACTS_RECLAIMED
+    assert reclaimer.artifact_paths(live) != []
+    assert get_state_store().get_record(ARTIFACT_KIND, live) is None
+
+
+def test_quota_evicts_least_recently_used_deleted_artifacts(tmp_path):
+    state_path = str(tmp_path)
+    now = time.time()
+    oldest = partner_with_artifacts(state_path, "Deleted", used_at=now - 300)
+    newer = partner_with_artifacts(state_path, "Deleted", used_at=now - 100)
+    live = partner_with_artifacts(state_path, "Complete", used_at=now - 600)
+
+    reclaimer = StateReclaimer(state_path=state_path, retention_hours=1, quota_bytes=250)
+    assert reclaimer.reclaim() == 100
+    assert reclaimer.artifact_paths(oldest) == []
+    assert reclaimer.artifact_paths(newer) != [] and reclaimer.artifact_paths(live) != []
+
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.fs_utils import update_status_fields
+from app.core.status_broker import status_broker
+from app.main import app
+from app.services.status_service import StatusService
+
+
+def test_etag_answers_304_until_the_status_changes():
+    partner_id = str(uuid.uuid4())
+    with TestClient(app) as client:
+        update_status_fields(partner_id, {"Terraform": "Creating"})
+        response = client.get(f"/status/{partner_id}")
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        assert client.get(f"/status/{partner_id}", headers={"If-None-Match": etag}).status_code == 304
+
+        update_status_fields(partner_id, {"Terraform": "Complete"})
+        response = client.get(f"/status/{partner_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["Terraform"] == "Complete" and response.headers["ETag"] != etag
+
+
+def test_bulk_status_projects_fields_and_reports_missing_partners():
+    known, missing = str(uuid.uuid4()), str(uuid.uuid4())
+    with TestClient(app) as client:
+        update_status_fields(known, {"Terraform": "Complete", "MLWorkbench": "Deployed"})
+        response = client.post("/status/bulk", json={"partner_ids": [known, missing], "fields": ["Terraform"]})
+        assert response.status_code == 200, response.text
+        assert response.json()["items"] == {known: {"Terraform": "Complete"}, missing: None}
+
+        response = client.post("/status/bulk", json={"partner_ids": [known], "fields": ["Nope"]})
+        assert response.status_code == 400
+        assert client.get("/status/summary").status_code == 200
+
+
+def test_long_poll_sees_a_change_published_while_loading(monkeypatch):
+    partner_id = str(uuid.uuid4())
+    update_status_fields(partner_id, {"Terraform": "Creating"})
+    stale = StatusService._load_status_response(partner_id)
+    fresh = stale.model_copy(update={"Version": stale.Version + 1})
+    loads = []
+
+    def load(pid):
+        loads.append(pid)
+        if len(loads) > 1:
+            return fresh
+        # The writer publishes after this read saw the old version, before the wait starts.
+        status_broker.publish(pid, fresh.Version)
+        return stale
+
+    monkeypatch.setattr(StatusService, "_load_status_response", staticmethod(load))
+
+    async def scenario():
+        started = time.monotonic()
+        response = await StatusService.wait_for_status(partner_id, stale.Version, 10)
+        return response, time.monotonic() - started
+
+    response, elapsed = asyncio.run(scenario())
+    assert response.Version == fresh.Version
+    assert elapsed < 5
@@ -0,0 +1,30 @@
+from app.core.status_cache import StatusCache
+
+
+def test_entries_hit_only_while_their_token_matches():
+    cache = StatusCache(max_size=4)
+    cache.put("p", (1, 100), {"Terraform": "Creating"})
+    assert cache.get("p", (1, 100)) == {"Terraform": "Creating"}
+    assert cache.get("p", (2, 120)) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_but_versions_are_kept():
+    cache = StatusCache(max_size=2)
+    for partner_id in ("a", "b"):
+        cache.put(partner_id, 1, partner_id)
+        cache.set_version(partner_id, 3)
+    cache.get("a", 1)
+    cache.put("c", 1, "c")
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == "a" and cache.get("c", 1) == "c"
+    assert cache.version("b") == 3
+
+
+def test_versions_never_move_back():
+    cache = StatusCache()
+    cache.set_version("p", 5)
+    cache.set_version("p", 4)
+    assert cache.version("p") == 5
+    cache.forget("p")
+    assert cache.version("p") is None
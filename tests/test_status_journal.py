@@ -0,0 +1,29 @@
+import time
+import uuid
+
+from app.core.fs_utils import load_status_json, update_status_fields
+from app.core.state_store import get_state_store
+from app.core.status_journal import compact_partner_journal, record_status_events
+
+
+def test_compaction_recovers_journaled_keys_missing_from_the_snapshot():
+    partner_id = str(uuid.uuid4())
+    update_status_fields(partner_id, {"Terraform": "Creating"})
+    # Journaled, then the process died before the snapshot was written.
+    record_status_events(partner_id, {"Terraform": "Complete", "Pipeline_Build": 8})
+
+    compact_partner_journal(partner_id)
+    status = load_status_json(partner_id)
+    assert status["Terraform"] == "Complete" and status["Pipeline_Build"] == 8
+
+
+def test_compaction_drops_expired_events_only_after_folding_them_in():
+    partner_id = str(uuid.uuid4())
+    update_status_fields(partner_id, {"Terraform": "Creating"})
+    update_status_fields(partner_id, {"Terraform": "Complete"})
+    events = list(get_state_store().iter_status_events(partner_id))
+    assert [event["value"] for event in events] == ["Creating", "Complete"]
+
+    assert compact_partner_journal(partner_id, before=time.time() + 1) == 2
+    assert list(get_state_store().iter_status_events(partner_id)) == []
+    assert load_status_json(partner_id)["Terraform"] == "Complete"
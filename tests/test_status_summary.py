@@ -0,0 +1,29 @@
+from app.core.status_summary import UNKNOWN, StatusSummary
+
+
+def test_transitions_move_partners_between_buckets():
+    summary = StatusSummary()
+    summary.record_payload("a", "us-east-1")
+    summary.record_payload("b", "eu-west-1")
+    summary.record_status("a", "Terraform", "Creating")
+    summary.record_status("a", "Terraform", "Complete")
+    summary.record_status("a", "MLWorkbench", "Deployed")
+    summary.record_status("a", "Pipeline_Build", 4)
+
+    assert summary.snapshot() == {
+        "total": 2,
+        "terraform": {"Complete": 1, UNKNOWN: 1},
+        "ml_workbench": {"Deployed": 1, UNKNOWN: 1},
+        "regions": {"us-east-1": {"Complete": 1}, "eu-west-1": {UNKNOWN: 1}},
+    }
+
+
+def test_status_before_the_payload_is_counted_once_the_payload_arrives():
+    summary = StatusSummary()
+    summary.record_status("a", "Terraform", "Creating")
+    assert summary.snapshot()["total"] == 0
+
+    summary.record_payload("a", "us-east-1")
+    assert summary.snapshot()["terraform"] == {"Creating": 1}
+    summary.record_payload("a", "us-west-2")
+    assert summary.snapshot()["regions"] == {"us-west-2": {"Creating": 1}}
@@ -0,0 +1,49 @@
+import threading
+import uuid
+
+from app.core.state_store import get_state_store
+from app.core.status_writer import StatusWriter
+
+
+def test_burst_of_updates_is_written_once(monkeypatch):
+    store = get_state_store()
+    writes = []
+    real_write = store.write_status
+
+    def write_status(partner_id, data, changes=None):
+        writes.append((partner_id, dict(changes or {})))
+        return real_write(partner_id, data, changes=changes)
+
+    monkeypatch.setattr(store, "write_status", write_status)
+    writer = StatusWriter(flush_interval=60)
+    partner_id = str(uuid.uuid4())
+    try:
+        threads = [
+            threading.Thread(target=writer.update, args=(partner_id, {f"key{index}": index}))
+            for index in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        pending = writer.get_pending(partner_id)
+        assert pending["Version"] == 20
+        assert all(pending[f"key{index}"] == index for index in range(20))
+        assert writes == []
+
+        assert writer.flush() == 1
+        assert writes == [(partner_id, {f"key{index}": index for index in range(20)})]
+        assert writer.get_pending(partner_id) is None
+        assert store.load_status(partner_id)["Version"] == 20
+    finally:
+        writer.close()
+
+
+def test_update_after_flush_continues_from_the_stored_record():
+    writer = StatusWriter(flush_interval=0)
+    partner_id = str(uuid.uuid4())
+    writer.update(partner_id, {"Terraform": "Creating"})
+    data = writer.update(partner_id, {"Pipeline_Build": 3})
+    assert data["Version"] == 2 and data["Terraform"] == "Creating"
+    assert get_state_store().load_status(partner_id) == data
@@ -0,0 +1,26 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.core.fs_utils import save_zone_partner_payload
+from app.main import app
+from app.models import ZonePartner
+
+
+def test_listing_filters_projects_and_pages():
+    user_id = f"list-{uuid.uuid4()}"
+    partner_ids = sorted(str(uuid.uuid4()) for _ in range(3))
+    for partner_id in partner_ids:
+        save_zone_partner_payload(ZonePartner(
+            name="list-test", description="list test", location="us", cloud="aws",
+            partner_id=partner_id, user_id=user_id, account_id="123456789012",
+        ))
+    with TestClient(app) as client:
+        params = {"user_id": user_id, "fields": "partner_id,region", "limit": 2}
+        first = client.get("/zone-partners", params=params).json()
+        assert first["items"] == [{"partner_id": partner_id, "region": "us-east-1"} for partner_id in partner_ids[:2]]
+        second = client.get("/zone-partners", params={**params, "cursor": first["next_cursor"]}).json()
+        assert [item["partner_id"] for item in second["items"]] == partner_ids[2:]
+        assert second["next_cursor"] is None
+
+        assert client.get("/zone-partners", params={"fields": "nope"}).status_code == 400